@@ -5,6 +5,7 @@ from app.models.settings import SettingsModel
 from app.models.downloads import DownloadSettingsGlobal
 from app.schemas import ConfigUpdate, ConfigResponse, DownloadSettingsGlobalResponse, DownloadSettingsGlobalUpdate
 from app.api import deps
+from app.core.settings_cache import invalidate_settings_cache
 
 router = APIRouter()
 
@@ -48,7 +49,7 @@ def get_config(db: Session = Depends(get_db)):
             settings[field] = settings[field].lower() == "true"
 
     # Convert string integers to actual integers
-    int_fields = ["SYNC_PARALLELISM_MOVIES", "SYNC_PARALLELISM_SERIES"]
+    int_fields = ["SYNC_PARALLELISM_MOVIES", "SYNC_PARALLELISM_SERIES", "SYNC_CATEGORY_CONCURRENCY"]
     for field in int_fields:
         if field in settings:
             try:
@@ -89,6 +90,8 @@ def update_config(config: ConfigUpdate, db: Session = Depends(get_db)):
         updates["SYNC_PARALLELISM_MOVIES"] = str(config.SYNC_PARALLELISM_MOVIES)
     if config.SYNC_PARALLELISM_SERIES is not None:
         updates["SYNC_PARALLELISM_SERIES"] = str(config.SYNC_PARALLELISM_SERIES)
+    if config.SYNC_CATEGORY_CONCURRENCY is not None:
+        updates["SYNC_CATEGORY_CONCURRENCY"] = str(config.SYNC_CATEGORY_CONCURRENCY)
     if config.SERIES_USE_CATEGORY_FOLDERS is not None:
         updates["SERIES_USE_CATEGORY_FOLDERS"] = str(config.SERIES_USE_CATEGORY_FOLDERS).lower()
     if config.MOVIE_USE_CATEGORY_FOLDERS is not None:
@@ -108,6 +111,7 @@ def update_config(config: ConfigUpdate, db: Session = Depends(get_db)):
         else:
             setting.value = value
     db.commit()
+    invalidate_settings_cache()
     
     settings = {s.key: s.value for s in db.query(SettingsModel).all()}
     return ConfigResponse(**settings)
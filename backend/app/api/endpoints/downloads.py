@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from typing import List
 from app.api import deps
 from app.models.downloads import DownloadTask, DownloadStatus, DownloadSettings, MonitoredMedia, DownloadSettingsGlobal, DownloadStatistics
 from app.models.subscription import Subscription
 from app.services.xtream import XtreamClient
-from app.tasks.downloads import download_media_task, process_download_queue, check_auto_downloads
+from app.tasks.downloads import download_media_task, process_download_queue, check_auto_downloads, publish_download_control
 from app import schemas
 import asyncio
 from datetime import datetime
@@ -26,7 +27,14 @@ def get_download_tasks(
     if media_type:
         query = query.filter(DownloadTask.media_type == media_type)
     if q:
-        query = query.filter(DownloadTask.title.ilike(f"%{q}%"))
+        if len(q) >= 3:
+            # Substring match through the trigram title index (migrations/010) instead of a table scan
+            query = query.filter(text(
+                "download_tasks.id IN (SELECT rowid FROM download_tasks_fts WHERE download_tasks_fts MATCH :title_q)"
+            )).params(title_q='"' + q.replace('"', '""') + '"')
+        else:
+            # Trigrams need at least three characters
+            query = query.filter(DownloadTask.title.ilike(f"%{q}%"))
     
     # Sort by priority then creation date
     tasks = query.order_by(
@@ -97,7 +105,10 @@ async def queue_download(
         if movie_cache:
             raw_title = movie_cache.name
         else:
-            movies = await xc.get_vod_streams()
+            try:
+                movies = await xc.get_vod_streams()
+            finally:
+                await xc.aclose()
             media = next((m for m in movies if m['stream_id'] == str(media_id) or m['stream_id'] == int(media_id)), None)
             if media:
                 raw_title = media.get('name', raw_title)
@@ -176,8 +187,16 @@ async def queue_bulk_download(
         raise HTTPException(status_code=404, detail="Subscription not found")
         
     xc = None
+    series_infos = {}
     if data.media_type == "series":
         xc = XtreamClient(subscription.xtream_url, subscription.username, subscription.password)
+        # Fetch all series info up front, concurrently
+        series_ids = [str(media_id) for media_id in data.media_ids]
+        try:
+            series_infos = dict(zip(series_ids, await xc.get_series_info_many(series_ids)))
+        finally:
+            # Every id was fetched above, the loop below reads the results only
+            await xc.aclose()
     
     for i, media_id in enumerate(data.media_ids):
         title = data.titles[i] if data.titles and i < len(data.titles) else None
@@ -188,7 +207,11 @@ async def queue_bulk_download(
                     xc = XtreamClient(subscription.xtream_url, subscription.username, subscription.password)
                 
                 try:
-                    series_info = await xc.get_series_info(str(media_id))
+                    series_info = series_infos.get(str(media_id))
+                    if series_info is None:
+                        series_info = await xc.get_series_info(str(media_id))
+                    elif isinstance(series_info, Exception):
+                        raise series_info
                     info = series_info.get('info', {})
                     series_name_raw = info.get('name', info.get('title', str(media_id)))
                     episodes_map = series_info.get('episodes', {})
@@ -257,11 +280,20 @@ def cancel_download(
         raise HTTPException(status_code=404, detail="Task not found")
     
     if task.status == DownloadStatus.DOWNLOADING:
-        if task.task_id:
-            from app.core.celery_app import celery_app
-            celery_app.control.revoke(task.task_id, terminate=True)
+        # A download alone in its Celery task is revoked, so a stalled stream stops now;
+        # batched ones stop on their own once they see the new status (revoking would
+        # also kill the other downloads of the batch)
+        shares_task = task.task_id and db.query(DownloadTask.id).filter(
+            DownloadTask.task_id == task.task_id,
+            DownloadTask.id != task.id,
+            DownloadTask.status == DownloadStatus.DOWNLOADING
+        ).first() is not None
         task.status = DownloadStatus.CANCELLED
         db.commit()
+        if task.task_id and not shares_task:
+            from app.core.celery_app import celery_app
+            celery_app.control.revoke(task.task_id, terminate=True)
+        publish_download_control([task.id], "cancel")
     else:
         db.delete(task)
         db.commit()
@@ -301,6 +333,7 @@ def pause_download(
         task.status = DownloadStatus.PAUSED
         task.paused_at = datetime.now()
         db.commit()
+        publish_download_control([task.id], "pause")
         return {"message": "Task paused"}
     
     raise HTTPException(status_code=400, detail="Only downloading tasks can be paused")
@@ -390,6 +423,7 @@ def batch_pause_tasks(task_ids: List[int], db: Session = Depends(deps.get_db)):
         DownloadTask.status == DownloadStatus.DOWNLOADING
     ).update({"status": DownloadStatus.PAUSED, "paused_at": datetime.now()}, synchronize_session=False)
     db.commit()
+    publish_download_control(task_ids, "pause")
     return {"message": f"Paused tasks"}
 
 @router.post("/tasks/batch/resume")
@@ -507,8 +541,10 @@ async def browse_media(
     xc = XtreamClient(subscription.xtream_url, subscription.username, subscription.password)
     
     if media_type == "movies":
-        categories = await xc.get_vod_categories()
-        movies = await xc.get_vod_streams()
+        try:
+            categories, movies = await asyncio.gather(xc.get_vod_categories(), xc.get_vod_streams())
+        finally:
+            await xc.aclose()
         
         cat_map = {c['category_id']: c['category_name'] for c in categories}
         grouped = {}
@@ -527,8 +563,10 @@ async def browse_media(
         return {"categories": grouped}
     
     elif media_type == "series":
-        categories = await xc.get_series_categories()
-        series = await xc.get_series()
+        try:
+            categories, series = await asyncio.gather(xc.get_series_categories(), xc.get_series())
+        finally:
+            await xc.aclose()
         
         cat_map = {c['category_id']: c['category_name'] for c in categories}
         grouped = {}
@@ -600,3 +638,5 @@ async def get_series_details(
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch series info: {str(e)}")
+    finally:
+        await xc.aclose()
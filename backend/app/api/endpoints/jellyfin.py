@@ -13,6 +13,7 @@ from app.schemas import (
     JellyfinTestResponse,
 )
 from app.services.jellyfin import JellyfinClient
+from app.core.settings_cache import invalidate_settings_cache
 
 router = APIRouter()
 
@@ -88,6 +89,7 @@ def update_jellyfin_config(config: JellyfinConfigUpdate, db: Session = Depends(g
         save_setting(db, "JELLYFIN_REFRESH_ENABLED", str(config.refresh_enabled).lower())
 
     db.commit()
+    invalidate_settings_cache()
 
     return get_jellyfin_config(db)
 
@@ -2,6 +2,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime
+import asyncio
 from app.db.session import get_db
 from app.models.selection import SelectedCategory
 from app.models.category import Category
@@ -77,9 +78,8 @@ async def sync_movie_categories(subscription_id: int, db: Session = Depends(get_
     """Sync movie categories from Xtream to database"""
     client = get_xtream_client(db, subscription_id)
     try:
-        categories = await client.get_vod_categories()
-        # Fetch all streams to calculate counts
-        streams = await client.get_vod_streams()
+        # Fetch all streams too (concurrently) to calculate counts
+        categories, streams = await asyncio.gather(client.get_vod_categories(), client.get_vod_streams())
         
         # Calculate counts
         counts = {}
@@ -89,6 +89,8 @@ async def sync_movie_categories(subscription_id: int, db: Session = Depends(get_
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch from Xtream: {str(e)}")
+    finally:
+        await client.aclose()
 
     # Clear existing movie categories for this subscription
     db.query(Category).filter(
@@ -121,9 +123,8 @@ async def sync_series_categories(subscription_id: int, db: Session = Depends(get
     """Sync series categories from Xtream to database"""
     client = get_xtream_client(db, subscription_id)
     try:
-        categories = await client.get_series_categories()
-        # Fetch all series to calculate counts
-        series_list = await client.get_series()
+        # Fetch all series too (concurrently) to calculate counts
+        categories, series_list = await asyncio.gather(client.get_series_categories(), client.get_series())
         
         # Calculate counts
         counts = {}
@@ -133,6 +134,8 @@ async def sync_series_categories(subscription_id: int, db: Session = Depends(get
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch from Xtream: {str(e)}")
+    finally:
+        await client.aclose()
 
     # Clear existing series categories for this subscription
     db.query(Category).filter(
@@ -1,10 +1,33 @@
+import asyncio
 from celery import Celery
 from app.core.config import settings
+import app.db.sqlite_pragmas  # noqa: F401 - registers the SQLite connection pragmas
+
+# Tasks drive their async code with run_async() (app.core.event_loop); use uvloop for that loop when
+# it is installed (it ships with uvicorn[standard], which already uses it for the API)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 celery_app = Celery("worker", broker=settings.REDIS_URL, backend=settings.REDIS_URL)
 
 celery_app.conf.update(task_track_started=True)
 
+# Syncs run for minutes to hours; they get their own queue (and worker, see
+# docker_start.sh) so schedule checks and other short tasks never wait behind them
+SYNC_QUEUE = "syncs_long"
+celery_app.conf.task_routes = {
+    name: {"queue": SYNC_QUEUE} for name in (
+        "app.tasks.sync.sync_movies_task",
+        "app.tasks.sync.sync_series_task",
+        "app.tasks.m3u_sync.sync_m3u_source_task",
+        "app.tasks.plex_sync.sync_plex_movies_task",
+        "app.tasks.plex_sync.sync_plex_series_task",
+    )
+}
+
 # Configure Celery Beat schedule
 celery_app.conf.beat_schedule = {
     'check-schedules-every-minute': {
@@ -0,0 +1,71 @@
+"""Persistent asyncio event loop for Celery worker processes.
+
+Tasks used to drive their async code with asyncio.run(), which builds and
+tears down a loop per task.  Objects bound to a loop (httpx connection pools
+in particular) can only be reused across tasks if the loop outlives them, so
+each worker process keeps one loop, created on first use and closed when the
+process shuts down.
+"""
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from celery.signals import worker_process_shutdown
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_pid
+    # A loop inherited through fork belongs to the parent process
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def _cancel_leftover_tasks(loop: asyncio.AbstractEventLoop):
+    """Cancel tasks a failed coroutine left behind, as asyncio.run does"""
+    tasks = [t for t in asyncio.all_tasks(loop) if not t.done()]
+    if not tasks:
+        return
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion on the worker's persistent loop (replacement for asyncio.run)"""
+    loop = _get_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        _cancel_leftover_tasks(loop)
+
+
+def on_loop_shutdown(hook: Callable[[], Awaitable[None]]):
+    """Register a coroutine function awaited before the worker's loop is closed (e.g. closing HTTP clients)"""
+    _shutdown_hooks.append(hook)
+
+
+@worker_process_shutdown.connect
+def _close_loop(**kwargs):
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        return
+    try:
+        for hook in _shutdown_hooks:
+            try:
+                _loop.run_until_complete(hook())
+            except Exception as e:
+                logger.warning(f"Event loop shutdown hook failed: {e}")
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+    finally:
+        _loop.close()
@@ -0,0 +1,66 @@
+"""Process-local cache of the settings table.
+
+Tasks read the whole settings table on every run; the table only changes
+when a user saves the configuration, so workers keep a copy for
+``SETTINGS_CACHE_TTL`` seconds.  Writers call ``invalidate_settings_cache``
+which bumps a Redis epoch so every worker reloads on its next read.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.redis import get_redis
+from app.models.settings import SettingsModel
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_CACHE_TTL = 30.0
+SETTINGS_EPOCH_KEY = "settings:epoch"
+
+_SETTINGS_CACHE: Dict[str, Optional[str]] = {}
+_SETTINGS_CACHE_AT = 0.0
+_SETTINGS_CACHE_EPOCH: Optional[str] = None
+_SETTINGS_LOCK = threading.Lock()
+
+
+def _current_epoch() -> Optional[str]:
+    try:
+        return get_redis().get(SETTINGS_EPOCH_KEY)
+    except Exception as e:
+        logger.debug(f"Settings epoch unavailable, relying on TTL: {e}")
+        return None
+
+
+def get_settings_cached(db: Session, ttl: float = SETTINGS_CACHE_TTL) -> Dict[str, Optional[str]]:
+    """Return the settings table as a dict, reloading at most every ``ttl`` seconds."""
+    global _SETTINGS_CACHE, _SETTINGS_CACHE_AT, _SETTINGS_CACHE_EPOCH
+
+    epoch = _current_epoch()
+    with _SETTINGS_LOCK:
+        now = time.monotonic()
+        if (
+            _SETTINGS_CACHE_AT
+            and now - _SETTINGS_CACHE_AT < ttl
+            and epoch == _SETTINGS_CACHE_EPOCH
+        ):
+            return dict(_SETTINGS_CACHE)
+
+        _SETTINGS_CACHE = {s.key: s.value for s in db.query(SettingsModel).all()}
+        _SETTINGS_CACHE_AT = now
+        _SETTINGS_CACHE_EPOCH = epoch
+        return dict(_SETTINGS_CACHE)
+
+
+def invalidate_settings_cache() -> None:
+    """Drop the local copy and tell other workers to reload theirs."""
+    global _SETTINGS_CACHE_AT
+
+    with _SETTINGS_LOCK:
+        _SETTINGS_CACHE_AT = 0.0
+    try:
+        get_redis().incr(SETTINGS_EPOCH_KEY)
+    except Exception as e:
+        logger.warning(f"Could not publish settings change, other workers refresh within {SETTINGS_CACHE_TTL:.0f}s: {e}")
@@ -0,0 +1,17 @@
+"""
+Bulk writes of the sync caches.
+
+The Xtream and Plex syncs queue cache rows in dicts keyed by the item's id
+(so the last row queued for a key wins) and flush them once per batch.
+"""
+from sqlalchemy.orm import Session
+
+
+def save_cache_mappings(db: Session, model, inserts: dict, updates: dict):
+    """Write queued cache rows in one INSERT and one UPDATE executemany, then empty both queues"""
+    if inserts:
+        db.execute(model.__table__.insert(), list(inserts.values()))
+    if updates:
+        db.bulk_update_mappings(model, list(updates.values()))
+    inserts.clear()
+    updates.clear()
@@ -0,0 +1,72 @@
+"""
+Connection settings for the SQLite database.
+
+Importing this module registers a connect hook on every Engine; it only acts
+on sqlite3 connections, other backends are left alone.
+
+- WAL lets the API read while a sync is writing, and with synchronous=NORMAL
+  a commit no longer waits for an fsync (only WAL checkpoints do), so the
+  per-batch commits of the syncs stay cheap.
+- Temporary tables/indices live in memory and each connection keeps up to
+  64 MB of pages cached.
+"""
+import logging
+import logging.handlers
+import sqlite3
+import sys
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Per-connection cache settings; the only ones a read-only connection can apply
+SQLITE_CACHE_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+) + SQLITE_CACHE_PRAGMAS
+
+# All of them as one script, so a new connection runs a single call
+SQLITE_SETUP_SQL = ";\n".join(SQLITE_PRAGMAS) + ";"
+SQLITE_READONLY_SETUP_SQL = ";\n".join(SQLITE_CACHE_PRAGMAS) + ";"
+
+
+def apply_sqlite_pragmas(conn: sqlite3.Connection):
+    """Apply SQLITE_PRAGMAS to a raw sqlite3 connection (maintenance scripts call this after connect)"""
+    conn.executescript(SQLITE_SETUP_SQL)
+
+
+def ro_connect(path: str) -> sqlite3.Connection:
+    """Read-only connection for scripts that only inspect the database; under WAL it never blocks the app's writer"""
+    conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    conn.executescript(SQLITE_READONLY_SETUP_SQL)
+    return conn
+
+
+def rw_connect(path: str) -> sqlite3.Connection:
+    """Tuned read-write connection in autocommit mode: callers open their writes with BEGIN IMMEDIATE"""
+    conn = sqlite3.connect(path)
+    apply_sqlite_pragmas(conn)
+    conn.isolation_level = None
+    return conn
+
+
+def setup_script_logging(capacity: int = 64):
+    """
+    Log INFO and above to stdout for the maintenance scripts, in the format of
+    migrations/apply_migrations.py. Lines are written in batches of `capacity`
+    (errors, and the interpreter exit, flush right away).
+    """
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.MemoryHandler(capacity, target=stdout_handler)])
+
+
+@event.listens_for(Engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        apply_sqlite_pragmas(dbapi_connection)
@@ -8,6 +8,7 @@ from app.api.api import api_router
 from app.core.config import settings
 from app.db.base import Base
 from app.db.session import engine
+import app.db.sqlite_pragmas  # noqa: F401 - registers the SQLite connection pragmas
 import os
 
 
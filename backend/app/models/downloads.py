@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Enum, Float, Boolean
+from sqlalchemy import DDL, Column, String, Integer, DateTime, Enum, Float, Boolean, Index, event
 import enum
 from datetime import datetime
 from app.db.base_class import Base
@@ -17,6 +17,13 @@ class MediaType(str, enum.Enum):
 
 class DownloadTask(Base):
     __tablename__ = "download_tasks"
+    __table_args__ = (
+        # Retention cleanup predicates (see migrations/005)
+        Index("ix_download_tasks_status_completed_at", "status", "completed_at"),
+        Index("ix_download_tasks_status_created_at", "status", "created_at"),
+        # Reset scripts select by media id and status (see migrations/009)
+        Index("ix_download_tasks_media_id_status", "media_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     subscription_id = Column(Integer, nullable=False, index=True)
@@ -62,6 +69,22 @@ class DownloadTask(Base):
     file_hash = Column(String, nullable=True)
     thumbnail_url = Column(String, nullable=True)
 
+# Trigram full-text index over the titles for the download list search; migrations/010
+# adds it to existing databases, new ones get it with the table
+DOWNLOAD_TASKS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS download_tasks_fts USING fts5("
+    "title, content='download_tasks', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS download_tasks_fts_ai AFTER INSERT ON download_tasks BEGIN "
+    "INSERT INTO download_tasks_fts(rowid, title) VALUES (new.id, new.title); END",
+    "CREATE TRIGGER IF NOT EXISTS download_tasks_fts_ad AFTER DELETE ON download_tasks BEGIN "
+    "INSERT INTO download_tasks_fts(download_tasks_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+    "CREATE TRIGGER IF NOT EXISTS download_tasks_fts_au AFTER UPDATE OF title ON download_tasks BEGIN "
+    "INSERT INTO download_tasks_fts(download_tasks_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+    "INSERT INTO download_tasks_fts(rowid, title) VALUES (new.id, new.title); END",
+)
+for _statement in DOWNLOAD_TASKS_FTS_DDL:
+    event.listen(DownloadTask.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
 class MonitoredMedia(Base):
     __tablename__ = "monitored_media"
 
@@ -18,3 +18,4 @@ class M3UEntry(Base):
     tvg_id = Column(String, nullable=True)
     tvg_name = Column(String, nullable=True)
     entry_type = Column(SQLEnum(EntryType), default=EntryType.MOVIE, nullable=False)
+    generated_fingerprint = Column(String, nullable=True)  # Digest of the STRM/NFO last written for this entry
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Enum as SQLEnum
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 import enum
@@ -21,5 +21,9 @@ class M3USource(Base):
     is_active = Column(Boolean, default=True)
     sync_status = Column(String, default="idle") # idle, syncing, success, error
     last_sync = Column(DateTime, nullable=True)
+    # FILE sources: fingerprint of the last parsed file, plus its stat to skip rehashing
+    m3u_hash = Column(String, nullable=True)
+    m3u_size = Column(BigInteger, nullable=True)
+    m3u_mtime_ns = Column(BigInteger, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
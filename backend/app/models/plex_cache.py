@@ -41,6 +41,7 @@ class PlexSeriesCache(Base):
     year = Column(String, nullable=True)
     guid = Column(String, nullable=True)
     updated_at = Column(String, nullable=True)
+    content_hash = Column(String, nullable=True)  # Digest of the tvshow.nfo last written
 
 
 class PlexEpisodeCache(Base):
@@ -1,4 +1,5 @@
 import httpx
+import json
 import logging
 from lxml import etree
 from datetime import datetime
@@ -105,7 +106,6 @@ class EPGService:
                 self.redis.delete(key)
                 for p in progs:
                     # Use zadd with start_ts as score for easy range queries
-                    import json
                     self.redis.zadd(key, {json.dumps(p): p["start"]})
                 self.redis.expire(key, 86400) # Expire in 24h
 
@@ -163,7 +163,6 @@ class EPGService:
                     selected_channels.append(channel)
 
         # 4. For each selected channel, fetch programs from prioritized sources
-        import json
         now = datetime.now().timestamp()
         
         for channel in selected_channels:
@@ -261,6 +260,8 @@ class EPGService:
         except Exception as e:
             logger.error(f"Failed to fetch streams: {e}")
             stream_map = {}
+        finally:
+            await client.aclose()
 
         # 3. Perform matching
         match_count = 0
@@ -1,28 +1,134 @@
+import asyncio
 import os
-import aiofiles
+import shutil
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+# Characters that are invalid in file/folder names, mapped to underscores.
+# str.translate does the replacement in a single C pass, no regex engine.
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '\\/:*?"<>|'})
+
+# Truncate names to keep the full path under 255 characters
+# (leaving room for directory path, extension, etc.)
+_MAX_NAME_LENGTH = 200
+
+# Default language prefix pattern (e.g. "FR - ", "EN_")
+_DEFAULT_PREFIX_REGEX = r'^(?:[A-Za-z0-9.-]+_|[A-Za-z]{2,}\s*-\s*)'
+
+# Date at end of title (e.g. "Movie_2024" -> "Movie (2024)")
+_DATE_SUFFIX_RE = re.compile(r'[_\s](\d{4})$')
+
+# Video codec line of a generated NFO (the container extension; the audio block has its own <codec>)
+_NFO_VIDEO_CODEC_RE = re.compile(r'(<video>\s*<codec>)[^<]*(</codec>)')
+
+
+def _valid_tmdb_id(data: dict) -> Optional[str]:
+    """Return the TMDB id from an Xtream item, or None if missing/placeholder"""
+    tmdb_id = data.get('tmdb') or data.get('tmdb_id', '')
+    if tmdb_id and str(tmdb_id) not in ['0', 'None', 'null', '']:
+        return tmdb_id
+    return None
+
+
+def _rating_xml(r_val: float) -> str:
+    """Build the <ratings>/<userrating> NFO block for a 10-based rating"""
+    # Whole ratings are common, skip the float formatting path for them
+    r_int = int(r_val)
+    rating_str = f"{r_int}.0" if r_int == r_val else f"{r_val:.1f}"
+    return (
+        '  <ratings>\n'
+        f'    <rating name="tmdb" default="true"><value>{rating_str}</value></rating>\n'
+        '  </ratings>\n'
+        f'  <userrating>{round(r_val)}</userrating>\n'
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_title_cleaner(prefix_regex: Optional[str], format_date: bool, clean_name: bool) -> Callable[[str], str]:
+    """
+    Build a title cleaner specialized for one combination of naming settings.
+
+    The prefix regex is compiled and the option branches are resolved once,
+    so the returned function does no per-call setup.
+    """
+    try:
+        strip_prefix = re.compile(prefix_regex or _DEFAULT_PREFIX_REGEX).sub
+    except re.error:
+        strip_prefix = re.compile(_DEFAULT_PREFIX_REGEX).sub
+    format_year = _DATE_SUFFIX_RE.sub
+
+    if format_date and clean_name:
+        def cleaner(title: str) -> str:
+            if not title:
+                return "Unknown"
+            return format_year(r' (\1)', strip_prefix('', title)).replace('_', ' ').strip()
+    elif format_date:
+        def cleaner(title: str) -> str:
+            if not title:
+                return "Unknown"
+            return format_year(r' (\1)', strip_prefix('', title)).strip()
+    elif clean_name:
+        def cleaner(title: str) -> str:
+            if not title:
+                return "Unknown"
+            return strip_prefix('', title).replace('_', ' ').strip()
+    else:
+        def cleaner(title: str) -> str:
+            if not title:
+                return "Unknown"
+            return strip_prefix('', title).strip()
+
+    return cleaner
 
 class FileManager:
     def __init__(self, output_dir: str):
         self.output_dir = output_dir
+        # Directories already created by this instance (skips repeated makedirs syscalls)
+        self._ensured_dirs = set()
 
     def sanitize_name(self, name: str) -> str:
         # Replace invalid characters with underscore
-        sanitized = re.sub(r'[\\/:*?"<>|]', '_', name)
-        
-        # Truncate to max 200 characters to ensure full path stays under 255
-        # (leaving room for directory path, extension, etc.)
-        max_length = 200
-        if len(sanitized) > max_length:
-            sanitized = sanitized[:max_length]
-        
+        sanitized = name.translate(_SANITIZE_TABLE)
+
+        if len(sanitized) > _MAX_NAME_LENGTH:
+            sanitized = sanitized[:_MAX_NAME_LENGTH]
+
         return sanitized
 
 
     def ensure_directory(self, path: str):
+        if path in self._ensured_dirs:
+            return
         os.makedirs(path, exist_ok=True)
 
+        # makedirs created the parents too, remember them as well
+        while path not in self._ensured_dirs:
+            self._ensured_dirs.add(path)
+            parent = os.path.dirname(path)
+            if not parent or parent == path:
+                break
+            path = parent
+
+    async def ensure_directory_async(self, path: str):
+        """ensure_directory for async callers; only the first call per path leaves the event loop"""
+        if path not in self._ensured_dirs:
+            await asyncio.to_thread(self.ensure_directory, path)
+
+    async def delete_tree(self, path: str):
+        """
+        Remove a directory and everything below it (no-op if missing), in a worker thread.
+
+        @param path Directory to remove
+        """
+        def _delete():
+            if os.path.exists(path):
+                shutil.rmtree(path)
+
+        await asyncio.to_thread(_delete)
+        prefix = path.rstrip(os.sep) + os.sep
+        self._ensured_dirs = {d for d in self._ensured_dirs if d != path and not d.startswith(prefix)}
+
     async def write_strm(self, path: str, url: str) -> bool:
         """
         Write STRM file only if content has changed.
@@ -31,19 +137,8 @@ class FileManager:
         @param url URL content to write
         @returns True if file was written, False if unchanged
         """
-        # Check if file exists and has the same content
-        if os.path.exists(path):
-            try:
-                async with aiofiles.open(path, 'r') as f:
-                    existing_content = await f.read()
-                if existing_content.strip() == url.strip():
-                    return False  # Content unchanged, skip write
-            except Exception:
-                pass  # If we can't read, just overwrite
-
-        async with aiofiles.open(path, 'w') as f:
-            await f.write(url)
-        return True
+        # Compare and write in one worker thread (one hop instead of one per file operation)
+        return await asyncio.to_thread(self._write_if_changed, path, url)
 
     async def write_nfo(self, path: str, content: str, skip_if_exists: bool = False) -> bool:
         """
@@ -54,21 +149,50 @@ class FileManager:
         @param skip_if_exists If True, never overwrite existing NFO files
         @returns True if file was written, False if unchanged/skipped
         """
-        if os.path.exists(path):
-            if skip_if_exists:
-                return False  # Never overwrite existing NFO files
+        return await asyncio.to_thread(self.write_nfo_sync, path, content, skip_if_exists)
 
-            # Check if content has changed
-            try:
-                async with aiofiles.open(path, 'r') as f:
-                    existing_content = await f.read()
-                if existing_content.strip() == content.strip():
+    def write_strm_sync(self, path: str, url: str) -> bool:
+        """Synchronous write_strm for callers without an event loop (same skip-if-unchanged rule)."""
+        return self._write_if_changed(path, url)
+
+    def write_nfo_sync(self, path: str, content: str, skip_if_exists: bool = False) -> bool:
+        """Synchronous write_nfo for callers without an event loop (same skip rules)."""
+        if skip_if_exists and os.path.exists(path):
+            return False
+        return self._write_if_changed(path, content)
+
+    async def update_nfo_video_codec(self, path: str, codec: str) -> Optional[bool]:
+        """
+        Replace the video codec of an existing NFO, keeping everything else.
+
+        @param path Path to the NFO file
+        @param codec New container extension
+        @returns True if written, False if unchanged, None if there is no NFO with a video codec to patch
+        """
+        return await asyncio.to_thread(self._patch_nfo_video_codec, path, codec)
+
+    def _patch_nfo_video_codec(self, path: str, codec: str) -> Optional[bool]:
+        try:
+            with open(path, 'r') as f:
+                content = f.read()
+        except OSError:
+            return None
+        replacement = self._escape_xml(codec)
+        patched, count = _NFO_VIDEO_CODEC_RE.subn(lambda m: f"{m.group(1)}{replacement}{m.group(2)}", content, count=1)
+        if not count:
+            return None
+        return self._write_if_changed(path, patched)
+
+    def _write_if_changed(self, path: str, content: str) -> bool:
+        try:
+            with open(path, 'r') as f:
+                if f.read().strip() == content.strip():
                     return False  # Content unchanged, skip write
-            except Exception:
-                pass  # If we can't read, just overwrite
+        except Exception:
+            pass  # Missing or unreadable, just (over)write
 
-        async with aiofiles.open(path, 'w') as f:
-            await f.write(content)
+        with open(path, 'w') as f:
+            f.write(content)
         return True
 
     async def delete_file(self, path: str):
@@ -78,105 +202,93 @@ class FileManager:
     async def delete_directory_if_empty(self, path: str):
         try:
             os.rmdir(path)
+            self._ensured_dirs.discard(path)
         except OSError:
             pass # Directory not empty
 
+    def get_title_cleaner(self, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False) -> Callable[[str], str]:
+        """Return a title cleaning function for the given settings, to apply in a loop"""
+        return _get_title_cleaner(prefix_regex, format_date, clean_name)
+
     def clean_title(self, title: str, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False) -> str:
         """Centralized logic to clean media titles based on settings"""
-        if not title:
-            return "Unknown"
-            
-        # Strip language prefix
-        regex = prefix_regex if prefix_regex else r'^(?:[A-Za-z0-9.-]+_|[A-Za-z]{2,}\s*-\s*)'
-        try:
-            title = re.sub(regex, '', title)
-        except re.error:
-            title = re.sub(r'^(?:[A-Za-z0-9.-]+_|[A-Za-z]{2,}\s*-\s*)', '', title)
-            
-        # Format date at end (e.g. "Movie_2024" -> "Movie (2024)")
-        if format_date:
-            title = re.sub(r'[_\s](\d{4})$', r' (\1)', title)
-            
-        # Clean name (underscores to spaces)
-        if clean_name:
-            title = title.replace('_', ' ')
-            
-        return title.strip()
+        return _get_title_cleaner(prefix_regex, format_date, clean_name)(title)
 
-    def get_movie_target_info(self, movie_data: dict, cat_name: str, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False, use_category_folders: bool = True) -> dict:
-        """Determine target directory and filename for a movie"""
-        name = movie_data.get('name', 'Unknown')
-        o_name = movie_data.get('o_name')
-        tmdb_id = movie_data.get('tmdb') or movie_data.get('tmdb_id', '')
-        
+    def get_nfo_generators(self, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False) -> Tuple[Callable[[dict], str], Callable[[dict], str]]:
+        """Return (movie_nfo, show_nfo) functions bound to the given naming settings, to apply in a loop"""
+        clean = _get_title_cleaner(prefix_regex, format_date, clean_name)
+
+        def movie_nfo(movie_data: dict) -> str:
+            title = clean(movie_data.get('o_name') or movie_data.get('name', 'Unknown'))
+            return self._build_movie_nfo(movie_data, title, _valid_tmdb_id(movie_data))
+
+        def show_nfo(series_data: dict) -> str:
+            title = clean(series_data.get('o_name') or series_data.get('name', 'Unknown'))
+            return self._build_show_nfo(series_data, title, _valid_tmdb_id(series_data))
+
+        return movie_nfo, show_nfo
+
+    def _common_target(self, data: dict, cat_name: str, prefix_regex: Optional[str], format_date: bool, clean_name: bool) -> dict:
+        """Naming pieces shared by movie and series targets (cleaned/sanitized title, category dir, TMDB folder name)"""
         # Priority for cleaning: o_name > name
-        title_to_clean = o_name or name
-        cleaned_title = self.clean_title(title_to_clean, prefix_regex, format_date, clean_name)
-        
-        safe_cat = self.sanitize_name(cat_name)
+        cleaned_title = self.clean_title(data.get('o_name') or data.get('name', 'Unknown'), prefix_regex, format_date, clean_name)
         safe_title = self.sanitize_name(cleaned_title)
-        
-        cat_dir = os.path.join(self.output_dir, safe_cat)
-        
-        if use_category_folders:
-            base_parent_dir = cat_dir
-        else:
-            base_parent_dir = self.output_dir
+        tmdb_id = _valid_tmdb_id(data)
+
+        return {
+            "cat_dir": os.path.join(self.output_dir, self.sanitize_name(cat_name)),
+            "safe_title": safe_title,
+            "folder_name": f"{safe_title} {{tmdb-{tmdb_id}}}" if tmdb_id else safe_title,
+            "cleaned_title": cleaned_title,
+            "tmdb_id": tmdb_id
+        }
+
+    def get_movie_target_info(self, movie_data: dict, cat_name: str, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False, use_category_folders: bool = True) -> dict:
+        """Determine target directory and filename for a movie"""
+        common = self._common_target(movie_data, cat_name, prefix_regex, format_date, clean_name)
+        base_parent_dir = common["cat_dir"] if use_category_folders else self.output_dir
 
-        if tmdb_id and str(tmdb_id) not in ['0', 'None', 'null', '']:
-            folder_name = f"{safe_title} {{tmdb-{tmdb_id}}}"
-            target_dir = os.path.join(base_parent_dir, folder_name)
-            filename_base = folder_name
+        # Movies with a TMDB id get their own folder, others sit in the parent dir
+        if common["tmdb_id"]:
+            target_dir = os.path.join(base_parent_dir, common["folder_name"])
         else:
             target_dir = base_parent_dir
-            filename_base = safe_title
-            
+
         return {
-            "cat_dir": cat_dir,
+            "cat_dir": common["cat_dir"],
             "target_dir": target_dir,
-            "filename_base": filename_base,
-            "cleaned_title": cleaned_title,
-            "tmdb_id": tmdb_id if tmdb_id and str(tmdb_id) not in ['0', 'None', 'null', ''] else None
+            "filename_base": common["folder_name"],
+            "cleaned_title": common["cleaned_title"],
+            "tmdb_id": common["tmdb_id"]
         }
 
     def get_series_target_info(self, series_data: dict, cat_name: str, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False, use_category_folders: bool = True) -> dict:
         """Determine target directory and base folder name for a series"""
-        name = series_data.get('name', 'Unknown')
-        o_name = series_data.get('o_name')
-        tmdb_id = series_data.get('tmdb') or series_data.get('tmdb_id', '')
-        
-        title_to_clean = o_name or name
-        cleaned_title = self.clean_title(title_to_clean, prefix_regex, format_date, clean_name)
-        
-        safe_cat = self.sanitize_name(cat_name)
-        safe_title = self.sanitize_name(cleaned_title)
-        
-        if use_category_folders:
-            base_parent_dir = os.path.join(self.output_dir, safe_cat)
-        else:
-            base_parent_dir = self.output_dir
-            
-        if tmdb_id and str(tmdb_id) not in ['0', 'None', 'null', '']:
-            folder_name = f"{safe_title} {{tmdb-{tmdb_id}}}"
-        else:
-            folder_name = safe_title
-            
-        series_dir = os.path.join(base_parent_dir, folder_name)
-        
+        common = self._common_target(series_data, cat_name, prefix_regex, format_date, clean_name)
+        base_parent_dir = common["cat_dir"] if use_category_folders else self.output_dir
+
         return {
-            "cat_dir": os.path.join(self.output_dir, safe_cat),
-            "series_dir": series_dir,
-            "folder_name": folder_name,
-            "cleaned_title": cleaned_title,
-            "safe_series_name": safe_title,
-            "tmdb_id": tmdb_id if tmdb_id and str(tmdb_id) not in ['0', 'None', 'null', ''] else None
+            "cat_dir": common["cat_dir"],
+            "series_dir": os.path.join(base_parent_dir, common["folder_name"]),
+            "folder_name": common["folder_name"],
+            "cleaned_title": common["cleaned_title"],
+            "safe_series_name": common["safe_title"],
+            "tmdb_id": common["tmdb_id"]
         }
 
     def generate_movie_nfo(self, movie_data: dict, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False) -> str:
         """Generate NFO file for a movie with comprehensive metadata"""
-        tmdb_id = movie_data.get('tmdb') or movie_data.get('tmdb_id', '')
         title = self.clean_title(movie_data.get('o_name') or movie_data.get('name', 'Unknown'), prefix_regex, format_date, clean_name)
-        
+        return self._build_movie_nfo(movie_data, title, _valid_tmdb_id(movie_data))
+
+    def prepare_movie(self, movie_data: dict, cat_name: str, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False, use_category_folders: bool = True) -> Tuple[dict, str]:
+        """Compute target info and NFO content for a movie, cleaning the title only once"""
+        target_info = self.get_movie_target_info(movie_data, cat_name, prefix_regex, format_date, clean_name, use_category_folders)
+        nfo = self._build_movie_nfo(movie_data, target_info["cleaned_title"], target_info["tmdb_id"])
+        return target_info, nfo
+
+    def _build_movie_nfo(self, movie_data: dict, title: str, tmdb_id: Optional[str]) -> str:
+        """Build the movie NFO from an already cleaned title and validated TMDB id"""
         plot = movie_data.get('plot') or movie_data.get('description', '')
         year = movie_data.get('year') or movie_data.get('releasedate', '')
         rating = movie_data.get('rating') or movie_data.get('rating_5based', '')
@@ -197,7 +309,7 @@ class FileManager:
         nfo += f'  <originaltitle>{self._escape_xml(movie_data.get("o_name", ""))}</originaltitle>\n'
         
         # TMDB / IMDB IDs
-        if tmdb_id and str(tmdb_id) not in ['0', 'None', 'null', '']:
+        if tmdb_id:
             nfo += f'  <tmdbid>{tmdb_id}</tmdbid>\n'
             nfo += f'  <uniqueid type="tmdb" default="true">{tmdb_id}</uniqueid>\n'
         
@@ -221,10 +333,7 @@ class FileManager:
                 if movie_data.get('rating_5based'):
                     r_val *= 2
                 
-                nfo += '  <ratings>\n'
-                nfo += f'    <rating name="tmdb" default="true"><value>{r_val:.1f}</value></rating>\n'
-                nfo += '  </ratings>\n'
-                nfo += f'  <userrating>{int(round(r_val))}</userrating>\n'
+                nfo += _rating_xml(r_val)
             except (ValueError, TypeError):
                 pass
         
@@ -304,9 +413,17 @@ class FileManager:
 
     def generate_show_nfo(self, series_data: dict, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False) -> str:
         """Generate NFO file for a TV show"""
-        tmdb_id = series_data.get('tmdb') or series_data.get('tmdb_id', '')
         title = self.clean_title(series_data.get('o_name') or series_data.get('name', 'Unknown'), prefix_regex, format_date, clean_name)
-        
+        return self._build_show_nfo(series_data, title, _valid_tmdb_id(series_data))
+
+    def prepare_series(self, series_data: dict, cat_name: str, prefix_regex: Optional[str] = None, format_date: bool = False, clean_name: bool = False, use_category_folders: bool = True) -> Tuple[dict, str]:
+        """Compute target info and tvshow.nfo content for a series, cleaning the title only once"""
+        target_info = self.get_series_target_info(series_data, cat_name, prefix_regex, format_date, clean_name, use_category_folders)
+        nfo = self._build_show_nfo(series_data, target_info["cleaned_title"], target_info["tmdb_id"])
+        return target_info, nfo
+
+    def _build_show_nfo(self, series_data: dict, title: str, tmdb_id: Optional[str]) -> str:
+        """Build the TV show NFO from an already cleaned title and validated TMDB id"""
         plot = series_data.get('plot') or series_data.get('description', '')
         year = series_data.get('year') or series_data.get('releaseDate', '')
         rating = series_data.get('rating') or series_data.get('rating_5based', '')
@@ -322,7 +439,7 @@ class FileManager:
         
         nfo += f'  <title>{self._escape_xml(title)}</title>\n'
         
-        if tmdb_id and str(tmdb_id) not in ['0', 'None', 'null', '']:
+        if tmdb_id:
              nfo += f'  <tmdbid>{tmdb_id}</tmdbid>\n'
              nfo += f'  <uniqueid type="tmdb" default="true">{tmdb_id}</uniqueid>\n'
 
@@ -340,10 +457,7 @@ class FileManager:
                 if series_data.get('rating_5based'):
                     r_val *= 2
                 
-                nfo += '  <ratings>\n'
-                nfo += f'    <rating name="tmdb" default="true"><value>{r_val:.1f}</value></rating>\n'
-                nfo += '  </ratings>\n'
-                nfo += f'  <userrating>{int(round(r_val))}</userrating>\n'
+                nfo += _rating_xml(r_val)
             except (ValueError, TypeError):
                 pass
         
@@ -1,11 +1,15 @@
 import re
 import requests
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 1024 * 1024  # Bytes read per network/disk chunk while streaming a playlist
+
+_EXTINF_ATTR_RE = re.compile(r'(tvg-id|tvg-name|tvg-logo|logo|group-title)="([^"]*)"')
+
 class M3UParser:
     """Parser for M3U/M3U8 playlist files"""
     
@@ -14,66 +18,68 @@ class M3UParser:
     
     def parse_from_url(self, url: str) -> List[Dict]:
         """Fetch and parse M3U from URL"""
+        return list(self.iter_from_url(url))
+    
+    def parse_from_file(self, file_path: str) -> List[Dict]:
+        """Parse M3U from file"""
+        return list(self.iter_from_file(file_path))
+    
+    def parse_content(self, content: str) -> List[Dict]:
+        """Parse M3U content and extract entries"""
+        return list(self.iter_entries(content.strip().split('\n')))
+    
+    def iter_from_url(self, url: str) -> Iterator[Dict]:
+        """Stream and parse M3U from URL without holding the whole playlist in memory"""
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            content = response.text
-            return self.parse_content(content)
+            with requests.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                if response.encoding is None:
+                    response.encoding = 'utf-8'
+                yield from self.iter_entries(response.iter_lines(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True))
         except Exception as e:
             logger.error(f"Error fetching M3U from URL {url}: {e}")
             raise
     
-    def parse_from_file(self, file_path: str) -> List[Dict]:
-        """Parse M3U from file"""
+    def iter_from_file(self, file_path: str) -> Iterator[Dict]:
+        """Parse M3U from file line by line"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return self.parse_content(content)
+            with open(file_path, 'r', encoding='utf-8', buffering=STREAM_CHUNK_SIZE) as f:
+                yield from self.iter_entries(f)
         except Exception as e:
             logger.error(f"Error reading M3U file {file_path}: {e}")
             raise
     
-    def parse_content(self, content: str) -> List[Dict]:
-        """Parse M3U content and extract entries"""
-        entries = []
-        lines = content.strip().split('\n')
+    def iter_entries(self, lines: Iterable[str]) -> Iterator[Dict]:
+        """Yield entries from M3U lines in a single pass"""
+        count = 0
+        pending = None  # EXTINF entry waiting for its URL line
         
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
+        for raw in lines:
+            line = raw.strip()
             
-            # Skip empty lines and comments that aren't EXTINF
-            if not line or (line.startswith('#') and not line.startswith('#EXTINF')):
-                i += 1
+            if pending is not None:
+                # Next non-empty line should be the URL; it is consumed either way
+                if not line:
+                    continue
+                if not line.startswith('#'):
+                    pending['url'] = line
+                    
+                    # Refine entry_type based on URL pattern (more reliable for Xtream Codes)
+                    if '/series/' in line:
+                        pending['entry_type'] = 'series'
+                    elif '/movie/' in line:
+                        pending['entry_type'] = 'movie'
+                    
+                    count += 1
+                    yield pending
+                pending = None
                 continue
             
-            # Look for EXTINF line
+            # Look for EXTINF line; skip empty lines, other comments and stray URLs
             if line.startswith('#EXTINF'):
-                # Parse EXTINF metadata
-                entry = self._parse_extinf(line)
-                
-                # Next non-empty line should be the URL
-                i += 1
-                while i < len(lines) and not lines[i].strip():
-                    i += 1
-                
-                if i < len(lines):
-                    url = lines[i].strip()
-                    if url and not url.startswith('#'):
-                        entry['url'] = url
-                        
-                        # Refine entry_type based on URL pattern (more reliable for Xtream Codes)
-                        if '/series/' in url:
-                            entry['entry_type'] = 'series'
-                        elif '/movie/' in url:
-                            entry['entry_type'] = 'movie'
-                            
-                        entries.append(entry)
-            
-            i += 1
+                pending = self._parse_extinf(line)
         
-        logger.info(f"Parsed {len(entries)} entries from M3U content")
-        return entries
+        logger.info(f"Parsed {count} entries from M3U content")
     
     def _parse_extinf(self, line: str) -> Dict:
         """Parse EXTINF line and extract metadata"""
@@ -86,32 +92,20 @@ class M3UParser:
             'entry_type': 'live'
         }
         
-        # Extract tvg-id
-        tvg_id_match = re.search(r'tvg-id="([^"]*)"', line)
-        if tvg_id_match:
-            entry['tvg_id'] = tvg_id_match.group(1)
-        
-        # Extract tvg-name
-        tvg_name_match = re.search(r'tvg-name="([^"]*)"', line)
-        if tvg_name_match:
-            entry['tvg_name'] = tvg_name_match.group(1)
+        # All quoted attributes in one scan; the first occurrence of each wins
+        attrs = {}
+        for key, value in _EXTINF_ATTR_RE.findall(line):
+            attrs.setdefault(key, value)
         
-        # Extract tvg-logo or logo
-        logo_match = re.search(r'tvg-logo="([^"]*)"', line)
-        if not logo_match:
-            logo_match = re.search(r'logo="([^"]*)"', line)
-        if logo_match:
-            entry['logo'] = logo_match.group(1)
+        entry['tvg_id'] = attrs.get('tvg-id')
+        entry['tvg_name'] = attrs.get('tvg-name')
+        entry['logo'] = attrs['tvg-logo'] if 'tvg-logo' in attrs else attrs.get('logo')
+        entry['group_title'] = attrs.get('group-title')
         
-        # Extract group-title
-        group_match = re.search(r'group-title="([^"]*)"', line)
-        if group_match:
-            entry['group_title'] = group_match.group(1)
-        
-        # Extract title (usually after the last comma)
-        title_match = re.search(r',(.+)$', line)
-        if title_match:
-            entry['title'] = title_match.group(1).strip()
+        # Extract title (everything after the first comma)
+        comma = line.find(',')
+        if comma != -1 and comma < len(line) - 1:
+            entry['title'] = line[comma + 1:].strip()
         
         # Determine entry type
         # Default to live, will be refined based on URL in parse_content
@@ -130,3 +124,13 @@ def parse_m3u_file(file_path: str) -> List[Dict]:
     """Helper function to parse M3U from file"""
     parser = M3UParser()
     return parser.parse_from_file(file_path)
+
+
+def iter_m3u_url(url: str) -> Iterator[Dict]:
+    """Helper function to stream-parse M3U from URL"""
+    return M3UParser().iter_from_url(url)
+
+
+def iter_m3u_file(file_path: str) -> Iterator[Dict]:
+    """Helper function to stream-parse M3U from file"""
+    return M3UParser().iter_from_file(file_path)
@@ -13,12 +13,242 @@ and media streaming URL generation.
         client = PlexClient(result["auth_token"])
         servers = client.get_servers()
 """
-from typing import List, Dict, Optional, Any
+from collections import OrderedDict, deque
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator, Set, Tuple
+from urllib.parse import quote_plus, urlencode
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 import logging
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
+# Items fetched per library page, and how many pages are fetched in parallel
+LIBRARY_PAGE_SIZE = 500
+LIBRARY_PAGE_WORKERS = 4
+PAGE_FETCH_ATTEMPTS = 3
+
+# Shows whose episodes are fetched in parallel during a series sync
+SHOW_EPISODE_WORKERS = 8
+
+# HTTP connections kept per Plex server session
+SERVER_POOL_SIZE = 20
+# Connected servers are reused across tasks for this many seconds, then reconnected
+# (which revalidates the token and picks up server-side changes)
+SERVER_CACHE_TTL = 300
+
+# Parsed library snapshots are reused without asking Plex for this many seconds,
+# then revalidated against the section's updatedAt timestamp
+LIBRARY_CACHE_TTL = 300
+LIBRARY_CACHE_MAX_ENTRIES = 32
+# Larger libraries are streamed without keeping a snapshot in memory
+LIBRARY_CACHE_MAX_ITEMS = 20000
+
+# Plex search type ids (plexapi.utils.SEARCHTYPES) of the listed library types
+SEARCH_TYPES = {"movie": 1, "show": 2}
+
+# Cached library items: shared field names and one tuple of values per item
+LibrarySnapshot = Tuple[Tuple[str, ...], List[tuple]]
+
+_GUID_RE = re.compile(r'^(tmdb|imdb|tvdb)://(.+)$')
+
+# Constant part of the universal transcode query string, encoded once
+_STREAM_STATIC_QS = urlencode({
+    'mediaIndex': '0',
+    'partIndex': '0',
+    'protocol': 'hls',
+    'fastSeek': '1',
+    'directPlay': '0',
+    'directStream': '1',
+    'subtitleSize': '100',
+    'audioBoost': '100',
+    'location': 'wan',
+    'addDebugOverlay': '0',
+    'directStreamAudio': '1',
+    'mediaBufferSize': '102400',
+    'subtitles': 'burn',
+    'Accept-Language': 'en',
+    'X-Plex-Client-Identifier': 'xtream-to-strm',
+    'X-Plex-Product': 'Xtream to STRM',
+    'X-Plex-Platform': 'Generic',
+})
+
+
+def _cast(func: Callable[[Any], Any], value: Any) -> Any:
+    """Convert a JSON attribute like plexapi does, returning None when absent or invalid."""
+    if value is None:
+        return None
+    try:
+        return func(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_guid(guid_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Extract TMDB/IMDB/TVDB IDs from Plex GUIDs.
+
+    @param guid_ids GUID strings such as "tmdb://603"
+    @returns Dict with tmdb, imdb, tvdb keys
+    """
+    result = {"tmdb": None, "imdb": None, "tvdb": None}
+    for guid_str in guid_ids:
+        match = _GUID_RE.match(guid_str)
+        if match:
+            result[match.group(1)] = match.group(2)
+    return result
+
+
+def _tags(meta: Dict[str, Any], element: str, limit: Optional[int] = None) -> List[str]:
+    return [tag["tag"] for tag in meta.get(element, ())[:limit]]
+
+
+def _item_key(meta: Dict[str, Any]) -> str:
+    # Listings point shows at their children; plexapi strips the suffix the same way
+    return meta["key"].replace("/children", "")
+
+
+def _updated_at(meta: Dict[str, Any]) -> Optional[str]:
+    updated_at = _cast(int, meta.get("updatedAt"))
+    return str(datetime.fromtimestamp(updated_at)) if updated_at else None
+
+
+def _media_info(item) -> Dict[str, Any]:
+    """
+    Extract media file info (container, resolution, etc.).
+
+    @param item Plex media item
+    @returns Dict with container, video_codec, audio_codec, resolution, bitrate
+    """
+    media_list = getattr(item, 'media', None)
+    if not media_list:
+        return {}
+    media = media_list[0]
+    return {
+        "container": getattr(media, 'container', None),
+        "video_codec": getattr(media, 'videoCodec', None),
+        "audio_codec": getattr(media, 'audioCodec', None),
+        "resolution": getattr(media, 'videoResolution', None),
+        "bitrate": getattr(media, 'bitrate', None)
+    }
+
+
+def _metadata_media_info(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract media file info from a JSON library entry (see _media_info).
+
+    @param meta Metadata entry of a JSON MediaContainer
+    @returns Dict with container, video_codec, audio_codec, resolution, bitrate
+    """
+    media_list = meta.get("Media")
+    if not media_list:
+        return {}
+    media = media_list[0]
+    return {
+        "container": media.get("container"),
+        "video_codec": media.get("videoCodec"),
+        "audio_codec": media.get("audioCodec"),
+        "resolution": media.get("videoResolution"),
+        "bitrate": _cast(int, media.get("bitrate"))
+    }
+
+
+def _build_movie_dict(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a JSON movie entry into the dict returned by get_movies."""
+    return {
+        "key": _item_key(meta),
+        "rating_key": _cast(int, meta.get("ratingKey")),
+        "title": meta.get("title"),
+        "original_title": meta.get("originalTitle"),
+        "year": _cast(int, meta.get("year")),
+        "summary": meta.get("summary"),
+        "rating": _cast(float, meta.get("rating")),
+        "duration": _cast(int, meta.get("duration")),
+        "genres": _tags(meta, "Genre"),
+        "directors": _tags(meta, "Director"),
+        "actors": _tags(meta, "Role", 10),
+        "thumb": meta.get("thumb"),
+        "art": meta.get("art"),
+        "guid": _parse_guid(guid["id"] for guid in meta.get("Guid", ())),
+        "updated_at": _updated_at(meta),
+        "media": _metadata_media_info(meta)
+    }
+
+
+def _build_show_dict(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a JSON show entry into the dict returned by get_shows."""
+    return {
+        "key": _item_key(meta),
+        "rating_key": _cast(int, meta.get("ratingKey")),
+        "title": meta.get("title"),
+        "original_title": meta.get("originalTitle"),
+        "year": _cast(int, meta.get("year")),
+        "summary": meta.get("summary"),
+        "rating": _cast(float, meta.get("rating")),
+        "genres": _tags(meta, "Genre"),
+        "actors": _tags(meta, "Role", 10),
+        "thumb": meta.get("thumb"),
+        "art": meta.get("art"),
+        "guid": _parse_guid(guid["id"] for guid in meta.get("Guid", ())),
+        "updated_at": _updated_at(meta),
+        "season_count": _cast(int, meta.get("childCount"))
+    }
+
+
+def _prefetch(executor: ThreadPoolExecutor, fn: Callable[[Any], Any], items: Iterable[Any],
+              window: int) -> Iterator[Tuple[Any, Any]]:
+    """
+    Yield (item, fn(item)) in input order, keeping at most `window` calls in flight.
+
+    @param executor Executor running the calls
+    @param fn Function applied to each item
+    @param items Items to process, consumed lazily
+    @param window Maximum number of submitted but not yet yielded calls
+    @returns Iterator of (item, result) tuples
+    """
+    items = iter(items)
+    pending = deque()
+    for item in islice(items, window):
+        pending.append((item, executor.submit(fn, item)))
+
+    while pending:
+        item, future = pending.popleft()
+        result = future.result()
+        for next_item in islice(items, 1):
+            pending.append((next_item, executor.submit(fn, next_item)))
+        yield item, result
+
+
+def _prefetch_unordered(executor: ThreadPoolExecutor, fn: Callable[[Any], Any], items: Iterable[Any],
+                        window: int) -> Iterator[Tuple[Any, Any]]:
+    """
+    Yield (item, fn(item)) as calls complete, keeping at most `window` calls in flight.
+
+    Unlike _prefetch, one slow call does not hold back results that are already done.
+
+    @param executor Executor running the calls
+    @param fn Function applied to each item
+    @param items Items to process, consumed lazily
+    @param window Maximum number of submitted but not yet yielded calls
+    @returns Iterator of (item, result) tuples in completion order
+    """
+    items = iter(items)
+    pending = {executor.submit(fn, item): item for item in islice(items, window)}
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            item = pending.pop(future)
+            for next_item in islice(items, 1):
+                pending[executor.submit(fn, next_item)] = next_item
+            yield item, future.result()
+
 
 class PlexClient:
     """
@@ -28,6 +258,12 @@ class PlexClient:
     Provides both sync and async-compatible methods.
     """
 
+    # Shared by all instances of the process: a client is created per task/request.
+    # (server machine id, library key, libtype) -> (checked_at, section updatedAt, items)
+    # (uri, access token) -> (connected_at, connected PlexServer)
+    _server_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+    _library_cache: "OrderedDict[Tuple[str, str, str], Tuple[float, Any, LibrarySnapshot]]" = OrderedDict()
+
     def __init__(self, auth_token: str):
         """
         Initialize PlexClient with an auth token.
@@ -128,14 +364,29 @@ class PlexClient:
         """
         Connect to a specific Plex server.
 
+        Connections are reused per (uri, token) for SERVER_CACHE_TTL seconds so
+        that all calls, across tasks of the worker, share one pooled HTTP session.
+
         @param uri Server connection URL
         @param access_token Server-specific access token
         @returns PlexServer instance or None on failure
         """
         self._import_plexapi()
+        cache_key = (uri, access_token)
+        cached = self._server_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < SERVER_CACHE_TTL:
+            return cached[1]
         try:
-            return self._PlexServer(uri, access_token)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=SERVER_POOL_SIZE, pool_maxsize=SERVER_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            server = self._PlexServer(uri, access_token, session=session, timeout=60)
+            self._server_cache[cache_key] = (time.monotonic(), server)
+            return server
         except Exception as e:
+            # Do not keep serving a connection that can no longer be established
+            self._server_cache.pop(cache_key, None)
             logger.error(f"Failed to connect to Plex server {uri}: {e}")
             return None
 
@@ -172,94 +423,205 @@ class PlexClient:
             logger.error(f"Failed to get libraries: {e}")
         return libraries
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def get_movies(self, server, library_key: str) -> List[Dict[str, Any]]:
+    def _iter_section_metadata(self, server, section, libtype: str) -> Iterator[Dict[str, Any]]:
         """
-        Get movies from a library section.
+        Iterate over all items of a library section using paged container requests.
+
+        Pages are requested as JSON and decoded with orjson, bypassing plexapi's XML
+        parsing and object model for this bulk listing. Up to LIBRARY_PAGE_WORKERS
+        pages of LIBRARY_PAGE_SIZE items are fetched in parallel ahead of the
+        consumer, so only a bounded window of pages is held in memory.
 
         @param server PlexServer instance
-        @param library_key Library section key
-        @returns List of movie dicts with metadata
+        @param section plexapi LibrarySection
+        @param libtype Plex library type ("movie" or "show")
+        @returns Iterator over Metadata entries, in library order
         """
-        section = server.library.sectionByID(int(library_key))
-        movies = []
+        total = section.totalViewSize(libtype=libtype, includeCollections=False) or 0
+        url = server.url(f"/library/sections/{section.key}/all")
+        headers = server._headers(Accept="application/json")
+        type_id = SEARCH_TYPES[libtype]
 
-        for item in section.all():
+        def fetch_page(start: int) -> List[Dict[str, Any]]:
+            params = {
+                "type": type_id,
+                "includeGuids": 1,
+                "X-Plex-Container-Start": start,
+                "X-Plex-Container-Size": LIBRARY_PAGE_SIZE,
+            }
+            # Retried per page, so a transient error does not restart the whole library
+            for attempt in range(PAGE_FETCH_ATTEMPTS):
+                try:
+                    response = server._session.get(url, headers=headers, params=params, timeout=server._timeout)
+                    response.raise_for_status()
+                    return orjson.loads(response.content).get("MediaContainer", {}).get("Metadata", [])
+                except requests.RequestException as e:
+                    status = e.response.status_code if e.response is not None else None
+                    if attempt == PAGE_FETCH_ATTEMPTS - 1 or (status is not None and status < 500):
+                        raise
+                    logger.warning(f"Retrying Plex library page at offset {start}: {e}")
+                    time.sleep(min(4 * 2 ** attempt, 10))
+
+        with ThreadPoolExecutor(max_workers=LIBRARY_PAGE_WORKERS) as executor:
+            offsets = range(0, total, LIBRARY_PAGE_SIZE)
+            for _, page in _prefetch(executor, fetch_page, offsets, LIBRARY_PAGE_WORKERS):
+                yield from page
+
+    def _library_cache_key(self, server, library_key: str, libtype: str) -> Tuple[str, str, str]:
+        return (getattr(server, "machineIdentifier", None) or server._baseurl, str(library_key), libtype)
+
+    def _get_cached_library(self, cache_key: Tuple[str, str, str], section) -> Optional[LibrarySnapshot]:
+        """
+        Return the cached items of a library section if they are still current.
+
+        Within LIBRARY_CACHE_TTL the snapshot is served as is; after that the section
+        is reloaded (one request) and the snapshot is kept if updatedAt did not change.
+
+        @param cache_key Key built by _library_cache_key
+        @param section plexapi LibrarySection
+        @returns Cached (fields, rows) snapshot, or None on a cache miss
+        """
+        entry = self._library_cache.get(cache_key)
+        if entry is None:
+            return None
+        checked_at, updated_at, items = entry
+
+        if time.monotonic() - checked_at >= LIBRARY_CACHE_TTL:
             try:
-                movie_data = {
-                    "key": item.key,
-                    "rating_key": item.ratingKey,
-                    "title": item.title,
-                    "original_title": getattr(item, 'originalTitle', None),
-                    "year": item.year,
-                    "summary": getattr(item, 'summary', None),
-                    "rating": getattr(item, 'rating', None),
-                    "duration": getattr(item, 'duration', None),
-                    "genres": [g.tag for g in item.genres] if hasattr(item, 'genres') and item.genres else [],
-                    "directors": [d.tag for d in item.directors] if hasattr(item, 'directors') and item.directors else [],
-                    "actors": [a.tag for a in item.roles[:10]] if hasattr(item, 'roles') and item.roles else [],
-                    "thumb": item.thumb if hasattr(item, 'thumb') else None,
-                    "art": item.art if hasattr(item, 'art') else None,
-                    "guid": self._parse_guid(item),
-                    "updated_at": str(item.updatedAt) if hasattr(item, 'updatedAt') and item.updatedAt else None,
-                    "media": self._get_media_info(item)
-                }
-                movies.append(movie_data)
+                section.reload()
             except Exception as e:
-                logger.warning(f"Error processing movie {getattr(item, 'title', 'unknown')}: {e}")
-                continue
-
-        return movies
+                logger.warning(f"Failed to revalidate Plex library {cache_key[1]}: {e}")
+                return None
+            if section.updatedAt != updated_at:
+                self._library_cache.pop(cache_key, None)
+                return None
+            self._library_cache[cache_key] = (time.monotonic(), updated_at, items)
+
+        self._library_cache.move_to_end(cache_key)
+        return items
+
+    def _store_cached_library(self, cache_key: Tuple[str, str, str], section, items: LibrarySnapshot):
+        """Remember the parsed items of a library section, evicting the oldest entries."""
+        self._library_cache[cache_key] = (time.monotonic(), section.updatedAt, items)
+        self._library_cache.move_to_end(cache_key)
+        while len(self._library_cache) > LIBRARY_CACHE_MAX_ENTRIES:
+            self._library_cache.popitem(last=False)
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def get_shows(self, server, library_key: str) -> List[Dict[str, Any]]:
+    def _get_section(self, server, library_key: str):
+        return server.library.sectionByID(int(library_key))
+
+    def _iter_library(self, server, library_key: str, libtype: str,
+                      parse: Callable[[Any], Dict[str, Any]],
+                      known: Optional[Set[Tuple[str, Optional[str]]]] = None,
+                      seen: Optional[Set[str]] = None) -> Iterator[Dict[str, Any]]:
         """
-        Get TV shows from a library section.
+        Yield parsed items of a library section, one at a time.
+
+        Served from the library snapshot cache when it is still current. Otherwise
+        items are streamed from Plex and kept as the new snapshot unless the library
+        exceeds LIBRARY_CACHE_MAX_ITEMS. Snapshots store one tuple of values per item
+        plus the shared field names, which is several times smaller than a dict per
+        item; dicts are rebuilt when the snapshot is served.
+
+        Items whose (key, updated_at) signature is in `known` are not built nor
+        yielded; their key is still added to `seen`, so callers can tell them apart
+        from items that were removed from the library.
 
         @param server PlexServer instance
         @param library_key Library section key
-        @returns List of show dicts with metadata
+        @param libtype Plex library type ("movie" or "show")
+        @param parse Converts a JSON Metadata entry into its dict representation
+        @param known Signatures of items the caller already has up to date
+        @param seen Set receiving the key of every item in the library
+        @returns Iterator over item dicts
         """
-        section = server.library.sectionByID(int(library_key))
-        shows = []
-
-        for item in section.all():
+        section = self._get_section(server, library_key)
+        cache_key = self._library_cache_key(server, library_key, libtype)
+        cached = self._get_cached_library(cache_key, section)
+        if cached is not None:
+            fields, rows = cached
+            key_index = fields.index("key")
+            updated_index = fields.index("updated_at")
+            for row in rows:
+                if seen is not None:
+                    seen.add(row[key_index])
+                if known and (row[key_index], row[updated_index]) in known:
+                    continue
+                yield dict(zip(fields, row))
+            return
+
+        fields: Tuple[str, ...] = ()
+        rows: Optional[List[tuple]] = []
+        for item in self._iter_section_metadata(server, section, libtype):
             try:
-                show_data = {
-                    "key": item.key,
-                    "rating_key": item.ratingKey,
-                    "title": item.title,
-                    "original_title": getattr(item, 'originalTitle', None),
-                    "year": item.year,
-                    "summary": getattr(item, 'summary', None),
-                    "rating": getattr(item, 'rating', None),
-                    "genres": [g.tag for g in item.genres] if hasattr(item, 'genres') and item.genres else [],
-                    "actors": [a.tag for a in item.roles[:10]] if hasattr(item, 'roles') and item.roles else [],
-                    "thumb": item.thumb if hasattr(item, 'thumb') else None,
-                    "art": item.art if hasattr(item, 'art') else None,
-                    "guid": self._parse_guid(item),
-                    "updated_at": str(item.updatedAt) if hasattr(item, 'updatedAt') and item.updatedAt else None,
-                    "season_count": item.childCount if hasattr(item, 'childCount') else 0
-                }
-                shows.append(show_data)
+                if seen is not None or known:
+                    key = _item_key(item)
+                    if seen is not None:
+                        seen.add(key)
+                    if known and (key, _updated_at(item)) in known:
+                        # The snapshot would be incomplete without this item
+                        rows = None
+                        continue
+                data = parse(item)
             except Exception as e:
-                logger.warning(f"Error processing show {getattr(item, 'title', 'unknown')}: {e}")
+                logger.warning(f"Error processing {libtype} {item.get('title', 'unknown')}: {e}")
                 continue
 
-        return shows
+            if rows is not None:
+                if not fields:
+                    fields = tuple(data)
+                rows.append(tuple(data.values()))
+                if len(rows) > LIBRARY_CACHE_MAX_ITEMS:
+                    rows = None
+            yield data
+
+        if rows is not None:
+            self._store_cached_library(cache_key, section, (fields, rows))
+
+    def get_movies(self, server, library_key: str,
+                   known: Optional[Set[Tuple[str, Optional[str]]]] = None,
+                   seen: Optional[Set[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Get movies from a library section.
+
+        @param server PlexServer instance
+        @param library_key Library section key
+        @param known Optional (key, updated_at) signatures of movies to skip
+        @param seen Optional set receiving the key of every movie, skipped or not
+        @returns Iterator over movie dicts with metadata
+        """
+        return self._iter_library(server, library_key, "movie", _build_movie_dict, known, seen)
+
+    def get_shows(self, server, library_key: str,
+                  known: Optional[Set[Tuple[str, Optional[str]]]] = None,
+                  seen: Optional[Set[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Get TV shows from a library section.
+
+        @param server PlexServer instance
+        @param library_key Library section key
+        @param known Optional (key, updated_at) signatures of shows to skip
+        @param seen Optional set receiving the key of every show, skipped or not
+        @returns Iterator over show dicts with metadata
+        """
+        return self._iter_library(server, library_key, "show", _build_show_dict, known, seen)
 
     def get_show_episodes(self, server, show_key: str) -> Dict[int, List[Dict]]:
         """
         Get episodes for a show, grouped by season.
 
+        All episodes are listed with a single allLeaves request, and auto-reload is
+        disabled so that reading their attributes does not fetch each episode again.
+
         @param server PlexServer instance
         @param show_key Show's Plex key
         @returns Dict mapping season number to list of episode dicts
         """
-        show = server.fetchItem(show_key)
         episodes_by_season = {}
 
-        for episode in show.episodes():
+        for episode in server.fetchItems(f"{show_key}/allLeaves"):
+            episode._autoReload = False
             season_num = episode.seasonNumber or 0
             if season_num not in episodes_by_season:
                 episodes_by_season[season_num] = []
@@ -273,12 +635,33 @@ class PlexClient:
                 "summary": getattr(episode, 'summary', None),
                 "duration": getattr(episode, 'duration', None),
                 "updated_at": str(episode.updatedAt) if hasattr(episode, 'updatedAt') and episode.updatedAt else None,
-                "media": self._get_media_info(episode)
+                "media": _media_info(episode)
             }
             episodes_by_season[season_num].append(ep_data)
 
         return episodes_by_season
 
+    def iter_show_episodes(self, server, shows: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Any]]:
+        """
+        Fetch the episodes of several shows in parallel, yielding each show as soon as it is fetched.
+
+        Up to SHOW_EPISODE_WORKERS shows are fetched ahead of the consumer, so a slow show
+        does not stall the others. A show whose episodes could not be fetched is yielded
+        with the exception instead of the dict.
+
+        @param server PlexServer instance
+        @param shows Iterable of show dicts (as returned by get_shows)
+        @returns Iterator of (show, episodes_by_season or Exception) tuples
+        """
+        def fetch(show: Dict[str, Any]):
+            try:
+                return self.get_show_episodes(server, show["key"])
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=SHOW_EPISODE_WORKERS) as executor:
+            yield from _prefetch_unordered(executor, fetch, shows, SHOW_EPISODE_WORKERS)
+
     def get_stream_url(self, server, item_key: str) -> str:
         """
         Get transcoding stream URL for a media item (works with shared servers).
@@ -289,83 +672,27 @@ class PlexClient:
         """
         try:
             item = server.fetchItem(item_key)
-            base_url = server._baseurl
-            token = server._token
-
-            # Get the rating key (numeric ID) from the item
-            rating_key = item.ratingKey
-
-            # Build universal transcode URL (HLS) - works with shared servers
-            # This creates a transcoding session that Plex allows for shared content
-            import urllib.parse
-            params = {
-                'path': f'/library/metadata/{rating_key}',
-                'mediaIndex': '0',
-                'partIndex': '0',
-                'protocol': 'hls',
-                'fastSeek': '1',
-                'directPlay': '0',
-                'directStream': '1',
-                'subtitleSize': '100',
-                'audioBoost': '100',
-                'location': 'wan',
-                'addDebugOverlay': '0',
-                'directStreamAudio': '1',
-                'mediaBufferSize': '102400',
-                'subtitles': 'burn',
-                'Accept-Language': 'en',
-                'X-Plex-Client-Identifier': 'xtream-to-strm',
-                'X-Plex-Product': 'Xtream to STRM',
-                'X-Plex-Platform': 'Generic',
-                'X-Plex-Token': token,
-            }
-
-            query_string = urllib.parse.urlencode(params)
-            return f"{base_url}/video/:/transcode/universal/start.m3u8?{query_string}"
-
+            return self.get_stream_url_for_rating_key(server, item.ratingKey)
         except Exception as e:
             logger.error(f"Failed to get stream URL for {item_key}: {e}")
         return ""
 
-    def _parse_guid(self, item) -> Dict[str, Optional[str]]:
+    def get_stream_url_for_rating_key(self, server, rating_key) -> str:
         """
-        Extract TMDB/IMDB/TVDB IDs from Plex GUIDs.
+        Build the transcoding stream URL for a known rating key, without fetching the item.
 
-        @param item Plex media item
-        @returns Dict with tmdb, imdb, tvdb keys
-        """
-        result = {"tmdb": None, "imdb": None, "tvdb": None}
-        try:
-            guids = getattr(item, 'guids', []) or []
-            for guid in guids:
-                guid_str = str(guid.id) if hasattr(guid, 'id') else str(guid)
-                if "tmdb://" in guid_str:
-                    result["tmdb"] = guid_str.replace("tmdb://", "")
-                elif "imdb://" in guid_str:
-                    result["imdb"] = guid_str.replace("imdb://", "")
-                elif "tvdb://" in guid_str:
-                    result["tvdb"] = guid_str.replace("tvdb://", "")
-        except Exception:
-            pass
-        return result
-
-    def _get_media_info(self, item) -> Dict[str, Any]:
-        """
-        Extract media file info (container, resolution, etc.).
-
-        @param item Plex media item
-        @returns Dict with container, video_codec, audio_codec, resolution, bitrate
+        @param server PlexServer instance
+        @param rating_key Item's numeric Plex ID
+        @returns HLS streaming URL with authentication token
         """
-        if not hasattr(item, 'media') or not item.media or len(item.media) == 0:
-            return {}
-        media = item.media[0]
-        return {
-            "container": getattr(media, 'container', None),
-            "video_codec": getattr(media, 'videoCodec', None),
-            "audio_codec": getattr(media, 'audioCodec', None),
-            "resolution": getattr(media, 'videoResolution', None),
-            "bitrate": getattr(media, 'bitrate', None)
-        }
+        # Universal transcode URL (HLS) - works with shared servers
+        # This creates a transcoding session that Plex allows for shared content
+        path = quote_plus(f"/library/metadata/{rating_key}")
+        token = quote_plus(server._token)
+        return (
+            f"{server._baseurl}/video/:/transcode/universal/start.m3u8"
+            f"?path={path}&{_STREAM_STATIC_QS}&X-Plex-Token={token}"
+        )
 
 
 def get_plex_client_from_token(auth_token: str) -> Optional[PlexClient]:
@@ -1,16 +1,98 @@
+import asyncio
 import httpx
-from typing import List, Dict, Optional, Any
-from tenacity import retry, stop_after_attempt, wait_exponential
+import orjson
+from typing import List, Dict, Optional, Any, Union
+from urllib.parse import quote
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Attempts per API request; only connection errors and 5xx responses are retried
+REQUEST_ATTEMPTS = 3
+
+# Per-category stream list requests kept in flight per account; providers often cap
+# connections per line, so syncs default to few (SYNC_CATEGORY_CONCURRENCY setting)
+CATEGORY_FETCH_CONCURRENCY = 3
+
+# Responses larger than this are decoded in a worker thread instead of on the event loop
+OFFLOAD_DECODE_BYTES = 256_000
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return True
+
+
+def _retry_delay(attempt: int) -> float:
+    """Seconds to wait before retrying after the given (0-based) failed attempt."""
+    return min(4 * 2 ** attempt, 10)
+
+
 class XtreamClient:
-    def __init__(self, url: str, username: str, password: str):
+    def __init__(self, url: str, username: str, password: str, timeout: Union[float, httpx.Timeout] = 60.0,
+                 max_connections: int = 40, max_keepalive_connections: int = 20):
         self.base_url = url.rstrip("/")
         self.username = username
         self.password = password
         self.api_url = f"{self.base_url}/player_api.php"
+        # Stream URLs are built for every STRM file; the credential part is quoted once
+        self._credentials_path = f"{quote(username, safe='')}/{quote(password, safe='')}"
+        self._stream_url_prefixes = {
+            stream_type: f"{self.base_url}/{stream_type}/{self._credentials_path}/"
+            for stream_type in ("movie", "series", "live")
+        }
+        self.timeout = timeout
+        # Pool size of both clients; syncs match it to their parallelism so sockets are reused, not churned
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        # Persistent clients (created lazily) so requests reuse keep-alive connections
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._sclient: Optional[httpx.Client] = None
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    max_connections=self.max_connections
+                )
+            )
+        return self._aclient
+
+    def _get_sync_client(self) -> httpx.Client:
+        if self._sclient is None:
+            self._sclient = httpx.Client(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    max_connections=self.max_connections
+                )
+            )
+        return self._sclient
+
+    async def aclose(self):
+        """Close the persistent HTTP clients."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+        self.close()
+
+    def close(self):
+        """Close the persistent sync HTTP client."""
+        if self._sclient is not None:
+            self._sclient.close()
+            self._sclient = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
 
     def _get_params(self, action: str, **kwargs) -> Dict[str, str]:
         params = {
@@ -21,32 +103,42 @@ class XtreamClient:
         params.update(kwargs)
         return params
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    async def _decode(self, content) -> Any:
+        if len(content) > OFFLOAD_DECODE_BYTES:
+            # Large catalogs take long enough to decode to stall other requests
+            return await asyncio.to_thread(orjson.loads, content)
+        return orjson.loads(content)
+
     async def _request(self, action: str, **kwargs) -> Any:
-        async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
-            params = self._get_params(action, **kwargs)
+        client = self._get_async_client()
+        params = self._get_params(action, **kwargs)
+        for attempt in range(REQUEST_ATTEMPTS):
             try:
                 response = await client.get(self.api_url, params=params)
                 response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error for {action}: {e}")
-                raise
+                return await self._decode(response.content)
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if attempt == REQUEST_ATTEMPTS - 1 or not _is_retryable(e):
+                    logger.error(f"HTTP error for {action}: {e}")
+                    raise
+                await asyncio.sleep(_retry_delay(attempt))
             except Exception as e:
                 logger.error(f"Error fetching {action}: {e}")
                 raise
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def _request_sync(self, action: str, **kwargs) -> Any:
-        with httpx.Client(timeout=60.0, follow_redirects=True) as client:
-            params = self._get_params(action, **kwargs)
+        client = self._get_sync_client()
+        params = self._get_params(action, **kwargs)
+        for attempt in range(REQUEST_ATTEMPTS):
             try:
                 response = client.get(self.api_url, params=params)
                 response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error for {action}: {e}")
-                raise
+                return orjson.loads(response.content)
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if attempt == REQUEST_ATTEMPTS - 1 or not _is_retryable(e):
+                    logger.error(f"HTTP error for {action}: {e}")
+                    raise
+                time.sleep(_retry_delay(attempt))
             except Exception as e:
                 logger.error(f"Error fetching {action}: {e}")
                 raise
@@ -117,6 +209,65 @@ class XtreamClient:
             kwargs["category_id"] = category_id
         return self._request_sync("get_live_streams", **kwargs)
 
+    async def get_series_info_many(self, series_ids: List[str], concurrency: int = 10) -> List[Dict]:
+        """
+        Fetch info for several series concurrently, at most `concurrency` at a time.
+
+        @returns List of series info dicts in the same order as series_ids;
+                 a failed fetch is returned as its exception instead of raising
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(series_id: str) -> Dict:
+            async with semaphore:
+                return await self.get_series_info(series_id)
+
+        return await asyncio.gather(*[fetch(i) for i in series_ids], return_exceptions=True)
+
+    async def _request_by_category(self, action: str, category_ids: List[str], id_field: str,
+                                   concurrency: int = CATEGORY_FETCH_CONCURRENCY) -> List[Dict]:
+        """
+        Fetch a stream list per category concurrently and merge the results.
+
+        Many small responses arrive in parallel instead of one full-catalog response.
+        Items listed under several categories are kept once.
+
+        @returns Merged list of stream dicts, in category order
+        @raises ValueError if a category answers with something other than a list
+                (error object, throttling notice); skipping it would make its
+                items look deleted to the sync
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(category_id: str) -> Any:
+            async with semaphore:
+                return await self._request(action, category_id=category_id)
+
+        pages = await asyncio.gather(*[fetch(c) for c in category_ids])
+        seen = set()
+        merged = []
+        for category_id, page in zip(category_ids, pages):
+            if not isinstance(page, list):
+                raise ValueError(f"Unexpected {action} response for category {category_id}: {str(page)[:200]}")
+            for item in page:
+                item_id = item.get(id_field)
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                merged.append(item)
+        return merged
+
+    async def get_vod_streams_for_categories(self, category_ids: List[str],
+                                             concurrency: int = CATEGORY_FETCH_CONCURRENCY) -> List[Dict]:
+        return await self._request_by_category("get_vod_streams", category_ids, "stream_id", concurrency)
+
+    async def get_series_for_categories(self, category_ids: List[str],
+                                        concurrency: int = CATEGORY_FETCH_CONCURRENCY) -> List[Dict]:
+        return await self._request_by_category("get_series", category_ids, "series_id", concurrency)
+
     def get_stream_url(self, stream_type: str, stream_id: str, extension: str) -> str:
         # stream_type: "movie" or "series"
-        return f"{self.base_url}/{stream_type}/{self.username}/{self.password}/{stream_id}.{extension}"
+        prefix = self._stream_url_prefixes.get(stream_type)
+        if prefix is None:
+            prefix = f"{self.base_url}/{stream_type}/{self._credentials_path}/"
+        return f"{prefix}{stream_id}.{extension}"
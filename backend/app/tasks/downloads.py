@@ -1,16 +1,24 @@
 import os
+import re
+import queue
+import threading
 import httpx
 import logging
 import time
 import asyncio
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.celery_app import celery_app
+from app.core.redis import get_redis
 from app.db.session import SessionLocal
 from app.models.downloads import (
     DownloadTask, DownloadStatus, DownloadSettings, 
@@ -18,15 +26,46 @@ from app.models.downloads import (
 )
 from app.models.subscription import Subscription
 from app.models.cache import MovieCache, SeriesCache, EpisodeCache
-from app.models.settings import SettingsModel
+from app.core.settings_cache import get_settings_cached
 from app.services.xtream import XtreamClient
 from app.services.file_manager import FileManager
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Constants
-CHUNK_SIZE = 64 * 1024  # 64KB for better throttling control
+CHUNK_SIZE = 1024 * 1024  # 1MB reads/writes; throttled downloads use smaller chunks
+DOWNLOAD_READ_TIMEOUT = 60.0  # Seconds a stream may send nothing before the download gives up (and sees a pause/cancel)
+MIN_THROTTLED_CHUNK_SIZE = 16 * 1024
 DB_REFRESH_INTERVAL = 5.0  # Refresh DB once every 5 seconds during download
+CONTROLLED_DB_REFRESH_INTERVAL = 30.0  # Fallback poll when pause/cancel arrive over Redis
+CONTROL_CHANNEL = "downloads:control:{}"
+WRITE_QUEUE_DEPTH = 4  # Chunks buffered between the network reader and the disk writer
+CLEANUP_BATCH_SIZE = 10000  # Rows per DELETE when pruning old tasks
+DISCOVERY_TIMEOUT = httpx.Timeout(60.0, connect=5.0)  # Auto-download lookups give up fast on a dead upstream
+CATEGORY_MAP_TTL = 600  # Seconds a subscription's category names are reused across downloads
+
+# (subscription_id, "movie"/"series") -> (fetched_at, {category_id: category_name})
+_category_maps: Dict[Tuple[int, str], Tuple[float, Dict[str, str]]] = {}
+
+# (url, username, password) -> client; keyed on credentials so edited subscriptions get a fresh one
+_xtream_clients: Dict[Tuple[str, str, str], XtreamClient] = {}
+
+# Episode titles like "Show - S01E02 - Title" when the episode cache is missing
+_SERIES_RE = re.compile(r'^(.*?)(?:\s+-\s*|\s+)S(\d+)E(\d+)(?:\s*[- ]+\s*(.*))?$', re.IGNORECASE)
+_SERIES_RE_FALLBACK = re.compile(r'S(\d+)E(\d+)\s+(.*)$', re.IGNORECASE)
+
+# (connect timeout, max redirects) -> shared download client
+_http_clients: Dict[Tuple[float, int], httpx.Client] = {}
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
 
 # --- Helper Functions ---
 
@@ -41,6 +80,25 @@ def get_global_settings(db: Session):
 
 def update_daily_stats(db: Session, success=True, bytes_downloaded=0.0):
     today = datetime.now().strftime("%Y-%m-%d")
+    dialect = db.get_bind().dialect.name
+    if dialect in _UPSERT_INSERTS:
+        # Single race-free round-trip: insert today's row or bump its counters
+        completed, failed = (1, 0) if success else (0, 1)
+        added_bytes = bytes_downloaded if success else 0.0
+        stmt = _UPSERT_INSERTS[dialect](DownloadStatistics).values(
+            date=today, total_downloads=1, completed_downloads=completed,
+            failed_downloads=failed, total_bytes_downloaded=added_bytes
+        )
+        stmt = stmt.on_conflict_do_update(index_elements=[DownloadStatistics.date], set_={
+            "total_downloads": func.coalesce(DownloadStatistics.total_downloads, 0) + 1,
+            "completed_downloads": func.coalesce(DownloadStatistics.completed_downloads, 0) + completed,
+            "failed_downloads": func.coalesce(DownloadStatistics.failed_downloads, 0) + failed,
+            "total_bytes_downloaded": func.coalesce(DownloadStatistics.total_bytes_downloaded, 0) + added_bytes,
+        })
+        db.execute(stmt)
+        db.commit()
+        return
+
     stats = db.query(DownloadStatistics).filter(DownloadStatistics.date == today).first()
     if not stats:
         stats = DownloadStatistics(date=today)
@@ -78,19 +136,40 @@ def cleanup_old_tasks(db: Session, settings: DownloadSettingsGlobal):
     
     # Completed tasks
     completed_limit = datetime.now() - timedelta(days=settings.keep_completed_days or 7)
-    db.query(DownloadTask).filter(
-        DownloadTask.status == DownloadStatus.COMPLETED,
-        DownloadTask.completed_at < completed_limit
-    ).delete()
+    _delete_in_batches(db, DownloadTask.status == DownloadStatus.COMPLETED, DownloadTask.completed_at < completed_limit)
     
     # Failed tasks
     failed_limit = datetime.now() - timedelta(days=settings.keep_failed_days or 7)
-    db.query(DownloadTask).filter(
-        DownloadTask.status == DownloadStatus.FAILED,
-        DownloadTask.created_at < failed_limit
-    ).delete()
-    
-    db.commit()
+    _delete_in_batches(db, DownloadTask.status == DownloadStatus.FAILED, DownloadTask.created_at < failed_limit)
+
+def _delete_in_batches(db: Session, *criteria):
+    """Delete matching download tasks CLEANUP_BATCH_SIZE rows per statement, committing between batches."""
+    while True:
+        ids = db.query(DownloadTask.id).filter(*criteria).limit(CLEANUP_BATCH_SIZE).subquery()
+        deleted = db.query(DownloadTask).filter(DownloadTask.id.in_(select(ids.c.id))).delete(synchronize_session=False)
+        db.commit()
+        if deleted < CLEANUP_BATCH_SIZE:
+            break
+
+def _get_xtream_client(subscription: Subscription) -> XtreamClient:
+    """Reuse one XtreamClient (and its connection pool) per subscription across downloads."""
+    key = (subscription.xtream_url, subscription.username, subscription.password)
+    xc = _xtream_clients.get(key)
+    if xc is None:
+        xc = _xtream_clients[key] = XtreamClient(*key)
+    return xc
+
+def _get_category_map(xc: XtreamClient, subscription_id: int, kind: str) -> Dict[str, str]:
+    """Category id -> name for a subscription, fetched once per CATEGORY_MAP_TTL."""
+    key = (subscription_id, kind)
+    entry = _category_maps.get(key)
+    if entry and time.monotonic() - entry[0] < CATEGORY_MAP_TTL:
+        return entry[1]
+
+    categories = xc.get_vod_categories_sync() if kind == "movie" else xc.get_series_categories_sync()
+    cat_map = {str(c['category_id']): c['category_name'] for c in categories}
+    _category_maps[key] = (time.monotonic(), cat_map)
+    return cat_map
 
 def _resolve_target_path(db: Session, download: DownloadTask, subscription: Subscription, app_settings: Dict[str, Any]) -> Path:
     """Determine final save path and create directories."""
@@ -108,7 +187,7 @@ def _resolve_target_path(db: Session, download: DownloadTask, subscription: Subs
         
     fm = FileManager(base_dir)
     cat_name = "Uncategorized"
-    xc = XtreamClient(subscription.xtream_url, subscription.username, subscription.password)
+    xc = _get_xtream_client(subscription)
 
     if download.media_type == "movie":
         movie_cache = db.query(MovieCache).filter(
@@ -137,8 +216,7 @@ def _resolve_target_path(db: Session, download: DownloadTask, subscription: Subs
 
         if category_id:
             try:
-                categories = xc.get_vod_categories_sync()
-                cat_map = {str(c['category_id']): c['category_name'] for c in categories}
+                cat_map = _get_category_map(xc, subscription.id, "movie")
                 cat_name = cat_map.get(str(category_id), "Uncategorized")
             except Exception as e: 
                 logger.warning(f"Failed to fetch VOD categories: {e}")
@@ -154,12 +232,16 @@ def _resolve_target_path(db: Session, download: DownloadTask, subscription: Subs
         return save_dir / f"{target_info['filename_base']}.mp4"
 
     else: # episode
-        episode_cache = db.query(EpisodeCache).filter(
+        # Episode and its series in one round-trip (series row may be missing)
+        row = db.query(EpisodeCache, SeriesCache).outerjoin(SeriesCache, and_(
+            SeriesCache.subscription_id == EpisodeCache.subscription_id,
+            SeriesCache.series_id == EpisodeCache.series_id
+        )).filter(
             EpisodeCache.subscription_id == download.subscription_id,
             EpisodeCache.id == int(download.media_id)
         ).first()
+        episode_cache, series_cache = row if row else (None, None)
         
-        series_cache = None
         series_id = None
         season_num = 1
         ep_num = 1
@@ -170,21 +252,14 @@ def _resolve_target_path(db: Session, download: DownloadTask, subscription: Subs
             season_num = episode_cache.season_num
             ep_num = episode_cache.episode_num
             ep_title = episode_cache.title
-            
-            series_cache = db.query(SeriesCache).filter(
-                SeriesCache.subscription_id == download.subscription_id,
-                SeriesCache.series_id == series_id
-            ).first()
         else:
             # If no episode cache, try to parse from title
             logger.info(f"DEBUG_PATH: Episode cache missing for ID {download.media_id}. Title: '{download.title}'")
-            import re
-            
             # Robust regex for series titles
-            m = re.search(r'^(.*?)(?:\s+-\s*|\s+)S(\d+)E(\d+)(?:\s*[- ]+\s*(.*))?$', download.title, re.IGNORECASE)
+            m = _SERIES_RE.search(download.title)
             if not m:
                 logger.info("DEBUG_PATH: Main regex failed. Trying fallback.")
-                m = re.search(r'S(\d+)E(\d+)\s+(.*)$', download.title, re.IGNORECASE)
+                m = _SERIES_RE_FALLBACK.search(download.title)
                 if m:
                     season_num = int(m.group(1))
                     ep_num = int(m.group(2))
@@ -252,8 +327,7 @@ def _resolve_target_path(db: Session, download: DownloadTask, subscription: Subs
 
         if category_id:
             try:
-                categories = xc.get_series_categories_sync()
-                cat_map = {str(c['category_id']): c['category_name'] for c in categories}
+                cat_map = _get_category_map(xc, subscription.id, "series")
                 cat_name = cat_map.get(str(category_id), "Uncategorized")
             except Exception as e:
                 logger.warning(f"Failed to fetch series categories: {e}")
@@ -289,6 +363,88 @@ def _resolve_target_path(db: Session, download: DownloadTask, subscription: Subs
         filename = f"{filename_base} - {safe_ep_title}.mp4" if safe_ep_title else f"{filename_base}.mp4"
         return current_dir / filename
 
+def get_http_client(timeout: float, max_redirects: int) -> httpx.Client:
+    """Process-wide download client, so retries and later downloads reuse open
+    connections (and TLS sessions) to the same host."""
+    key = (timeout, max_redirects)
+    client = _http_clients.get(key)
+    if client is None:
+        client = _http_clients[key] = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=HTTP2_AVAILABLE, retries=0,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=10)
+            ),
+            follow_redirects=True,
+            max_redirects=max_redirects,
+            timeout=httpx.Timeout(timeout, read=DOWNLOAD_READ_TIMEOUT)
+        )
+    return client
+
+def publish_download_control(download_ids: List[int], action: str):
+    """Tell running downloads to re-check their status now (pause/cancel)."""
+    try:
+        r = get_redis()
+        for download_id in download_ids:
+            r.publish(CONTROL_CHANNEL.format(download_id), action)
+    except Exception as e:
+        logger.warning(f"Failed to publish download control '{action}': {e}")
+
+@contextmanager
+def _control_channel(download_id: int):
+    """Subscribe to a download's control channel; yields None if Redis is unavailable."""
+    try:
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(CONTROL_CHANNEL.format(download_id))
+    except Exception as e:
+        logger.warning(f"Download {download_id}: control channel unavailable, polling DB: {e}")
+        yield None
+        return
+    try:
+        yield pubsub
+    finally:
+        try:
+            pubsub.close()
+        except Exception:
+            pass
+
+class _ChunkWriter:
+    """Writes download chunks on a background thread so the next network read
+    overlaps the current disk write. Leaving the context drains the queue and
+    re-raises any write error."""
+
+    def __init__(self, f):
+        self._f = f
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=WRITE_QUEUE_DEPTH)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            if self._error is None:
+                try:
+                    self._f.write(chunk)
+                except BaseException as e:
+                    self._error = e
+
+    def write(self, chunk: bytes):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(chunk)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._queue.put(None)
+        self._thread.join()
+        if exc_type is None and self._error is not None:
+            raise self._error
+        return False
+
 def _perform_download_stream(db: Session, download: DownloadTask, save_path: Path, settings: DownloadSettingsGlobal):
     """Core download logic with retry support, throttling, and optimized DB refresh."""
     existing_size = save_path.stat().st_size if save_path.exists() else 0
@@ -296,12 +452,10 @@ def _perform_download_stream(db: Session, download: DownloadTask, save_path: Pat
     db.commit()
 
     # Client configuration
-    client_timeout = settings.connection_timeout_seconds or 30
-    max_redirects = settings.max_redirects or 10
-    limits = httpx.Limits(max_connections=10, max_keepalive_connections=5)
+    client = get_http_client(settings.connection_timeout_seconds or 30, settings.max_redirects or 10)
     
-    with httpx.Client(limits=limits, follow_redirects=True, max_redirects=max_redirects, 
-                      timeout=httpx.Timeout(client_timeout, read=None)) as client:
+    with _control_channel(download.id) as control:
+        refresh_interval = CONTROLLED_DB_REFRESH_INTERVAL if control else DB_REFRESH_INTERVAL
         
         while True:
             headers = {'Range': f'bytes={existing_size}-'} if existing_size > 0 else {}
@@ -331,46 +485,77 @@ def _perform_download_stream(db: Session, download: DownloadTask, save_path: Pat
                     db.commit()
 
                     # Download loop
-                    start_time = time.time()
-                    last_db_refresh = time.time()
+                    start_time = time.monotonic()
+                    last_db_refresh = start_time
                     bytes_sampled = 0
-                    sample_start = time.time()
+                    sample_start = start_time
                     speed_limit = download.speed_limit_kbps or settings.global_speed_limit_kbps
-
-                    with open(save_path, mode) as f:
-                        for chunk in response.iter_bytes(chunk_size=CHUNK_SIZE):
-                            # Optimized DB Refresh (Check pause/cancel every 5s)
-                            now = time.time()
-                            if now - last_db_refresh >= DB_REFRESH_INTERVAL:
-                                db.refresh(download)
-                                if download.status in [DownloadStatus.PAUSED, DownloadStatus.CANCELLED]:
-                                    logger.info(f"Download {download.id} {download.status}")
-                                    return False # Interrupted
-                                last_db_refresh = now
-                            
-                            f.write(chunk)
-                            download.downloaded_bytes += len(chunk)
-                            bytes_sampled += len(chunk)
-
-                            # Throttling
-                            if speed_limit > 0:
-                                expected = (download.downloaded_bytes - existing_size) / (speed_limit * 1024)
-                                elapsed = time.time() - start_time
-                                if elapsed < expected:
-                                    time.sleep(expected - elapsed)
-
-                            # Statistics Update (Non-blocking)
-                            sample_elapsed = now - sample_start
-                            if sample_elapsed >= 1.0:
-                                download.current_speed_kbps = (bytes_sampled / 1024) / sample_elapsed
-                                if download.file_size:
-                                    download.progress = min((download.downloaded_bytes / download.file_size) * 100, 99.9)
-                                    if download.current_speed_kbps > 0:
-                                        rem = (download.file_size - download.downloaded_bytes) / 1024
-                                        download.estimated_time_remaining = int(rem / download.current_speed_kbps)
-                                bytes_sampled = 0
-                                sample_start = now
-                                db.commit()
+                    # Keep ~4 chunks per second when throttled so the sleeps stay smooth
+                    chunk_size = CHUNK_SIZE
+                    if speed_limit > 0:
+                        chunk_size = max(min(CHUNK_SIZE, speed_limit * 1024 // 4), MIN_THROTTLED_CHUNK_SIZE)
+                    # Token bucket for the speed limit; bursts are capped at two chunks
+                    rate = speed_limit * 1024
+                    bucket_size = 2 * chunk_size
+                    tokens = bucket_size
+                    last_refill = start_time
+
+                    # Progress lives in locals and is copied onto the ORM row once per sample
+                    downloaded = existing_size
+                    try:
+                        with open(save_path, mode, buffering=CHUNK_SIZE) as f, _ChunkWriter(f) as writer:
+                            for chunk in response.iter_bytes(chunk_size=chunk_size):
+                                # One clock read per chunk, shared by refresh, throttling and stats
+                                now = time.monotonic()
+
+                                # Pause/cancel: re-read the row as soon as a control message
+                                # arrives, and poll the DB as a slow fallback
+                                signalled = False
+                                if control:
+                                    try:
+                                        signalled = control.get_message(timeout=0) is not None
+                                    except Exception as e:
+                                        logger.warning(f"Download {download.id}: control channel lost, polling DB: {e}")
+                                        control = None
+                                        refresh_interval = DB_REFRESH_INTERVAL
+                                if signalled or now - last_db_refresh >= refresh_interval:
+                                    db.refresh(download)
+                                    if download.status in [DownloadStatus.PAUSED, DownloadStatus.CANCELLED]:
+                                        logger.info(f"Download {download.id} {download.status}")
+                                        return False # Interrupted
+                                    last_db_refresh = now
+
+                                writer.write(chunk)
+                                downloaded += len(chunk)
+                                bytes_sampled += len(chunk)
+
+                                # Throttling
+                                if speed_limit > 0:
+                                    tokens = min(bucket_size, tokens + (now - last_refill) * rate) - len(chunk)
+                                    last_refill = now
+                                    if tokens < 0:
+                                        # Sleep until the deficit has refilled
+                                        wait = -tokens / rate
+                                        time.sleep(wait)
+                                        tokens = 0
+                                        last_refill = now + wait
+
+                                # Statistics Update (Non-blocking)
+                                sample_elapsed = now - sample_start
+                                if sample_elapsed >= 1.0:
+                                    speed_kbps = (bytes_sampled / 1024) / sample_elapsed
+                                    download.downloaded_bytes = downloaded
+                                    download.current_speed_kbps = speed_kbps
+                                    if download.file_size:
+                                        download.progress = min((downloaded / download.file_size) * 100, 99.9)
+                                        if speed_kbps > 0:
+                                            rem = (download.file_size - downloaded) / 1024
+                                            download.estimated_time_remaining = int(rem / speed_kbps)
+                                    bytes_sampled = 0
+                                    sample_start = now
+                                    db.commit()
+                    finally:
+                        download.downloaded_bytes = downloaded
 
                     return True # Success
 
@@ -391,28 +576,53 @@ def _perform_download_stream(db: Session, download: DownloadTask, save_path: Pat
                     continue
                 raise e
             except (httpx.NetworkError, httpx.TimeoutException) as e:
+                # A stalled stream paused or cancelled meanwhile is interrupted, not retried
+                db.refresh(download)
+                if download.status in [DownloadStatus.PAUSED, DownloadStatus.CANCELLED]:
+                    logger.info(f"Download {download.id} {download.status}")
+                    return False
                 logger.error(f"Network error for {download.id}: {e}")
                 raise e
 
 def _process_auto_downloads_sync(db: Session):
     """Synchronous logic for auto-downloads"""
     monitored_items = db.query(MonitoredMedia).filter(MonitoredMedia.is_active == True).all()
+
+    # Naming rules for title cleaning
+    settings_dict = get_settings_cached(db)
+    prefix_regex = settings_dict.get("PREFIX_REGEX")
+    format_date = settings_dict.get("FORMAT_DATE_IN_TITLE") == "true"
+    clean_name = settings_dict.get("CLEAN_NAME") == "true"
+    clean_title = FileManager("").get_title_cleaner(prefix_regex, format_date, clean_name)
+
+    # Subscriptions, clients and known media ids are shared by all items of a subscription
+    subscription_ids = {item.subscription_id for item in monitored_items}
+    subscriptions = {
+        s.id: s for s in db.query(Subscription).filter(Subscription.id.in_(subscription_ids)).all()
+    } if subscription_ids else {}
+    clients: Dict[int, XtreamClient] = {}
+    existing_by_subscription: Dict[int, set] = {sub_id: set() for sub_id in subscriptions}
+    if subscriptions:
+        for sub_id, media_id in db.query(DownloadTask.subscription_id, DownloadTask.media_id).filter(
+            DownloadTask.subscription_id.in_(subscriptions)
+        ):
+            existing_by_subscription[sub_id].add(str(media_id))
+    # Subscriptions whose upstream failed at the network level this run; their other items are skipped
+    unreachable: set = set()
+
     for item in monitored_items:
-        subscription = db.query(Subscription).filter(Subscription.id == item.subscription_id).first()
-        if not subscription: continue
-        
-        xc = XtreamClient(subscription.xtream_url, subscription.username, subscription.password)
-        existing_ids = {t.media_id for t in db.query(DownloadTask.media_id)
-                       .filter(DownloadTask.subscription_id == item.subscription_id).all()}
-        
-        # Get naming rules for title cleaning
-        settings_dict = {s.key: s.value for s in db.query(SettingsModel).all()}
-        prefix_regex = settings_dict.get("PREFIX_REGEX")
-        format_date = settings_dict.get("FORMAT_DATE_IN_TITLE") == "true"
-        clean_name = settings_dict.get("CLEAN_NAME") == "true"
-        fm = FileManager("")
-
-        new_tasks = 0
+        subscription = subscriptions.get(item.subscription_id)
+        if not subscription or subscription.id in unreachable: continue
+
+        xc = clients.get(subscription.id)
+        if xc is None:
+            xc = clients[subscription.id] = XtreamClient(
+                subscription.xtream_url, subscription.username, subscription.password, timeout=DISCOVERY_TIMEOUT
+            )
+        existing_ids = existing_by_subscription[subscription.id]
+
+        # Plain rows inserted in one executemany after the item is processed
+        new_rows = []
         if item.media_type == "category_movie":
             try:
                 movies = xc.get_vod_streams_sync(category_id=item.media_id)
@@ -420,22 +630,25 @@ def _process_auto_downloads_sync(db: Session):
                     sid = str(movie['stream_id'])
                     if sid not in existing_ids:
                         raw_title = movie.get('name', f'Movie_{sid}')
-                        title = fm.clean_title(raw_title, prefix_regex, format_date, clean_name)
-                        db.add(DownloadTask(
+                        title = clean_title(raw_title)
+                        new_rows.append(dict(
                             subscription_id=item.subscription_id, media_type="movie", media_id=sid,
                             title=title,
                             url=xc.get_stream_url("movie", sid, movie.get('container_extension', 'mp4')),
                             status=DownloadStatus.PENDING
                         ))
-                        new_tasks += 1
                         existing_ids.add(sid)
-            except: pass
+            except httpx.TransportError as e:
+                unreachable.add(subscription.id)
+                logger.warning(f"Auto-download: subscription {subscription.id} unreachable, skipping its items: {e}")
+            except Exception as e:
+                logger.warning(f"Auto-download: failed to check {item.title}: {e}")
         
         elif item.media_type == "series":
             try:
                 series_info = xc.get_series_info_sync(series_id=item.media_id)
                 episodes = series_info.get('episodes', {})
-                series_name = fm.clean_title(item.title, prefix_regex, format_date, clean_name)
+                series_name = clean_title(item.title)
                 
                 for season, eps in episodes.items():
                     for ep in eps:
@@ -450,15 +663,18 @@ def _process_auto_downloads_sync(db: Session):
                                 ep_title = f" - {ep_title}"
                             
                             title = f"{series_name} - {ep_info}{ep_title}"
-                            db.add(DownloadTask(
+                            new_rows.append(dict(
                                 subscription_id=item.subscription_id, media_type="episode", media_id=sid,
                                 title=title,
                                 url=xc.get_stream_url("series", sid, ep.get('container_extension', 'mp4')),
                                 status=DownloadStatus.PENDING
                             ))
-                            new_tasks += 1
                             existing_ids.add(sid)
-            except: pass
+            except httpx.TransportError as e:
+                unreachable.add(subscription.id)
+                logger.warning(f"Auto-download: subscription {subscription.id} unreachable, skipping its items: {e}")
+            except Exception as e:
+                logger.warning(f"Auto-download: failed to check {item.title}: {e}")
 
         elif item.media_type == "category_series":
             try:
@@ -466,7 +682,7 @@ def _process_auto_downloads_sync(db: Session):
                 for s in series_list:
                     series_id = str(s['series_id'])
                     s_name_raw = s.get('name', s.get('title', f"Series_{series_id}"))
-                    series_name = fm.clean_title(s_name_raw, prefix_regex, format_date, clean_name)
+                    series_name = clean_title(s_name_raw)
                     
                     try:
                         series_info = xc.get_series_info_sync(series_id=series_id)
@@ -484,31 +700,42 @@ def _process_auto_downloads_sync(db: Session):
                                         ep_title = f" - {ep_title}"
                                     
                                     title = f"{series_name} - {ep_info}{ep_title}"
-                                    db.add(DownloadTask(
+                                    new_rows.append(dict(
                                         subscription_id=item.subscription_id, media_type="episode", media_id=ep_sid,
                                         title=title,
                                         url=xc.get_stream_url("series", ep_sid, ep.get('container_extension', 'mp4')),
                                         status=DownloadStatus.PENDING
                                     ))
-                                    new_tasks += 1
                                     existing_ids.add(ep_sid)
-                    except:
+                    except httpx.TransportError:
+                        raise
+                    except Exception as e:
+                        logger.warning(f"Auto-download: failed to read series {series_id}: {e}")
                         continue
-            except: pass
+            except httpx.TransportError as e:
+                unreachable.add(subscription.id)
+                logger.warning(f"Auto-download: subscription {subscription.id} unreachable, skipping its items: {e}")
+            except Exception as e:
+                logger.warning(f"Auto-download: failed to check {item.title}: {e}")
         
+        if new_rows:
+            db.execute(DownloadTask.__table__.insert(), new_rows)
+
         item.last_check = datetime.now()
         db.commit()
-        if new_tasks > 0:
-            logger.info(f"Auto-download: Queued {new_tasks} items for {item.title}")
+        if new_rows:
+            logger.info(f"Auto-download: Queued {len(new_rows)} items for {item.title}")
+
+    for xc in clients.values():
+        xc.close()
 
     if db.query(DownloadTask).filter(DownloadTask.status == DownloadStatus.PENDING).count() > 0:
         process_download_queue.delay()
 
 # --- Celery Tasks ---
 
-@celery_app.task(bind=True)
-def download_media_task(self, download_id: int):
-    """Modularized download task."""
+def _run_download(download_id: int, task_id: Optional[str]):
+    """Download a single task end to end in its own session (retries re-queue it)."""
     db = SessionLocal()
     try:
         download = db.query(DownloadTask).filter(DownloadTask.id == download_id).first()
@@ -520,7 +747,7 @@ def download_media_task(self, download_id: int):
         if not subscription: return
 
         # App settings for naming
-        settings_dict = {s.key: s.value for s in db.query(SettingsModel).all()}
+        settings_dict = get_settings_cached(db)
         
         # 1. Resolve Path
         save_path = _resolve_target_path(db, download, subscription, settings_dict)
@@ -528,7 +755,7 @@ def download_media_task(self, download_id: int):
         # 2. Start Download
         download.status = DownloadStatus.DOWNLOADING
         download.started_at = datetime.now()
-        download.task_id = self.request.id
+        download.task_id = task_id
         db.commit()
 
         success = _perform_download_stream(db, download, save_path, settings)
@@ -545,7 +772,7 @@ def download_media_task(self, download_id: int):
     except Exception as e:
         logger.error(f"Task {download_id} failed: {e}")
         try:
-            db.refresh(download)
+            # The row is already loaded in this session; no need to re-read it
             download.retry_count = (download.retry_count or 0) + 1
             max_r = settings.default_max_retries or 3
             
@@ -566,6 +793,56 @@ def download_media_task(self, download_id: int):
     finally:
         db.close()
 
+@celery_app.task(bind=True)
+def download_media_task(self, download_id: int):
+    """Modularized download task."""
+    _run_download(download_id, self.request.id)
+
+@celery_app.task(bind=True)
+def download_batch_task(self, download_ids: List[int]):
+    """Run several downloads concurrently inside one worker process.
+
+    Downloads are network-bound and release the GIL while waiting on sockets,
+    so one task can keep a subscription's parallel slots busy without holding
+    a Celery worker process per file.
+    """
+    if len(download_ids) == 1:
+        _run_download(download_ids[0], self.request.id)
+        return
+    # Record the shared task id on every row before any starts, so cancelling
+    # one of them never revokes the task its siblings run in
+    db = SessionLocal()
+    try:
+        db.query(DownloadTask).filter(DownloadTask.id.in_(download_ids)).update(
+            {"task_id": self.request.id}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    with ThreadPoolExecutor(max_workers=len(download_ids)) as pool:
+        list(pool.map(lambda download_id: _run_download(download_id, self.request.id), download_ids))
+
+def _claim_downloads(db: Session, download_ids: List[int], now: datetime) -> set:
+    """Atomically flip PENDING downloads to DOWNLOADING and return the ids this caller won.
+
+    The status check in the UPDATE means a row already taken by a concurrent
+    queue processor is left alone; RETURNING reports which rows we actually
+    claimed where the database supports it.
+    """
+    def claim(ids):
+        return update(DownloadTask).where(
+            DownloadTask.id.in_(ids),
+            DownloadTask.status == DownloadStatus.PENDING
+        ).values(status=DownloadStatus.DOWNLOADING, started_at=now).execution_options(synchronize_session=False)
+
+    if db.get_bind().dialect.update_returning:
+        claimed = set(db.execute(claim(download_ids).returning(DownloadTask.id)).scalars())
+    else:
+        # Without RETURNING only per-row rowcounts tell us which claims succeeded
+        claimed = {download_id for download_id in download_ids if db.execute(claim([download_id])).rowcount}
+    db.commit()
+    return claimed
+
 @celery_app.task
 def process_download_queue():
     """Background task that processes the download queue."""
@@ -573,56 +850,64 @@ def process_download_queue():
     try:
         settings = get_global_settings(db)
         
+        now = datetime.now()
+
         if settings.download_mode == "sequential":
             total_active = db.query(DownloadTask).filter(DownloadTask.status == DownloadStatus.DOWNLOADING).count()
             if total_active >= 1: return
             
-            subscriptions = db.query(Subscription).filter(Subscription.is_active == True).all()
-            all_pending = []
-            for sub in subscriptions:
-                pending = db.query(DownloadTask).filter(
-                    DownloadTask.subscription_id == sub.id,
-                    DownloadTask.status == DownloadStatus.PENDING
-                ).all()
-                all_pending.extend(pending)
+            download = db.query(DownloadTask).join(
+                Subscription, Subscription.id == DownloadTask.subscription_id
+            ).filter(
+                Subscription.is_active == True,
+                DownloadTask.status == DownloadStatus.PENDING
+            ).order_by(DownloadTask.priority.desc(), DownloadTask.created_at.desc()).first()
             
-            if all_pending:
-                all_pending.sort(key=lambda x: (x.priority or 0, x.created_at), reverse=True)
-                download = all_pending[0]
-                if not download.scheduled_start_at or download.scheduled_start_at <= datetime.now():
-                    # Mark as downloading immediately to reserve the slot
-                    download.status = DownloadStatus.DOWNLOADING
-                    download.started_at = datetime.now()
-                    db.commit()
-                    
+            if download and (not download.scheduled_start_at or download.scheduled_start_at <= now):
+                # Mark as downloading immediately to reserve the slot
+                if _claim_downloads(db, [download.id], now):
                     download_media_task.delay(download.id)
             return
 
-        subscriptions = db.query(Subscription).filter(Subscription.is_active == True).all()
-        for sub in subscriptions:
-            active_count = db.query(DownloadTask).filter(
-                DownloadTask.subscription_id == sub.id,
-                DownloadTask.status == DownloadStatus.DOWNLOADING
-            ).count()
-            
-            max_parallel = sub.max_parallel_downloads or 2
-            available_slots = max_parallel - active_count
-            if available_slots > 0:
-                pending_downloads = db.query(DownloadTask).filter(
-                    DownloadTask.subscription_id == sub.id,
-                    DownloadTask.status == DownloadStatus.PENDING
-                ).order_by(DownloadTask.priority.desc(), DownloadTask.created_at.asc()).limit(available_slots).all()
-                
-                for download in pending_downloads:
-                    if download.scheduled_start_at and download.scheduled_start_at > datetime.now():
-                        continue
-                    
-                    # Mark as downloading immediately to reserve the slot
-                    download.status = DownloadStatus.DOWNLOADING
-                    download.started_at = datetime.now()
-                    db.commit() # Commit each one to be safe for other concurrent processors
-                    
-                    download_media_task.delay(download.id)
+        # Free slots per active subscription, from one grouped count
+        active_counts = dict(db.query(DownloadTask.subscription_id, func.count(DownloadTask.id)).filter(
+            DownloadTask.status == DownloadStatus.DOWNLOADING
+        ).group_by(DownloadTask.subscription_id).all())
+        slots = {}
+        for sub_id, max_parallel in db.query(Subscription.id, Subscription.max_parallel_downloads).filter(
+            Subscription.is_active == True
+        ):
+            available = (max_parallel or 2) - active_counts.get(sub_id, 0)
+            if available > 0:
+                slots[sub_id] = available
+        if not slots:
+            return
+
+        # Highest priority first, oldest first within a priority; fill each subscription's slots
+        batches: Dict[int, List[int]] = {}
+        remaining = sum(slots.values())
+        pending = db.query(DownloadTask.id, DownloadTask.subscription_id).filter(
+            DownloadTask.subscription_id.in_(slots),
+            DownloadTask.status == DownloadStatus.PENDING,
+            or_(DownloadTask.scheduled_start_at.is_(None), DownloadTask.scheduled_start_at <= now)
+        ).order_by(DownloadTask.priority.desc(), DownloadTask.created_at.asc())
+        for download_id, sub_id in pending:
+            batch = batches.setdefault(sub_id, [])
+            if len(batch) < slots[sub_id]:
+                batch.append(download_id)
+                remaining -= 1
+                if not remaining:
+                    break
+
+        claimed = [download_id for batch in batches.values() for download_id in batch]
+        if not claimed:
+            return
+
+        claimed = _claim_downloads(db, claimed, now)
+        for batch in batches.values():
+            batch = [download_id for download_id in batch if download_id in claimed]
+            if batch:
+                download_batch_task.delay(batch)
     finally:
         db.close()
 
@@ -633,10 +918,10 @@ def check_auto_downloads():
     try:
         settings = get_global_settings(db)
         # 1. Recovery
-        interrupted = db.query(DownloadTask).filter(DownloadTask.status == DownloadStatus.DOWNLOADING).all()
-        for t in interrupted:
-            t.status = DownloadStatus.PENDING
-            t.error_message = "Recovery: interrupted by restart"
+        db.query(DownloadTask).filter(DownloadTask.status == DownloadStatus.DOWNLOADING).update(
+            {DownloadTask.status: DownloadStatus.PENDING, DownloadTask.error_message: "Recovery: interrupted by restart"},
+            synchronize_session=False
+        )
         db.commit()
 
         # 2. Cleanup
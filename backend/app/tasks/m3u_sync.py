@@ -1,20 +1,24 @@
 from app.core.celery_app import celery_app
+from sqlalchemy import Column, MetaData, Table, and_, bindparam, false, or_, select
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.models.m3u_source import M3USource, SourceType
 from app.models.m3u_entry import M3UEntry, EntryType
 from app.models.m3u_selection import M3USelection, SelectionType
 from app.models.m3u_sync_state import M3USyncState
-from app.models.settings import SettingsModel
-from app.services.m3u_parser import parse_m3u_url, parse_m3u_file
+from app.core.settings_cache import get_settings_cached
+from app.services.m3u_parser import iter_m3u_url, iter_m3u_file
 from app.services.file_manager import FileManager
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Set, Optional, Tuple
+import os
+import re
 import shutil
 import hashlib
-import asyncio
 
 logger = logging.getLogger(__name__)
 
@@ -22,22 +26,84 @@ logger = logging.getLogger(__name__)
 CONTENT_TYPE_MOVIES = "movies"
 CONTENT_TYPE_SERIES = "series"
 STRM_EXTENSION = ".strm"
+HASH_CHUNK_SIZE = 1024 * 1024  # Bytes per read when fingerprinting M3U files
+ENTRY_INSERT_BATCH_SIZE = 1000  # M3U entries per INSERT statement
+FILE_WRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # Threads writing STRM/NFO files
+FILE_WRITE_BATCH_SIZE = 1000  # Entries prepared before their files are written
+_UNSAFE_NAME_CHARS = re.compile(r'[^\w \-]+')
+
+# Parsed entries are staged in a connection-local temp table (in memory, see
+# app.db.sqlite_pragmas) so the playlist download never holds the database write
+# lock; m3u_entries is only swapped once the whole playlist has been read
+_STAGED_COLUMNS = ("m3u_source_id", "title", "url", "group_title", "logo", "tvg_id", "tvg_name", "entry_type")
+_ENTRY_STAGING = Table(
+    "m3u_entries_staging", MetaData(),
+    *(Column(name, M3UEntry.__table__.c[name].type) for name in _STAGED_COLUMNS),
+    prefixes=["TEMPORARY"],
+)
 
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+@lru_cache(maxsize=65536)
 def sanitize_name(name: str) -> str:
     """Sanitize name for filesystem compatibility"""
-    return "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip()
+    # \w is exactly str.isalnum() plus '_', so this keeps the same characters as a per-char filter
+    return _UNSAFE_NAME_CHARS.sub("", name).strip()
+
+
+def _group_filter(entry_type: EntryType, groups: Set[str]):
+    """SQL condition for entries of one type in the selected groups (no group counts as "Uncategorized")"""
+    in_groups = M3UEntry.group_title.in_(groups)
+    if "Uncategorized" in groups:
+        in_groups = or_(in_groups, M3UEntry.group_title.is_(None), M3UEntry.group_title == "")
+    return and_(M3UEntry.entry_type == entry_type, in_groups)
+
+
+def _iter_selected_entries(db: Session, source_id: int, condition):
+    """Yield matching entries a page at a time, ending the read transaction after each page.
+
+    File generation can take minutes; paging by id means the pooled connection
+    (and SQLite's shared lock, which blocks other writers) is only held while a
+    page is fetched, not while its files are written.
+    """
+    last_id = 0
+    while True:
+        rows = db.query(
+            M3UEntry.id, M3UEntry.title, M3UEntry.url, M3UEntry.group_title, M3UEntry.logo,
+            M3UEntry.entry_type, M3UEntry.generated_fingerprint
+        ).filter(
+            M3UEntry.m3u_source_id == source_id, M3UEntry.id > last_id, condition
+        ).order_by(M3UEntry.id).limit(ENTRY_INSERT_BATCH_SIZE).all()
+        db.commit()  # nothing pending; releases the connection back to the pool
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1].id
+
+
+def _generation_fingerprint(strm_path: str, url: str, nfo_content: str) -> str:
+    """Short digest of what an entry's STRM/NFO pair would contain, to skip rewriting unchanged files"""
+    h = hashlib.blake2b(digest_size=8)
+    for part in (strm_path, url, nfo_content):
+        h.update(part.encode())
+        h.update(b'\0')
+    return h.hexdigest()
 
 
 def calculate_file_hash(file_path: str) -> Optional[str]:
-    """Calculate MD5 hash of file for change detection"""
+    """Calculate a SHA-256 fingerprint of the file for change detection, streamed in HASH_CHUNK_SIZE reads"""
     try:
-        with open(file_path, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
+        # SHA-256 runs on the CPU's SHA extensions where available, well ahead of MD5
+        h = hashlib.sha256()
+        buf = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buf)
+        with open(file_path, 'rb', buffering=0) as f:
+            while n := f.readinto(buf):
+                h.update(view[:n])
+        return h.hexdigest()
     except Exception as e:
         logger.warning(f"Could not calculate hash for {file_path}: {e}")
         return None
@@ -54,15 +120,27 @@ def should_reparse_m3u(source: M3USource, existing_count: int, force: bool = Fal
     if existing_count == 0:
         return True
     
-    # For FILE sources, check hash if available
-    if source.source_type == SourceType.FILE:
+    # For FILE sources, compare against the fingerprint of the last parse
+    if source.source_type == SourceType.FILE and source.m3u_hash:
+        try:
+            st = os.stat(source.file_path)
+        except OSError as e:
+            logger.warning(f"Could not stat {source.file_path}: {e}")
+            st = None
+        if st and st.st_size == source.m3u_size and st.st_mtime_ns == source.m3u_mtime_ns:
+            logger.info(f"M3U file unchanged for {source.name} (size/mtime), using cache")
+            return False
+
         current_hash = calculate_file_hash(source.file_path)
-        if current_hash and hasattr(source, 'm3u_hash') and source.m3u_hash:
+        if current_hash:
             if current_hash != source.m3u_hash:
                 logger.info(f"M3U file hash changed for {source.name}, will reparse")
                 return True
             else:
                 logger.info(f"M3U file unchanged for {source.name}, using cache")
+                # Touched but identical: remember the new stat so the next check skips the read
+                if st:
+                    source.m3u_size, source.m3u_mtime_ns = st.st_size, st.st_mtime_ns
                 return False
     
     # For URL sources, reparse if it's been > 1 hour since last sync
@@ -86,24 +164,27 @@ def cleanup_deselected_groups(
         return 0
     
     deleted_count = 0
-    content_dir = Path(base_dir) / content_type
-    
-    if content_dir.exists():
-        for group_dir in content_dir.iterdir():
-            if group_dir.is_dir():
-                is_selected = any(
-                    sanitize_name(g) == group_dir.name 
-                    for g in selected_groups
-                )
-                
-                if not is_selected:
-                    file_count = sum(1 for f in group_dir.glob(f'*{STRM_EXTENSION}'))
-                    deleted_count += file_count
-                    shutil.rmtree(group_dir)
-                    logger.info(
-                        f"Removed deselected {content_type} group: "
-                        f"{group_dir.name} ({file_count} files)"
-                    )
+    content_dir = os.path.join(base_dir, content_type)
+    if not os.path.isdir(content_dir):
+        return 0
+
+    expected = {sanitize_name(g) for g in selected_groups}
+    with os.scandir(content_dir) as it:
+        stale = [entry for entry in it if entry.is_dir() and entry.name not in expected]
+
+    for group_dir in stale:
+        # Same matches as glob('*.strm'): hidden files are skipped
+        with os.scandir(group_dir.path) as files:
+            file_count = sum(
+                1 for f in files
+                if f.name.endswith(STRM_EXTENSION) and not f.name.startswith('.')
+            )
+        deleted_count += file_count
+        shutil.rmtree(group_dir.path)
+        logger.info(
+            f"Removed deselected {content_type} group: "
+            f"{group_dir.name} ({file_count} files)"
+        )
     
     return deleted_count
 
@@ -124,7 +205,7 @@ def sync_m3u_source_task(source_id: int, sync_types: list = None, force: bool =
             return {"error": "Source not found"}
         
         # Get settings
-        settings = {s.key: s.value for s in db.query(SettingsModel).all()}
+        settings = get_settings_cached(db)
         prefix_regex = settings.get("PREFIX_REGEX")
         format_date = settings.get("FORMAT_DATE_IN_TITLE") == "true"
         clean_name = settings.get("CLEAN_NAME") == "true"
@@ -150,18 +231,16 @@ def sync_m3u_source_task(source_id: int, sync_types: list = None, force: bool =
         # Update M3USyncState to running and RESET counters
         sync_states = []
         if sync_types:
-            for stype in sync_types:
-                state = db.query(M3USyncState).filter(
-                    M3USyncState.m3u_source_id == source_id,
-                    M3USyncState.type == stype
-                ).first()
-                if state:
-                    state.status = "running"
-                    state.error_message = None
-                    # RESET counters at the start of each sync
-                    state.items_added = 0
-                    state.items_deleted = 0
-                    sync_states.append(state)
+            sync_states = db.query(M3USyncState).filter(
+                M3USyncState.m3u_source_id == source_id,
+                M3USyncState.type.in_(sync_types)
+            ).all()
+            for state in sync_states:
+                state.status = "running"
+                state.error_message = None
+                # RESET counters at the start of each sync
+                state.items_added = 0
+                state.items_deleted = 0
         
         db.commit()
         
@@ -189,13 +268,75 @@ def sync_m3u_source_task(source_id: int, sync_types: list = None, force: bool =
         
         added_count = 0
         if needs_reparse:
-            # Parse M3U content
+            # Fingerprint FILE sources before parsing (stat, then hash): if the file
+            # changes while we read it, the stored fingerprint is stale and the next
+            # sync reparses. Computed up front so hashing never holds the write transaction.
+            fingerprint = None
+            if source.source_type == SourceType.FILE:
+                try:
+                    st = os.stat(source.file_path)
+                    fingerprint = (st.st_size, st.st_mtime_ns, calculate_file_hash(source.file_path))
+                except OSError:
+                    fingerprint = (None, None, None)
+            
+            # Create output directory
+            Path(source.output_dir).mkdir(parents=True, exist_ok=True)
+            
+            # Stream parsed entries into the staging table in batched INSERTs; the
+            # old entries are only replaced once the whole playlist has been read
             try:
                 if source.source_type == SourceType.URL:
-                    entries = parse_m3u_url(source.url)
+                    entries = iter_m3u_url(source.url)
                 else:  # FILE
-                    entries = parse_m3u_file(source.file_path)
+                    entries = iter_m3u_file(source.file_path)
+                
+                # A failed sync may have left its staging table on this pooled connection
+                _ENTRY_STAGING.drop(db.connection(), checkfirst=True)
+                _ENTRY_STAGING.create(db.connection())
+                
+                batch = []
+                for entry_data in entries:
+                    try:
+                        # Determine entry type
+                        entry_type_str = entry_data.get('entry_type', 'live')
+                        if entry_type_str == 'movie':
+                            entry_type = EntryType.MOVIE
+                        elif entry_type_str == 'series':
+                            entry_type = EntryType.SERIES
+                        else:
+                            # Skip LIVE entries entirely
+                            continue
+                        
+                        batch.append({
+                            "m3u_source_id": source_id,
+                            "title": entry_data.get('title', 'Unknown'),
+                            "url": entry_data['url'],
+                            "group_title": entry_data.get('group_title'),
+                            "logo": entry_data.get('logo'),
+                            "tvg_id": entry_data.get('tvg_id'),
+                            "tvg_name": entry_data.get('tvg_name'),
+                            "entry_type": entry_type
+                        })
+                            
+                    except Exception as e:
+                        logger.error(f"Error caching entry {entry_data.get('title')}: {e}")
+                        continue
+                    
+                    if len(batch) >= ENTRY_INSERT_BATCH_SIZE:
+                        db.execute(_ENTRY_STAGING.insert(), batch)
+                        added_count += len(batch)
+                        batch.clear()
+                
+                if batch:
+                    db.execute(_ENTRY_STAGING.insert(), batch)
+                    added_count += len(batch)
+                
+                # Swap: the write lock is only taken from here to the commit below
+                db.query(M3UEntry).filter(M3UEntry.m3u_source_id == source_id).delete(synchronize_session=False)
+                db.execute(M3UEntry.__table__.insert().from_select(_STAGED_COLUMNS, select(*_ENTRY_STAGING.c)))
+                _ENTRY_STAGING.drop(db.connection())
             except Exception as e:
+                db.rollback()
                 logger.error(f"Error parsing M3U source {source.name}: {e}")
                 source.sync_status = "error"
                 
@@ -207,53 +348,12 @@ def sync_m3u_source_task(source_id: int, sync_types: list = None, force: bool =
                 db.commit()
                 return {"error": str(e)}
             
-            logger.info(f"Parsed {len(entries)} entries from {source.name}")
-            
-            # Clear existing entries
-            db.query(M3UEntry).filter(M3UEntry.m3u_source_id == source_id).delete()
-            db.commit()
-            
-            # Create output directory
-            Path(source.output_dir).mkdir(parents=True, exist_ok=True)
-            
-            # Process and cache entries
-            for entry_data in entries:
-                try:
-                    # Determine entry type
-                    entry_type_str = entry_data.get('entry_type', 'live')
-                    if entry_type_str == 'movie':
-                        entry_type = EntryType.MOVIE
-                    elif entry_type_str == 'series':
-                        entry_type = EntryType.SERIES
-                    else:
-                        # Skip LIVE entries entirely
-                        continue
-                    
-                    # Save to database
-                    db_entry = M3UEntry(
-                        m3u_source_id=source_id,
-                        title=entry_data.get('title', 'Unknown'),
-                        url=entry_data['url'],
-                        group_title=entry_data.get('group_title'),
-                        logo=entry_data.get('logo'),
-                        tvg_id=entry_data.get('tvg_id'),
-                        tvg_name=entry_data.get('tvg_name'),
-                        entry_type=entry_type
-                    )
-                    db.add(db_entry)
-                    added_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error caching entry {entry_data.get('title')}: {e}")
-                    continue
+            logger.info(f"Cached {added_count} entries from {source.name}")
             
-            # Commit cached entries
+            # Commit cached entries together with the fingerprint they were parsed from
+            if fingerprint:
+                source.m3u_size, source.m3u_mtime_ns, source.m3u_hash = fingerprint
             db.commit()
-            
-            # Update hash if applicable
-            if source.source_type == SourceType.FILE and hasattr(source, 'm3u_hash'):
-                source.m3u_hash = calculate_file_hash(source.file_path)
-                db.commit()
         else:
             logger.info(f"Using cached entries for {source.name}")
             added_count = existing_entries_count
@@ -290,6 +390,9 @@ def sync_m3u_source_task(source_id: int, sync_types: list = None, force: bool =
         }
         
         use_category_folders = settings.get("SERIES_USE_CATEGORY_FOLDERS", "true") == "true"
+        movies_base_dir = source.movies_dir or f"{source.output_dir}/movies"
+        series_base_dir = source.series_dir or f"{source.output_dir}/series"
+        movie_nfo, show_nfo = fm.get_nfo_generators(prefix_regex, format_date, clean_name)
         
         # CLEANUP PHASE: Remove directories for deselected groups
         movies_deleted = cleanup_deselected_groups(
@@ -306,81 +409,141 @@ def sync_m3u_source_task(source_id: int, sync_types: list = None, force: bool =
         movies_files_created = 0
         series_files_created = 0
         
-        # Process entries for file generation
-        # We need an event loop for async FileManager methods
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # Process entries for file generation: paths and NFO content are built here,
+        # the mkdir + STRM/NFO writes run on a thread pool so filesystem latency
+        # (NFS/SMB output dirs) overlaps. Jobs are keyed by STRM path so duplicate
+        # entries keep the sequential "last one wins" result.
+        # group dir -> file names in it, read once per directory instead of a stat per entry
+        dir_listings = {}
+        # STRM paths already queued this run: a duplicate must not trust its stored fingerprint
+        queued_paths = set()
         
-        for entry in db.query(M3UEntry).filter(M3UEntry.m3u_source_id == source_id).all():
+        def write_entry(job) -> Optional[bool]:
+            """Write one entry's files; True if the STRM is new, None on error"""
+            group_dir, strm_path, nfo_path, url, nfo_content, title, unchanged = job
             try:
-                # Filter by sync_types if provided
-                if sync_types:
-                    if entry.entry_type == EntryType.MOVIE and CONTENT_TYPE_MOVIES not in sync_types:
-                        continue
-                    if entry.entry_type == EntryType.SERIES and CONTENT_TYPE_SERIES not in sync_types:
-                        continue
+                listing = dir_listings.get(group_dir)
+                if listing is None:
+                    try:
+                        listing = set(os.listdir(group_dir))
+                    except FileNotFoundError:
+                        listing = set()
+                    listing = dir_listings.setdefault(group_dir, listing)
+                fm.ensure_directory(group_dir)
+                # Check if STRM exists to count as new
+                strm_name = os.path.basename(strm_path)
+                is_new = strm_name not in listing
+                if unchanged and not is_new and os.path.basename(nfo_path) in listing:
+                    # Same content as last written, skip reading both files back
+                    return False
+                fm.write_strm_sync(strm_path, url)
+                fm.write_nfo_sync(nfo_path, nfo_content)
+                listing.add(strm_name)
+                return is_new
+            except Exception as e:
+                logger.error(f"Error processing entry {title}: {e}")
+                return None
+        
+        def flush(jobs: dict):
+            nonlocal movies_files_created, series_files_created
+            written = []
+            for (is_movie, entry_id, fingerprint, job), is_new in zip(jobs.values(), pool.map(write_entry, [v[3] for v in jobs.values()])):
+                if is_new is None:
+                    continue
+                if not job[-1]:
+                    written.append({"entry_id": entry_id, "fingerprint": fingerprint})
+                if is_new:
+                    if is_movie:
+                        movies_files_created += 1
+                    else:
+                        series_files_created += 1
+            jobs.clear()
+            if written:
+                db.execute(
+                    M3UEntry.__table__.update()
+                    .where(M3UEntry.__table__.c.id == bindparam("entry_id"))
+                    .values(generated_fingerprint=bindparam("fingerprint")),
+                    written
+                )
+                db.commit()
+        
+        jobs = {}
+        with ThreadPoolExecutor(max_workers=FILE_WRITE_WORKERS) as pool:
+            # Only selected groups of the requested types, filtered in SQL; only the
+            # columns used below, paged as plain rows (no ORM objects / identity map)
+            wanted = []
+            if not sync_types or CONTENT_TYPE_MOVIES in sync_types:
+                wanted.append(_group_filter(EntryType.MOVIE, selected_movie_groups))
+            if not sync_types or CONTENT_TYPE_SERIES in sync_types:
+                wanted.append(_group_filter(EntryType.SERIES, selected_series_groups))
+            for entry in _iter_selected_entries(db, source_id, or_(false(), *wanted)):
+                try:
+                    # Filter by sync_types if provided
+                    if sync_types:
+                        if entry.entry_type == EntryType.MOVIE and CONTENT_TYPE_MOVIES not in sync_types:
+                            continue
+                        if entry.entry_type == EntryType.SERIES and CONTENT_TYPE_SERIES not in sync_types:
+                            continue
 
-                group = entry.group_title or "Uncategorized"
-                
-                # Check if this group is selected and determine base directory
-                if entry.entry_type == EntryType.MOVIE:
-                    if group not in selected_movie_groups:
-                        continue
-                    # Movies always use categories: /output/movies/Category/MovieName.strm
-                    base_dir = source.movies_dir or f"{source.output_dir}/movies"
-                    safe_group = sanitize_name(group)
-                    safe_title = sanitize_name(entry.title)
-                    group_dir = Path(base_dir) / safe_group
-                elif entry.entry_type == EntryType.SERIES:
-                    if group not in selected_series_groups:
+                    group = entry.group_title or "Uncategorized"
+                    
+                    # Check if this group is selected and determine base directory
+                    if entry.entry_type == EntryType.MOVIE:
+                        if group not in selected_movie_groups:
+                            continue
+                        # Movies always use categories: /output/movies/Category/MovieName.strm
+                        base_dir = movies_base_dir
+                        safe_group = sanitize_name(group)
+                        safe_title = sanitize_name(entry.title)
+                        group_dir = Path(base_dir) / safe_group
+                    elif entry.entry_type == EntryType.SERIES:
+                        if group not in selected_series_groups:
+                            continue
+                        base_dir = series_base_dir
+                        safe_group = sanitize_name(group)
+                        safe_title = sanitize_name(entry.title)
+                        
+                        if use_category_folders:
+                            # /output/series/Category/SeriesName/
+                            group_dir = Path(base_dir) / safe_group / safe_title
+                        else:
+                            # /output/series/SeriesName/
+                            group_dir = Path(base_dir) / safe_title
+                    else:
                         continue
-                    base_dir = source.series_dir or f"{source.output_dir}/series"
-                    safe_group = sanitize_name(group)
-                    safe_title = sanitize_name(entry.title)
                     
-                    if use_category_folders:
-                        # /output/series/Category/SeriesName/
-                        group_dir = Path(base_dir) / safe_group / safe_title
+                    strm_path = str(group_dir / f"{safe_title}{STRM_EXTENSION}")
+                    nfo_path = str(group_dir / f"{safe_title}.nfo")
+                    
+                    # NFO content
+                    data = {
+                        "name": entry.title,
+                        "cover": entry.logo,
+                        # Add other fields if available in M3U entry
+                    }
+                    
+                    is_movie = entry.entry_type == EntryType.MOVIE
+                    if is_movie:
+                        nfo_content = movie_nfo(data)
                     else:
-                        # /output/series/SeriesName/
-                        group_dir = Path(base_dir) / safe_title
-                else:
+                        nfo_content = show_nfo(data)
+                    
+                    fingerprint = _generation_fingerprint(strm_path, entry.url, nfo_content)
+                    unchanged = entry.generated_fingerprint == fingerprint and strm_path not in queued_paths
+                    queued_paths.add(strm_path)
+                    
+                    if strm_path in jobs:
+                        # A later duplicate overwrites the earlier one, as it would sequentially
+                        del jobs[strm_path]
+                    jobs[strm_path] = (is_movie, entry.id, fingerprint, (str(group_dir), strm_path, nfo_path, entry.url, nfo_content, entry.title, unchanged))
+                    if len(jobs) >= FILE_WRITE_BATCH_SIZE:
+                        flush(jobs)
+                            
+                except Exception as e:
+                    logger.error(f"Error processing entry {entry.title}: {e}")
                     continue
-                
-                group_dir.mkdir(parents=True, exist_ok=True)
-                
-                strm_path = group_dir / f"{safe_title}{STRM_EXTENSION}"
-                nfo_path = group_dir / f"{safe_title}.nfo"
-                
-                # Check if STRM exists to count as new
-                is_new = not strm_path.exists()
-                
-                # Create STRM file
-                loop.run_until_complete(fm.write_strm(str(strm_path), entry.url))
-                
-                # Create NFO file
-                data = {
-                    "name": entry.title,
-                    "cover": entry.logo,
-                    # Add other fields if available in M3U entry
-                }
-                
-                if entry.entry_type == EntryType.MOVIE:
-                    nfo_content = fm.generate_movie_nfo(data, prefix_regex, format_date, clean_name)
-                    if is_new:
-                        movies_files_created += 1
-                else:
-                    nfo_content = fm.generate_show_nfo(data, prefix_regex, format_date, clean_name)
-                    if is_new:
-                        series_files_created += 1
-                
-                loop.run_until_complete(fm.write_nfo(str(nfo_path), nfo_content))
-                        
-            except Exception as e:
-                logger.error(f"Error processing entry {entry.title}: {e}")
-                continue
-        
-        loop.close()
+            
+            flush(jobs)
         
         files_created = movies_files_created + series_files_created
         
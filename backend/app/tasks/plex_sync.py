@@ -8,12 +8,17 @@ Syncs movies and series from Plex servers to STRM/NFO files.
 - Detects changes via cache
 - Generates STRM and NFO files using FileManager
 """
+import ast
 import asyncio
+import hashlib
 import os
-import shutil
+import orjson
 from app.core.celery_app import celery_app
+from app.core.event_loop import run_async
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
+from app.db.cache_writes import save_cache_mappings
 from app.models.plex_account import PlexAccount
 from app.models.plex_server import PlexServer
 from app.models.plex_library import PlexLibrary
@@ -21,14 +26,62 @@ from app.models.plex_sync_state import PlexSyncState
 from app.models.plex_cache import PlexMovieCache, PlexSeriesCache, PlexEpisodeCache
 from app.models.plex_schedule import PlexSchedule, PlexSyncType as PlexScheduleSyncType
 from app.models.plex_schedule_execution import PlexScheduleExecution, PlexExecutionStatus
-from app.models.settings import SettingsModel
+from app.core.settings_cache import get_settings_cached
 from app.services.plex import PlexClient
 from app.services.file_manager import FileManager
 from datetime import datetime
+from typing import Awaitable, Callable, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+FILE_WRITE_BATCH_SIZE = 256  # Items whose STRM/NFO writes are awaited together
+FILE_WRITE_CONCURRENCY = 64  # Writes in flight at once (each holds an open file)
+DELETE_BATCH_SIZE = 500  # Cache rows removed per DELETE ... IN statement
+
+
+class _WriteBatch:
+    """
+    Queue STRM/NFO writes and await them together so their I/O overlaps.
+
+    Each item carries the cache update to apply once its files are written;
+    items whose writes fail are logged and left uncached, so the next sync retries them.
+    """
+
+    def __init__(self, size: int = FILE_WRITE_BATCH_SIZE, concurrency: int = FILE_WRITE_CONCURRENCY):
+        self.size = size
+        self.items = []
+        self.limit = asyncio.Semaphore(concurrency)
+
+    async def _limited(self, write: Awaitable) -> None:
+        async with self.limit:
+            await write
+
+    async def add(self, label: str, writes: list, on_written: Callable[[], None]) -> int:
+        """Queue one item's writes; flushes when the batch is full and returns the items written"""
+        self.items.append((label, asyncio.gather(*(self._limited(w) for w in writes)), on_written))
+        if len(self.items) >= self.size:
+            return await self.flush()
+        # Let the new writes start (their file I/O runs on the executor) before the
+        # caller goes back to blocking work such as fetching the next Plex item
+        await asyncio.sleep(0)
+        return 0
+
+    async def flush(self) -> int:
+        """Await all queued writes, apply cache updates of successful items, return their count"""
+        items, self.items = self.items, []
+        if not items:
+            return 0
+        results = await asyncio.gather(*(writes for _, writes, _ in items), return_exceptions=True)
+        written = 0
+        for (label, _, on_written), result in zip(items, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error writing Plex files for {label}: {result}")
+                continue
+            on_written()
+            written += 1
+        return written
+
 
 def generate_plex_movie_nfo(movie: dict, fm: FileManager) -> str:
     """
@@ -38,72 +91,82 @@ def generate_plex_movie_nfo(movie: dict, fm: FileManager) -> str:
     @param fm FileManager for XML escaping
     @returns NFO XML content string
     """
+    esc = fm._escape_xml  # bound once, called per field and per list item
     guid = movie.get("guid", {})
 
-    nfo = '<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n<movie>\n'
-    nfo += f'  <title>{fm._escape_xml(movie.get("title", "Unknown"))}</title>\n'
+    parts = ['<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n<movie>\n']
+    parts.append(f'  <title>{esc(movie.get("title", "Unknown"))}</title>\n')
 
     if movie.get("original_title"):
-        nfo += f'  <originaltitle>{fm._escape_xml(movie["original_title"])}</originaltitle>\n'
+        parts.append(f'  <originaltitle>{esc(movie["original_title"])}</originaltitle>\n')
 
     if guid.get("tmdb"):
-        nfo += f'  <tmdbid>{guid["tmdb"]}</tmdbid>\n'
-        nfo += f'  <uniqueid type="tmdb" default="true">{guid["tmdb"]}</uniqueid>\n'
+        parts.append(
+            f'  <tmdbid>{guid["tmdb"]}</tmdbid>\n'
+            f'  <uniqueid type="tmdb" default="true">{guid["tmdb"]}</uniqueid>\n'
+        )
     if guid.get("imdb"):
-        nfo += f'  <uniqueid type="imdb">{guid["imdb"]}</uniqueid>\n'
+        parts.append(f'  <uniqueid type="imdb">{guid["imdb"]}</uniqueid>\n')
 
     if movie.get("summary"):
-        nfo += f'  <plot>{fm._escape_xml(movie["summary"])}</plot>\n'
-        nfo += f'  <outline>{fm._escape_xml(movie["summary"][:200])}</outline>\n'
+        parts.append(
+            f'  <plot>{esc(movie["summary"])}</plot>\n'
+            f'  <outline>{esc(movie["summary"][:200])}</outline>\n'
+        )
 
     if movie.get("year"):
-        nfo += f'  <year>{movie["year"]}</year>\n'
-        nfo += f'  <premiered>{movie["year"]}-01-01</premiered>\n'
+        parts.append(
+            f'  <year>{movie["year"]}</year>\n'
+            f'  <premiered>{movie["year"]}-01-01</premiered>\n'
+        )
 
     if movie.get("rating"):
         try:
             r_val = float(movie["rating"])
-            nfo += '  <ratings>\n'
-            nfo += f'    <rating name="plex" default="true"><value>{r_val:.1f}</value></rating>\n'
-            nfo += '  </ratings>\n'
-            nfo += f'  <userrating>{int(round(r_val))}</userrating>\n'
+            parts.append(
+                '  <ratings>\n'
+                f'    <rating name="plex" default="true"><value>{r_val:.1f}</value></rating>\n'
+                '  </ratings>\n'
+                f'  <userrating>{int(round(r_val))}</userrating>\n'
+            )
         except (ValueError, TypeError):
             pass
 
-    for genre in movie.get("genres", []):
-        nfo += f'  <genre>{fm._escape_xml(genre)}</genre>\n'
+    parts.extend([f'  <genre>{esc(genre)}</genre>\n' for genre in movie.get("genres", [])])
 
-    for director in movie.get("directors", []):
-        nfo += f'  <director>{fm._escape_xml(director)}</director>\n'
+    parts.extend([f'  <director>{esc(director)}</director>\n' for director in movie.get("directors", [])])
 
-    for actor in movie.get("actors", []):
-        nfo += f'  <actor><name>{fm._escape_xml(actor)}</name></actor>\n'
+    parts.extend([f'  <actor><name>{esc(actor)}</name></actor>\n' for actor in movie.get("actors", [])])
 
     if movie.get("duration"):
         runtime = movie["duration"] // 60000  # ms to minutes
-        nfo += f'  <runtime>{runtime}</runtime>\n'
+        parts.append(f'  <runtime>{runtime}</runtime>\n')
 
     # Media info
     media = movie.get("media", {})
     if media:
-        nfo += '  <fileinfo>\n    <streamdetails>\n'
-        nfo += '      <video>\n'
+        parts.append(
+            '  <fileinfo>\n    <streamdetails>\n'
+            '      <video>\n'
+        )
         if media.get("video_codec"):
-            nfo += f'        <codec>{fm._escape_xml(media["video_codec"])}</codec>\n'
+            parts.append(f'        <codec>{esc(media["video_codec"])}</codec>\n')
         if media.get("resolution"):
-            nfo += f'        <aspect>{fm._escape_xml(media["resolution"])}</aspect>\n'
-        nfo += '      </video>\n'
+            parts.append(f'        <aspect>{esc(media["resolution"])}</aspect>\n')
+        parts.append('      </video>\n')
         if media.get("audio_codec"):
-            nfo += '      <audio>\n'
-            nfo += f'        <codec>{fm._escape_xml(media["audio_codec"])}</codec>\n'
-            nfo += '      </audio>\n'
-        nfo += '    </streamdetails>\n  </fileinfo>\n'
+            parts.append(
+                '      <audio>\n'
+                f'        <codec>{esc(media["audio_codec"])}</codec>\n'
+                '      </audio>\n'
+            )
+        parts.append('    </streamdetails>\n  </fileinfo>\n')
 
     # Artwork (would need Plex server URL to construct full path)
     # For now, skip as STRM players usually fetch from TMDB
 
-    nfo += '</movie>'
-    return nfo
+    parts.append('</movie>')
+    return ''.join(parts)
 
 
 def generate_plex_show_nfo(show: dict, fm: FileManager) -> str:
@@ -114,46 +177,51 @@ def generate_plex_show_nfo(show: dict, fm: FileManager) -> str:
     @param fm FileManager for XML escaping
     @returns NFO XML content string
     """
+    esc = fm._escape_xml
     guid = show.get("guid", {})
 
-    nfo = '<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n<tvshow>\n'
-    nfo += f'  <title>{fm._escape_xml(show.get("title", "Unknown"))}</title>\n'
+    parts = ['<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n<tvshow>\n']
+    parts.append(f'  <title>{esc(show.get("title", "Unknown"))}</title>\n')
 
     if show.get("original_title"):
-        nfo += f'  <originaltitle>{fm._escape_xml(show["original_title"])}</originaltitle>\n'
+        parts.append(f'  <originaltitle>{esc(show["original_title"])}</originaltitle>\n')
 
     if guid.get("tmdb"):
-        nfo += f'  <tmdbid>{guid["tmdb"]}</tmdbid>\n'
-        nfo += f'  <uniqueid type="tmdb" default="true">{guid["tmdb"]}</uniqueid>\n'
+        parts.append(
+            f'  <tmdbid>{guid["tmdb"]}</tmdbid>\n'
+            f'  <uniqueid type="tmdb" default="true">{guid["tmdb"]}</uniqueid>\n'
+        )
     if guid.get("tvdb"):
-        nfo += f'  <uniqueid type="tvdb">{guid["tvdb"]}</uniqueid>\n'
+        parts.append(f'  <uniqueid type="tvdb">{guid["tvdb"]}</uniqueid>\n')
     if guid.get("imdb"):
-        nfo += f'  <uniqueid type="imdb">{guid["imdb"]}</uniqueid>\n'
+        parts.append(f'  <uniqueid type="imdb">{guid["imdb"]}</uniqueid>\n')
 
     if show.get("summary"):
-        nfo += f'  <plot>{fm._escape_xml(show["summary"])}</plot>\n'
+        parts.append(f'  <plot>{esc(show["summary"])}</plot>\n')
 
     if show.get("year"):
-        nfo += f'  <year>{show["year"]}</year>\n'
-        nfo += f'  <premiered>{show["year"]}-01-01</premiered>\n'
+        parts.append(
+            f'  <year>{show["year"]}</year>\n'
+            f'  <premiered>{show["year"]}-01-01</premiered>\n'
+        )
 
     if show.get("rating"):
         try:
             r_val = float(show["rating"])
-            nfo += '  <ratings>\n'
-            nfo += f'    <rating name="plex" default="true"><value>{r_val:.1f}</value></rating>\n'
-            nfo += '  </ratings>\n'
+            parts.append(
+                '  <ratings>\n'
+                f'    <rating name="plex" default="true"><value>{r_val:.1f}</value></rating>\n'
+                '  </ratings>\n'
+            )
         except (ValueError, TypeError):
             pass
 
-    for genre in show.get("genres", []):
-        nfo += f'  <genre>{fm._escape_xml(genre)}</genre>\n'
+    parts.extend([f'  <genre>{esc(genre)}</genre>\n' for genre in show.get("genres", [])])
 
-    for actor in show.get("actors", []):
-        nfo += f'  <actor><name>{fm._escape_xml(actor)}</name></actor>\n'
+    parts.extend([f'  <actor><name>{esc(actor)}</name></actor>\n' for actor in show.get("actors", [])])
 
-    nfo += '</tvshow>'
-    return nfo
+    parts.append('</tvshow>')
+    return ''.join(parts)
 
 
 def generate_plex_episode_nfo(episode: dict, show_title: str, fm: FileManager) -> str:
@@ -165,31 +233,73 @@ def generate_plex_episode_nfo(episode: dict, show_title: str, fm: FileManager) -
     @param fm FileManager for XML escaping
     @returns NFO XML content string
     """
-    nfo = '<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n<episodedetails>\n'
-    nfo += f'  <title>{fm._escape_xml(episode.get("title", "Unknown"))}</title>\n'
-    nfo += f'  <showtitle>{fm._escape_xml(show_title)}</showtitle>\n'
-    nfo += f'  <season>{episode.get("season_num", 0)}</season>\n'
-    nfo += f'  <episode>{episode.get("episode_num", 0)}</episode>\n'
+    esc = fm._escape_xml
+    parts = ['<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>\n<episodedetails>\n']
+    parts.append(
+        f'  <title>{esc(episode.get("title", "Unknown"))}</title>\n'
+        f'  <showtitle>{esc(show_title)}</showtitle>\n'
+        f'  <season>{episode.get("season_num", 0)}</season>\n'
+        f'  <episode>{episode.get("episode_num", 0)}</episode>\n'
+    )
 
     if episode.get("summary"):
-        nfo += f'  <plot>{fm._escape_xml(episode["summary"])}</plot>\n'
+        parts.append(f'  <plot>{esc(episode["summary"])}</plot>\n')
 
     if episode.get("duration"):
         runtime = episode["duration"] // 60000  # ms to minutes
-        nfo += f'  <runtime>{runtime}</runtime>\n'
+        parts.append(f'  <runtime>{runtime}</runtime>\n')
 
     # Media info
     media = episode.get("media", {})
     if media:
-        nfo += '  <fileinfo>\n    <streamdetails>\n'
-        nfo += '      <video>\n'
+        parts.append(
+            '  <fileinfo>\n    <streamdetails>\n'
+            '      <video>\n'
+        )
         if media.get("video_codec"):
-            nfo += f'        <codec>{fm._escape_xml(media["video_codec"])}</codec>\n'
-        nfo += '      </video>\n'
-        nfo += '    </streamdetails>\n  </fileinfo>\n'
+            parts.append(f'        <codec>{esc(media["video_codec"])}</codec>\n')
+        parts.append(
+            '      </video>\n'
+            '    </streamdetails>\n  </fileinfo>\n'
+        )
+
+    parts.append('</episodedetails>')
+    return ''.join(parts)
+
+
+def _dump_guid(guid: dict) -> str:
+    """Canonical JSON of a Plex guid dict, stable across runs so unchanged rows compare equal"""
+    return orjson.dumps(guid, option=orjson.OPT_SORT_KEYS).decode()
+
+
+def _load_guid(value: Optional[str]) -> dict:
+    """Parse a cached guid column: canonical JSON, or the dict repr written by older versions"""
+    if not value:
+        return {}
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        pass
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return {}
+
+
+def _content_hash(path: str, content: str) -> str:
+    """Digest of a file path and the content written there, to skip rewriting it when unchanged"""
+    return hashlib.blake2b(f"{path}\0{content}".encode(), digest_size=16).hexdigest()
+
+
+def _stream_url_parts(proxy_base_url: str, server_id: int, shared_key: str) -> Tuple[str, str]:
+    """
+    Constant parts of the proxy stream URL around an item's rating key.
 
-    nfo += '</episodedetails>'
-    return nfo
+    The shared key authenticates the proxy; the /stream.m3u8 suffix helps
+    ExoPlayer-based clients detect HLS content.
+    """
+    key_param = f"?key={shared_key}" if shared_key else ""
+    return f"{proxy_base_url}/api/v1/plex/proxy/{server_id}/", f"/stream.m3u8{key_param}"
 
 
 async def process_plex_movies(db: Session, client: PlexClient, plex_server, fm: FileManager, server_id: int):
@@ -202,10 +312,11 @@ async def process_plex_movies(db: Session, client: PlexClient, plex_server, fm:
     @param fm FileManager for file operations
     @param server_id Database server ID
     """
-    settings = {s.key: s.value for s in db.query(SettingsModel).all()}
+    settings = get_settings_cached(db)
     use_library_folders = settings.get("PLEX_USE_LIBRARY_FOLDERS", "true") == "true"
     proxy_base_url = settings.get("PLEX_PROXY_BASE_URL", "http://localhost:8000")
     shared_key = settings.get("PLEX_SHARED_KEY", "")
+    url_prefix, url_suffix = _stream_url_parts(proxy_base_url, server_id, shared_key)
 
     # Get sync state
     sync_state = db.query(PlexSyncState).filter(
@@ -239,69 +350,55 @@ async def process_plex_movies(db: Session, client: PlexClient, plex_server, fm:
 
         total_added = 0
         total_deleted = 0
+        writes = _WriteBatch()
+        # Cache rows of written movies, saved in bulk per library
+        movie_inserts = {}
+        movie_updates = {}
 
         for library in libraries:
             logger.info(f"Processing Plex movie library: {library.title}")
+            library_root = os.path.join(fm.output_dir, fm.sanitize_name(library.title)) if use_library_folders else fm.output_dir
 
-            # Fetch movies from this library
-            movies = client.get_movies(plex_server, library.library_key)
-
-            # Get cached movies for this library
+            # Get cached movies for this library as plain rows (only diffed columns);
+            # ORM objects are loaded just for the movies that get rewritten
             cached_movies = {
-                m.plex_key: m for m in db.query(PlexMovieCache).filter(
-                    PlexMovieCache.server_id == server_id,
-                    PlexMovieCache.library_id == library.id
-                ).all()
+                m.plex_key: m for m in db.execute(
+                    select(
+                        PlexMovieCache.id, PlexMovieCache.plex_key, PlexMovieCache.title,
+                        PlexMovieCache.year, PlexMovieCache.guid, PlexMovieCache.updated_at
+                    ).where(
+                        PlexMovieCache.server_id == server_id,
+                        PlexMovieCache.library_id == library.id
+                    )
+                )
             }
 
-            to_add_update = []
             current_keys = set()
 
-            for movie in movies:
+            # Movies processed with the same Plex updatedAt are skipped without
+            # being built; their keys still land in current_keys
+            known = {(m.plex_key, m.updated_at) for m in cached_movies.values() if m.updated_at}
+
+            # Movies are streamed from Plex and processed as they arrive
+            for movie in client.get_movies(plex_server, library.library_key, known=known, seen=current_keys):
                 key = movie["key"]
                 current_keys.add(key)
 
                 cached = cached_movies.get(key)
-                if not cached:
-                    # New movie - needs processing
-                    to_add_update.append(movie)
-                else:
+                if cached:
                     # Existing movie - only reprocess if critical metadata changed
                     # (title, year, or TMDB ID affect folder/filename)
-                    guid = movie.get("guid", {})
-                    new_tmdb = guid.get("tmdb")
-                    cached_tmdb = None
-                    if cached.guid:
-                        try:
-                            import ast
-                            cached_guid = ast.literal_eval(cached.guid)
-                            cached_tmdb = cached_guid.get("tmdb")
-                        except:
-                            pass
-
-                    if (cached.title != movie.get("title") or
-                        cached.year != str(movie.get("year", "")) or
-                        cached_tmdb != new_tmdb):
-                        to_add_update.append(movie)
-
-            # Detect deletions
-            to_delete = [c for k, c in cached_movies.items() if k not in current_keys]
-
-            # Process deletions
-            for cached_movie in to_delete:
-                # Try to remove files (best effort)
-                try:
-                    # We don't have full path info in cache, so just delete from DB
-                    pass
-                except Exception:
-                    pass
-                db.delete(cached_movie)
-                total_deleted += 1
-
-            db.commit()
+                    year = movie.get("year", "")
+                    if (cached.title == movie.get("title") and
+                        cached.year == (str(year) if year else None) and
+                        _load_guid(cached.guid).get("tmdb") == movie.get("guid", {}).get("tmdb")):
+                        # Files stay as they are; remember the new updatedAt (and canonical
+                        # guid) so the movie is skipped without being built next time
+                        guid_json = _dump_guid(movie.get("guid", {}))
+                        if cached.updated_at != movie.get("updated_at") or cached.guid != guid_json:
+                            movie_updates[key] = {"id": cached.id, "guid": guid_json, "updated_at": movie.get("updated_at")}
+                        continue
 
-            # Process additions/updates
-            for movie in to_add_update:
                 try:
                     guid = movie.get("guid", {})
                     tmdb_id = guid.get("tmdb")
@@ -316,51 +413,60 @@ async def process_plex_movies(db: Session, client: PlexClient, plex_server, fm:
                     else:
                         folder_name = f"{safe_title} ({year})" if year else safe_title
 
-                    # Determine target directory
-                    if use_library_folders:
-                        safe_lib = fm.sanitize_name(library.title)
-                        target_dir = os.path.join(fm.output_dir, safe_lib, folder_name)
-                    else:
-                        target_dir = os.path.join(fm.output_dir, folder_name)
+                    target_dir = os.path.join(library_root, folder_name)
 
-                    fm.ensure_directory(target_dir)
+                    await fm.ensure_directory_async(target_dir)
 
-                    # Build proxy URL for streaming (includes shared key for authentication)
-                    # The /stream.m3u8 suffix helps ExoPlayer-based clients detect HLS content
-                    rating_key = movie.get("rating_key")
-                    key_param = f"?key={shared_key}" if shared_key else ""
-                    stream_url = f"{proxy_base_url}/api/v1/plex/proxy/{server_id}/{rating_key}/stream.m3u8{key_param}"
+                    # Proxy URL for streaming
+                    stream_url = f"{url_prefix}{movie.get('rating_key')}{url_suffix}"
 
-                    # Write STRM
+                    # STRM and NFO are written with the rest of the batch
                     strm_path = os.path.join(target_dir, f"{folder_name}.strm")
-                    await fm.write_strm(strm_path, stream_url)
-
-                    # Generate and write NFO
-                    nfo_content = generate_plex_movie_nfo(movie, fm)
                     nfo_path = os.path.join(target_dir, f"{folder_name}.nfo")
-                    await fm.write_nfo(nfo_path, nfo_content)
-
-                    # Update cache
-                    cached = cached_movies.get(movie["key"])
-                    if not cached:
-                        cached = PlexMovieCache(
-                            server_id=server_id,
-                            library_id=library.id,
-                            plex_key=movie["key"]
-                        )
-                        db.add(cached)
 
-                    cached.title = title
-                    cached.year = str(year) if year else None
-                    cached.guid = str(guid)
-                    cached.updated_at = movie.get("updated_at")
+                    def update_cache(movie=movie, title=title, year=year, guid=guid):
+                        values = {
+                            "title": title,
+                            "year": str(year) if year else None,
+                            "guid": _dump_guid(guid),
+                            "updated_at": movie.get("updated_at"),
+                        }
+                        row = cached_movies.get(movie["key"])
+                        if row:
+                            movie_updates[movie["key"]] = {"id": row.id, **values}
+                        else:
+                            movie_inserts[movie["key"]] = {
+                                "server_id": server_id,
+                                "library_id": library.id,
+                                "plex_key": movie["key"],
+                                **values
+                            }
 
-                    total_added += 1
+                    nfo_content = generate_plex_movie_nfo(movie, fm)
+                    total_added += await writes.add(
+                        title,
+                        [fm.write_strm(strm_path, stream_url), fm.write_nfo(nfo_path, nfo_content)],
+                        update_cache
+                    )
 
                 except Exception as e:
                     logger.error(f"Error processing Plex movie {movie.get('title')}: {e}")
                     continue
 
+            total_added += await writes.flush()
+            save_cache_mappings(db, PlexMovieCache, movie_inserts, movie_updates)
+            db.commit()
+
+            # Detect deletions (files are left in place, the cache has no full path info)
+            to_delete = [cached_movies[k].id for k in cached_movies.keys() - current_keys]
+
+            # Process deletions
+            for i in range(0, len(to_delete), DELETE_BATCH_SIZE):
+                db.query(PlexMovieCache).filter(
+                    PlexMovieCache.id.in_(to_delete[i:i + DELETE_BATCH_SIZE])
+                ).delete(synchronize_session=False)
+            total_deleted += len(to_delete)
+
             db.commit()
 
             # Update library last sync
@@ -390,11 +496,12 @@ async def process_plex_series(db: Session, client: PlexClient, plex_server, fm:
     @param fm FileManager for file operations
     @param server_id Database server ID
     """
-    settings = {s.key: s.value for s in db.query(SettingsModel).all()}
+    settings = get_settings_cached(db)
     use_library_folders = settings.get("PLEX_USE_LIBRARY_FOLDERS", "true") == "true"
     use_season_folders = settings.get("SERIES_USE_SEASON_FOLDERS", "true") == "true"
     proxy_base_url = settings.get("PLEX_PROXY_BASE_URL", "http://localhost:8000")
     shared_key = settings.get("PLEX_SHARED_KEY", "")
+    url_prefix, url_suffix = _stream_url_parts(proxy_base_url, server_id, shared_key)
 
     # Get sync state
     sync_state = db.query(PlexSyncState).filter(
@@ -426,52 +533,50 @@ async def process_plex_series(db: Session, client: PlexClient, plex_server, fm:
             db.commit()
             return
 
-        # Load episode cache for this server
-        # Key: plex_key -> PlexEpisodeCache
-        all_cached_episodes = db.query(PlexEpisodeCache).filter(
-            PlexEpisodeCache.server_id == server_id
-        ).all()
-        cached_episodes = {e.plex_key: e for e in all_cached_episodes}
+        # Load episode cache for this server as plain rows
+        # Key: plex_key -> (id, plex_key, season_num, episode_num, title)
+        cached_episodes = {
+            e.plex_key: e for e in db.execute(
+                select(
+                    PlexEpisodeCache.id, PlexEpisodeCache.plex_key, PlexEpisodeCache.season_num,
+                    PlexEpisodeCache.episode_num, PlexEpisodeCache.title
+                ).where(PlexEpisodeCache.server_id == server_id)
+            )
+        }
+        # Cache rows of written episodes, saved in bulk per library
+        episode_inserts = {}
+        episode_updates = {}
 
         total_episodes_added = 0
         total_episodes_skipped = 0
         total_series_deleted = 0
+        writes = _WriteBatch()
 
         for library in libraries:
             logger.info(f"Processing Plex TV library: {library.title}")
+            library_root = os.path.join(fm.output_dir, fm.sanitize_name(library.title)) if use_library_folders else fm.output_dir
 
-            # Fetch shows from this library
-            shows = client.get_shows(plex_server, library.library_key)
-
-            # Get cached series for this library
+            # Get cached series for this library as plain rows; ORM objects are
+            # loaded (or created) only for shows whose cached metadata changes
             cached_series = {
-                s.plex_key: s for s in db.query(PlexSeriesCache).filter(
-                    PlexSeriesCache.server_id == server_id,
-                    PlexSeriesCache.library_id == library.id
-                ).all()
+                s.plex_key: s for s in db.execute(
+                    select(
+                        PlexSeriesCache.id, PlexSeriesCache.plex_key, PlexSeriesCache.title,
+                        PlexSeriesCache.year, PlexSeriesCache.guid, PlexSeriesCache.content_hash
+                    ).where(
+                        PlexSeriesCache.server_id == server_id,
+                        PlexSeriesCache.library_id == library.id
+                    )
+                )
             }
 
             current_keys = set()
-            for show in shows:
-                current_keys.add(show["key"])
-
-            # Detect deletions
-            to_delete = [c for k, c in cached_series.items() if k not in current_keys]
 
-            # Process deletions
-            for cached_show in to_delete:
-                db.delete(cached_show)
-                # Also delete episodes
-                db.query(PlexEpisodeCache).filter(
-                    PlexEpisodeCache.server_id == server_id,
-                    PlexEpisodeCache.series_key == cached_show.plex_key
-                ).delete()
-                total_series_deleted += 1
-
-            db.commit()
-
-            # Process ALL shows - episode cache will skip unchanged episodes
-            for show in shows:
+            # Process ALL shows as they are streamed from Plex - episode cache will skip unchanged episodes
+            # Episodes of the upcoming shows are fetched in parallel and handled in completion order
+            shows = client.get_shows(plex_server, library.library_key)
+            for show, episodes_by_season in client.iter_show_episodes(plex_server, shows):
+                current_keys.add(show["key"])
                 try:
                     guid = show.get("guid", {})
                     tmdb_id = guid.get("tmdb")
@@ -486,22 +591,21 @@ async def process_plex_series(db: Session, client: PlexClient, plex_server, fm:
                     else:
                         folder_name = f"{safe_title} ({year})" if year else safe_title
 
-                    # Determine target directory
-                    if use_library_folders:
-                        safe_lib = fm.sanitize_name(library.title)
-                        series_dir = os.path.join(fm.output_dir, safe_lib, folder_name)
-                    else:
-                        series_dir = os.path.join(fm.output_dir, folder_name)
+                    series_dir = os.path.join(library_root, folder_name)
 
-                    fm.ensure_directory(series_dir)
+                    await fm.ensure_directory_async(series_dir)
 
-                    # Write tvshow.nfo (will be skipped if unchanged)
+                    # Write tvshow.nfo, unless the cache says this exact content was written last time
                     show_nfo_path = os.path.join(series_dir, "tvshow.nfo")
                     show_nfo_content = generate_plex_show_nfo(show, fm)
-                    await fm.write_nfo(show_nfo_path, show_nfo_content)
+                    content_hash = _content_hash(show_nfo_path, show_nfo_content)
+                    previous = cached_series.get(show["key"])
+                    if not previous or previous.content_hash != content_hash:
+                        await fm.write_nfo(show_nfo_path, show_nfo_content)
 
-                    # Fetch episodes
-                    episodes_by_season = client.get_show_episodes(plex_server, show["key"])
+                    # Episodes were prefetched; surface a failed fetch for this show
+                    if isinstance(episodes_by_season, Exception):
+                        raise episodes_by_season
 
                     for season_num, episodes in episodes_by_season.items():
                         # Season folder
@@ -510,7 +614,7 @@ async def process_plex_series(db: Session, client: PlexClient, plex_server, fm:
                         else:
                             season_dir = series_dir
 
-                        fm.ensure_directory(season_dir)
+                        await fm.ensure_directory_async(season_dir)
 
                         for episode in episodes:
                             ep_num = episode.get("episode_num", 0)
@@ -530,8 +634,6 @@ async def process_plex_series(db: Session, client: PlexClient, plex_server, fm:
                                     continue
 
                             # New or changed episode - process it
-                            total_episodes_added += 1
-
                             # Format episode filename
                             formatted_ep = f"S{season_num:02d}E{ep_num:02d}"
                             if ep_title:
@@ -540,34 +642,37 @@ async def process_plex_series(db: Session, client: PlexClient, plex_server, fm:
                             else:
                                 filename = formatted_ep
 
-                            # Build proxy URL for streaming
-                            key_param = f"?key={shared_key}" if shared_key else ""
-                            stream_url = f"{proxy_base_url}/api/v1/plex/proxy/{server_id}/{ep_rating_key}/stream.m3u8{key_param}"
+                            # Proxy URL for streaming
+                            stream_url = f"{url_prefix}{ep_rating_key}{url_suffix}"
 
-                            # Write STRM
+                            # STRM and episode NFO are written with the rest of the batch
                             strm_path = os.path.join(season_dir, f"{filename}.strm")
-                            await fm.write_strm(strm_path, stream_url)
-
-                            # Write episode NFO
                             ep_nfo_path = os.path.join(season_dir, f"{filename}.nfo")
+
+                            def update_episode_cache(series_key=show["key"], ep_plex_key=ep_plex_key,
+                                                     season_num=season_num, ep_num=ep_num, ep_title=ep_title):
+                                values = {"season_num": season_num, "episode_num": ep_num, "title": ep_title}
+                                cached_ep = cached_episodes.get(ep_plex_key)
+                                if cached_ep:
+                                    episode_updates[ep_plex_key] = {"id": cached_ep.id, **values}
+                                else:
+                                    episode_inserts[ep_plex_key] = {
+                                        "server_id": server_id,
+                                        "series_key": series_key,
+                                        "plex_key": ep_plex_key,
+                                        **values
+                                    }
+
                             ep_nfo_content = generate_plex_episode_nfo(episode, title, fm)
-                            await fm.write_nfo(ep_nfo_path, ep_nfo_content)
-
-                            # Update episode cache
-                            if not cached_ep:
-                                cached_ep = PlexEpisodeCache(
-                                    server_id=server_id,
-                                    series_key=show["key"],
-                                    plex_key=ep_plex_key
-                                )
-                                db.add(cached_ep)
-                                cached_episodes[ep_plex_key] = cached_ep
-
-                            cached_ep.season_num = season_num
-                            cached_ep.episode_num = ep_num
-                            cached_ep.title = ep_title
-
-                    # Update series cache
+                            total_episodes_added += await writes.add(
+                                f"{title} {formatted_ep}",
+                                [fm.write_strm(strm_path, stream_url), fm.write_nfo(ep_nfo_path, ep_nfo_content)],
+                                update_episode_cache
+                            )
+
+                    # Update series cache (unchanged shows are not written)
+                    cached_year = str(year) if year else None
+                    guid_json = _dump_guid(guid)
                     cached = cached_series.get(show["key"])
                     if not cached:
                         cached = PlexSeriesCache(
@@ -577,15 +682,40 @@ async def process_plex_series(db: Session, client: PlexClient, plex_server, fm:
                         )
                         db.add(cached)
                         cached_series[show["key"]] = cached
+                    elif (cached.title, cached.year, cached.guid, cached.content_hash) != (title, cached_year, guid_json, content_hash):
+                        if not isinstance(cached, PlexSeriesCache):
+                            cached = db.get(PlexSeriesCache, cached.id)
+                            cached_series[show["key"]] = cached
 
-                    cached.title = title
-                    cached.year = str(year) if year else None
-                    cached.guid = str(guid)
+                    if isinstance(cached, PlexSeriesCache):
+                        cached.title = title
+                        cached.year = cached_year
+                        cached.guid = guid_json
+                        cached.content_hash = content_hash
 
                 except Exception as e:
                     logger.error(f"Error processing Plex show {show.get('title')}: {e}")
                     continue
 
+            total_episodes_added += await writes.flush()
+            save_cache_mappings(db, PlexEpisodeCache, episode_inserts, episode_updates)
+            db.commit()
+
+            # Detect deletions
+            to_delete = [cached_series[k] for k in cached_series.keys() - current_keys]
+
+            # Process deletions, with their episodes
+            for i in range(0, len(to_delete), DELETE_BATCH_SIZE):
+                chunk = to_delete[i:i + DELETE_BATCH_SIZE]
+                db.query(PlexSeriesCache).filter(
+                    PlexSeriesCache.id.in_([c.id for c in chunk])
+                ).delete(synchronize_session=False)
+                db.query(PlexEpisodeCache).filter(
+                    PlexEpisodeCache.server_id == server_id,
+                    PlexEpisodeCache.series_key.in_([c.plex_key for c in chunk])
+                ).delete(synchronize_session=False)
+            total_series_deleted += len(to_delete)
+
             db.commit()
 
             # Update library last sync
@@ -607,49 +737,54 @@ async def process_plex_series(db: Session, client: PlexClient, plex_server, fm:
         raise
 
 
-@celery_app.task
-def sync_plex_movies_task(server_id: int, execution_id: int = None):
+def _run_plex_sync(server_id: int, execution_id: Optional[int], sync_type: str) -> str:
     """
-    Celery task to sync Plex movies.
+    Shared body of the Plex sync tasks: preflight, run the sync, record the execution.
 
     @param server_id Database ID of the Plex server to sync
     @param execution_id Optional execution record ID (for scheduled syncs)
+    @param sync_type "movies" or "series"
+    @returns Task result message
     """
     db = SessionLocal()
     execution = None
     try:
-        server = db.query(PlexServer).filter(PlexServer.id == server_id).first()
-        if not server:
+        # Server and its account in one round-trip
+        row = db.query(PlexServer, PlexAccount).outerjoin(
+            PlexAccount, PlexAccount.id == PlexServer.account_id
+        ).filter(PlexServer.id == server_id).first()
+        if not row:
             logger.error(f"Plex server {server_id} not found")
             return "Server not found"
+        server, account = row
 
-        # Mark any stale running executions as interrupted
-        stale_executions = db.query(PlexScheduleExecution).filter(
+        # Mark any stale running executions as interrupted (not the one this run reports to)
+        stale = db.query(PlexScheduleExecution).filter(
             PlexScheduleExecution.server_id == server_id,
-            PlexScheduleExecution.sync_type == "movies",
+            PlexScheduleExecution.sync_type == sync_type,
             PlexScheduleExecution.status == PlexExecutionStatus.RUNNING
-        ).all()
-        for stale in stale_executions:
-            stale.status = PlexExecutionStatus.INTERRUPTED
-            stale.completed_at = datetime.utcnow()
-            stale.error_message = "Interrupted by new sync"
-        if stale_executions:
-            db.commit()
+        )
+        if execution_id:
+            stale = stale.filter(PlexScheduleExecution.id != execution_id)
+        stale.update({
+            PlexScheduleExecution.status: PlexExecutionStatus.INTERRUPTED,
+            PlexScheduleExecution.completed_at: datetime.utcnow(),
+            PlexScheduleExecution.error_message: "Interrupted by new sync"
+        }, synchronize_session=False)
 
         # Get or create execution record
         if execution_id:
-            execution = db.query(PlexScheduleExecution).filter(PlexScheduleExecution.id == execution_id).first()
+            execution = db.get(PlexScheduleExecution, execution_id)
         else:
             # Manual sync - create execution record
             execution = PlexScheduleExecution(
                 server_id=server_id,
-                sync_type="movies",
+                sync_type=sync_type,
                 status=PlexExecutionStatus.RUNNING
             )
             db.add(execution)
-            db.commit()
+        db.commit()
 
-        account = db.query(PlexAccount).filter(PlexAccount.id == server.account_id).first()
         if not account:
             logger.error(f"Plex account for server {server_id} not found")
             if execution:
@@ -666,22 +801,24 @@ def sync_plex_movies_task(server_id: int, execution_id: int = None):
             # Update sync state with error
             sync_state = db.query(PlexSyncState).filter(
                 PlexSyncState.server_id == server_id,
-                PlexSyncState.type == "movies"
+                PlexSyncState.type == sync_type
             ).first()
             if sync_state:
                 sync_state.status = "failed"
                 sync_state.error_message = "Cannot connect to Plex server"
-                db.commit()
             if execution:
                 execution.status = PlexExecutionStatus.FAILED
                 execution.error_message = "Cannot connect to Plex server"
                 execution.completed_at = datetime.utcnow()
-                db.commit()
+            db.commit()
             return "Cannot connect to Plex server"
 
-        fm = FileManager(server.movies_dir)
-
-        asyncio.run(process_plex_movies(db, client, plex_server, fm, server_id))
+        if sync_type == "movies":
+            fm = FileManager(server.movies_dir)
+            run_async(process_plex_movies(db, client, plex_server, fm, server_id))
+        else:
+            fm = FileManager(server.series_dir)
+            run_async(process_plex_series(db, client, plex_server, fm, server_id))
 
         # Refresh session to get updated sync_state values
         db.expire_all()
@@ -693,16 +830,16 @@ def sync_plex_movies_task(server_id: int, execution_id: int = None):
             # Get items processed from sync state
             sync_state = db.query(PlexSyncState).filter(
                 PlexSyncState.server_id == server_id,
-                PlexSyncState.type == "movies"
+                PlexSyncState.type == sync_type
             ).first()
             if sync_state:
                 execution.items_processed = (sync_state.items_added or 0) + (sync_state.items_deleted or 0)
             db.commit()
 
-        return f"Plex movies synced for {server.name}"
+        return f"Plex {sync_type} synced for {server.name}"
 
     except Exception as e:
-        logger.exception(f"Error in sync_plex_movies_task: {e}")
+        logger.exception(f"Error in sync_plex_{sync_type}_task: {e}")
         if execution:
             execution.status = PlexExecutionStatus.FAILED
             execution.error_message = str(e)
@@ -714,109 +851,25 @@ def sync_plex_movies_task(server_id: int, execution_id: int = None):
 
 
 @celery_app.task
-def sync_plex_series_task(server_id: int, execution_id: int = None):
+def sync_plex_movies_task(server_id: int, execution_id: int = None):
     """
-    Celery task to sync Plex series.
+    Celery task to sync Plex movies.
 
     @param server_id Database ID of the Plex server to sync
     @param execution_id Optional execution record ID (for scheduled syncs)
     """
-    db = SessionLocal()
-    execution = None
-    try:
-        server = db.query(PlexServer).filter(PlexServer.id == server_id).first()
-        if not server:
-            logger.error(f"Plex server {server_id} not found")
-            return "Server not found"
-
-        # Mark any stale running executions as interrupted
-        stale_executions = db.query(PlexScheduleExecution).filter(
-            PlexScheduleExecution.server_id == server_id,
-            PlexScheduleExecution.sync_type == "series",
-            PlexScheduleExecution.status == PlexExecutionStatus.RUNNING
-        ).all()
-        for stale in stale_executions:
-            stale.status = PlexExecutionStatus.INTERRUPTED
-            stale.completed_at = datetime.utcnow()
-            stale.error_message = "Interrupted by new sync"
-        if stale_executions:
-            db.commit()
-
-        # Get or create execution record
-        if execution_id:
-            execution = db.query(PlexScheduleExecution).filter(PlexScheduleExecution.id == execution_id).first()
-        else:
-            # Manual sync - create execution record
-            execution = PlexScheduleExecution(
-                server_id=server_id,
-                sync_type="series",
-                status=PlexExecutionStatus.RUNNING
-            )
-            db.add(execution)
-            db.commit()
-
-        account = db.query(PlexAccount).filter(PlexAccount.id == server.account_id).first()
-        if not account:
-            logger.error(f"Plex account for server {server_id} not found")
-            if execution:
-                execution.status = PlexExecutionStatus.FAILED
-                execution.error_message = "Account not found"
-                execution.completed_at = datetime.utcnow()
-                db.commit()
-            return "Account not found"
+    return _run_plex_sync(server_id, execution_id, "movies")
 
-        client = PlexClient(account.auth_token)
-        plex_server = client.connect_server(server.uri, server.access_token)
 
-        if not plex_server:
-            # Update sync state with error
-            sync_state = db.query(PlexSyncState).filter(
-                PlexSyncState.server_id == server_id,
-                PlexSyncState.type == "series"
-            ).first()
-            if sync_state:
-                sync_state.status = "failed"
-                sync_state.error_message = "Cannot connect to Plex server"
-                db.commit()
-            if execution:
-                execution.status = PlexExecutionStatus.FAILED
-                execution.error_message = "Cannot connect to Plex server"
-                execution.completed_at = datetime.utcnow()
-                db.commit()
-            return "Cannot connect to Plex server"
-
-        fm = FileManager(server.series_dir)
-
-        asyncio.run(process_plex_series(db, client, plex_server, fm, server_id))
-
-        # Refresh session to get updated sync_state values
-        db.expire_all()
-
-        # Update execution record on success
-        if execution:
-            execution.status = PlexExecutionStatus.SUCCESS
-            execution.completed_at = datetime.utcnow()
-            # Get items processed from sync state
-            sync_state = db.query(PlexSyncState).filter(
-                PlexSyncState.server_id == server_id,
-                PlexSyncState.type == "series"
-            ).first()
-            if sync_state:
-                execution.items_processed = (sync_state.items_added or 0) + (sync_state.items_deleted or 0)
-            db.commit()
-
-        return f"Plex series synced for {server.name}"
+@celery_app.task
+def sync_plex_series_task(server_id: int, execution_id: int = None):
+    """
+    Celery task to sync Plex series.
 
-    except Exception as e:
-        logger.exception(f"Error in sync_plex_series_task: {e}")
-        if execution:
-            execution.status = PlexExecutionStatus.FAILED
-            execution.error_message = str(e)
-            execution.completed_at = datetime.utcnow()
-            db.commit()
-        return f"Error: {str(e)}"
-    finally:
-        db.close()
+    @param server_id Database ID of the Plex server to sync
+    @param execution_id Optional execution record ID (for scheduled syncs)
+    """
+    return _run_plex_sync(server_id, execution_id, "series")
 
 
 @celery_app.task
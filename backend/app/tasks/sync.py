@@ -1,38 +1,67 @@
 import asyncio
 import os
-import shutil
 from app.core.celery_app import celery_app
+from app.core.event_loop import on_loop_shutdown, run_async
+from app.core.settings_cache import get_settings_cached
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
+from app.db.cache_writes import save_cache_mappings
 from app.models.subscription import Subscription
 from app.models.sync_state import SyncState, SyncStatus, SyncType
 from app.models.selection import SelectedCategory
 from app.models.cache import MovieCache, SeriesCache, EpisodeCache
 from app.models.schedule import Schedule, SyncType as ScheduleSyncType
 from app.models.schedule_execution import ScheduleExecution, ExecutionStatus
-from app.services.xtream import XtreamClient
+from app.services.xtream import CATEGORY_FETCH_CONCURRENCY, XtreamClient
 from app.services.file_manager import FileManager
 import logging
+from typing import Dict, Tuple
 from datetime import datetime
+from types import SimpleNamespace
 
 logger = logging.getLogger(__name__)
 
+CACHE_LOAD_BATCH_SIZE = 1000  # Cache rows fetched per round while diffing
+DELETE_BATCH_SIZE = 500  # Cache rows removed per DELETE ... IN statement
+DELETE_CONCURRENCY = 8  # Removed movie/series folders deleted at once (rmtree runs in a thread)
+MOVIE_WRITE_WORKERS = 32  # Movies having their files written at once, independent of the fetch parallelism
+EPISODE_WRITE_CONCURRENCY = 32  # Episode file writes in flight per series sync (each holds an open file)
+
+# (url, username, password) -> client; keyed on credentials so edited subscriptions get a fresh one
+_sync_clients: Dict[Tuple[str, str, str], XtreamClient] = {}
+
 
 def trigger_jellyfin_refresh(db: Session, library_type: str):
     """
-    Trigger Jellyfin library refresh if configured.
+    Queue a Jellyfin library refresh if enabled.
     library_type: "movies" or "series"
 
+    The HTTP call runs in refresh_jellyfin_task, so the sync finishes (and
+    releases its DB session) without waiting for Jellyfin.
     This function never raises exceptions - Jellyfin errors should not fail syncs.
     """
-    from app.models.settings import SettingsModel
     try:
-        settings = {s.key: s.value for s in db.query(SettingsModel).all()}
-
         # Check if Jellyfin integration is enabled
-        if settings.get("JELLYFIN_REFRESH_ENABLED") != "true":
+        if get_settings_cached(db).get("JELLYFIN_REFRESH_ENABLED") != "true":
             return
 
+        refresh_jellyfin_task.delay(library_type)
+    except Exception as e:
+        logger.error(f"Error queueing Jellyfin refresh for {library_type}: {e}")
+
+
+@celery_app.task(ignore_result=True)
+def refresh_jellyfin_task(library_type: str):
+    """
+    Refresh the Jellyfin library for library_type ("movies" or "series").
+
+    Never raises - a failed refresh is only logged.
+    """
+    db = SessionLocal()
+    try:
+        settings = get_settings_cached(db)
+
         url = settings.get("JELLYFIN_URL")
         token = settings.get("JELLYFIN_API_TOKEN")
 
@@ -60,14 +89,106 @@ def trigger_jellyfin_refresh(db: Session, library_type: str):
             logger.warning(f"Jellyfin {library_type} library refresh failed")
 
     except Exception as e:
-        # Never fail the sync due to Jellyfin issues
+        # Jellyfin issues are only logged
         logger.error(f"Error triggering Jellyfin refresh for {library_type}: {e}")
+    finally:
+        db.close()
+
+
+def _parallelism(settings: dict, key: str, default: int) -> int:
+    """Number of items a sync keeps in flight (and HTTP connections it opens)"""
+    try:
+        return max(1, int(settings.get(key, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _sync_client(db: Session, sub: Subscription, parallelism_key: str, default: int) -> XtreamClient:
+    """
+    XtreamClient whose connection pool matches the sync parallelism.
+
+    Clients are kept per worker process (the event loop is persistent, see
+    app.core.event_loop), so back-to-back syncs reuse open connections. A
+    client sized for another parallelism is closed and replaced.
+    """
+    parallelism = _parallelism(get_settings_cached(db), parallelism_key, default)
+    key = (sub.xtream_url, sub.username, sub.password)
+    xc = _sync_clients.get(key)
+    if xc is not None and xc.max_connections != parallelism:
+        run_async(xc.aclose())
+        xc = None
+    if xc is None:
+        xc = _sync_clients[key] = XtreamClient(
+            sub.xtream_url, sub.username, sub.password,
+            max_connections=parallelism, max_keepalive_connections=parallelism
+        )
+    return xc
+
+
+async def _close_sync_clients():
+    for xc in _sync_clients.values():
+        await xc.aclose()
+    _sync_clients.clear()
+
+
+on_loop_shutdown(_close_sync_clients)
+
+
+async def _run_pipelined(items, workers: int, process, on_results, batch_size: int,
+                         write=None, write_workers: int = 0):
+    """
+    Run `process` over `items` with `workers` calls in flight at all times.
+
+    A new item starts as soon as any call finishes (no waiting on the slowest
+    item of a chunk). Results are handed to `on_results` in batches of
+    `batch_size`, the last batch possibly shorter.
+
+    With `write`, each processed item goes through a bounded queue to
+    `write_workers` writer coroutines and `write`'s return value is the
+    result, so slow disk I/O does not hold one of the `workers` slots.
+    Neither callable may raise.
+    """
+    pending = iter(items)
+    results = []
+
+    def collect(result):
+        results.append(result)
+        if len(results) >= batch_size:
+            on_results(results[:])
+            results.clear()
+
+    if write is None:
+        async def worker():
+            for item in pending:
+                collect(await process(item))
+
+        await asyncio.gather(*[worker() for _ in range(max(1, workers))])
+    else:
+        write_workers = max(1, write_workers)
+        queue = asyncio.Queue(maxsize=2 * write_workers)
+        done = object()
+
+        async def fetcher():
+            for item in pending:
+                await queue.put(await process(item))
+
+        async def writer():
+            while (item := await queue.get()) is not done:
+                collect(await write(item))
+
+        writers = [asyncio.create_task(writer()) for _ in range(write_workers)]
+        await asyncio.gather(*[fetcher() for _ in range(max(1, workers))])
+        for _ in writers:
+            await queue.put(done)
+        await asyncio.gather(*writers)
+
+    if results:
+        on_results(results)
 
 
 async def process_movies(db: Session, xc: XtreamClient, fm: FileManager, subscription_id: int):
-    # Get settings
-    from app.models.settings import SettingsModel
-    settings = {s.key: s.value for s in db.query(SettingsModel).all()}
+    # Get settings (process-wide copy, shared with the task and the Jellyfin refresh)
+    settings = get_settings_cached(db)
     prefix_regex = settings.get("PREFIX_REGEX")
     format_date = settings.get("FORMAT_DATE_IN_TITLE") == "true"
     clean_name = settings.get("CLEAN_NAME") == "true"
@@ -88,161 +209,183 @@ async def process_movies(db: Session, xc: XtreamClient, fm: FileManager, subscri
     db.commit()
 
     try:
-        # Fetch Categories
-        categories = await xc.get_vod_categories()
-        cat_map = {c['category_id']: c['category_name'] for c in categories}
-
-        # Fetch All Movies
-        all_movies = await xc.get_vod_streams()
-
-        # Filter by selected categories if any
-        selected_cats = db.query(SelectedCategory).filter(
-            SelectedCategory.subscription_id == subscription_id,
-            SelectedCategory.type == "movie"
-        ).all()
-        
-        if selected_cats:
-            selected_ids = {s.category_id for s in selected_cats}
+        selected_ids = set(db.execute(
+            select(SelectedCategory.category_id).where(
+                SelectedCategory.subscription_id == subscription_id,
+                SelectedCategory.type == "movie"
+            )
+        ).scalars())
+
+        # Fetch Categories and Movies concurrently; with a selection, only the
+        # selected categories are requested (one request each, in parallel)
+        if selected_ids:
+            categories, all_movies = await asyncio.gather(
+                xc.get_vod_categories(), xc.get_vod_streams_for_categories(
+                    sorted(selected_ids), _parallelism(settings, "SYNC_CATEGORY_CONCURRENCY", CATEGORY_FETCH_CONCURRENCY)
+                )
+            )
             all_movies = [m for m in all_movies if m['category_id'] in selected_ids]
+        else:
+            categories, all_movies = await asyncio.gather(xc.get_vod_categories(), xc.get_vod_streams())
+        cat_map = {c['category_id']: c['category_name'] for c in categories}
         
-        # Current Cache
-        cached_movies = {m.stream_id: m for m in db.query(MovieCache).filter(MovieCache.subscription_id == subscription_id).all()}
-        
-        to_add_update = []
         to_delete = []
-        
-        current_ids = set()
-
-        for movie in all_movies:
-            stream_id = int(movie['stream_id'])
-            current_ids.add(stream_id)
-            
-            # Check if changed
-            cached = cached_movies.get(stream_id)
-            if not cached:
-                to_add_update.append(movie)
-            else:
-                if cached.name != movie['name'] or cached.container_extension != movie['container_extension']:
-                    to_add_update.append(movie)
-
-        # Detect deletions
-        for stream_id, cached in cached_movies.items():
-            if stream_id not in current_ids:
+        # Cache row id of each changed movie; new movies have none
+        update_ids = {}
+        # Changed movies whose detailed info is not fetched again -> cached TMDB id
+        strm_only = {}
+        cached_ids = set()
+
+        # Diff against the current cache while streaming it as plain rows, so
+        # only deleted and changed entries are kept
+        # Upstream ids are converted once, in listing order
+        stream_ids = [int(m['stream_id']) for m in all_movies]
+        current_movies = dict(zip(stream_ids, all_movies))
+        cache_rows = db.execute(
+            select(
+                MovieCache.id, MovieCache.stream_id, MovieCache.name, MovieCache.container_extension,
+                MovieCache.tmdb_id, MovieCache.category_id
+            ).where(MovieCache.subscription_id == subscription_id)
+            .execution_options(yield_per=CACHE_LOAD_BATCH_SIZE)
+        )
+        for cached in cache_rows:
+            movie = current_movies.get(cached.stream_id)
+            if movie is None:
                 to_delete.append(cached)
-
-        # Process Deletions
-        for movie in to_delete:
+                continue
+            cached_ids.add(cached.stream_id)
+            # Check if changed
+            if cached.name != movie['name'] or cached.container_extension != movie['container_extension']:
+                update_ids[cached.stream_id] = cached.id
+                if cached.name == movie['name'] and cached.tmdb_id:
+                    # Only the extension changed: same folder, new stream URL and NFO codec
+                    strm_only[cached.stream_id] = cached.tmdb_id
+        del current_movies
+
+        to_add_update = [
+            m for stream_id, m in zip(stream_ids, all_movies)
+            if stream_id not in cached_ids or stream_id in update_ids
+        ]
+        del stream_ids
+
+        # Process Deletions, several at once; emptied category dirs are removed afterwards
+        delete_limit = asyncio.Semaphore(DELETE_CONCURRENCY)
+
+        async def remove_movie(movie):
             cat_name = cat_map.get(movie.category_id, "Uncategorized")
             target_info = fm.get_movie_target_info(
                 {"name": movie.name, "tmdb": movie.tmdb_id}, 
                 cat_name, prefix_regex, format_date, clean_name, use_category_folders
             )
-            
-            # 1. New Structure removal
-            if os.path.exists(target_info["target_dir"]):
-                shutil.rmtree(target_info["target_dir"])
-            
-            # 2. Old Structure removal (fallback)
-            safe_name = fm.sanitize_name(movie.name)
-            old_path = f"{target_info['cat_dir']}/{safe_name}.strm"
-            old_nfo = f"{target_info['cat_dir']}/{safe_name}.nfo"
-            await fm.delete_file(old_path)
-            await fm.delete_file(old_nfo)
-
-            await fm.delete_directory_if_empty(target_info['cat_dir'])
-            
-            db.delete(movie)
+            async with delete_limit:
+                # 1. New Structure removal (movies without TMDB id have no folder of their own)
+                if target_info["target_dir"] not in (target_info["cat_dir"], fm.output_dir):
+                    await fm.delete_tree(target_info["target_dir"])
+
+                # 2. Old Structure removal (fallback)
+                safe_name = fm.sanitize_name(movie.name)
+                old_path = f"{target_info['cat_dir']}/{safe_name}.strm"
+                old_nfo = f"{target_info['cat_dir']}/{safe_name}.nfo"
+                await fm.delete_file(old_path)
+                await fm.delete_file(old_nfo)
+            return target_info['cat_dir']
+
+        for cat_dir in set(await asyncio.gather(*[remove_movie(m) for m in to_delete])):
+            await fm.delete_directory_if_empty(cat_dir)
+
+        delete_ids = [m.id for m in to_delete]
+        for i in range(0, len(delete_ids), DELETE_BATCH_SIZE):
+            db.query(MovieCache).filter(
+                MovieCache.id.in_(delete_ids[i:i + DELETE_BATCH_SIZE])
+            ).delete(synchronize_session=False)
         
         # Process Additions/Updates with Parallel Fetching
-        try:
-            parallelism = int(settings.get("SYNC_PARALLELISM_MOVIES", "10"))
-        except ValueError:
-            parallelism = 10
-            
-        batch_size = parallelism
-        semaphore = asyncio.Semaphore(batch_size)
-
-        async def process_single_movie(movie):
-            async with semaphore:
-                try:
-                    stream_id = int(movie['stream_id'])
-                    name = movie['name']
-                    ext = movie['container_extension']
-                    cat_id = movie['category_id']
-                    tmdb_id = movie.get('tmdb')
-
-                    # Fetch detailed info for Metadata
-                    try:
-                        detailed_info = await xc.get_vod_info(str(stream_id))
-                        if detailed_info and 'info' in detailed_info:
-                            movie['info'] = detailed_info['info'] # Inject info for NFO generator
-                            # Update TMDB if found
-                            if detailed_info['info'].get('tmdb_id'):
-                                tmdb_id = detailed_info['info'].get('tmdb_id')
-                                movie['tmdb'] = tmdb_id # Update for object
-                    except Exception as e:
-                        # logger.warning(f"Failed to fetch info for movie {stream_id}: {e}")
-                        pass
-
-                    cat_name = cat_map.get(cat_id, "Uncategorized")
-                    target_info = fm.get_movie_target_info(movie, cat_name, prefix_regex, format_date, clean_name, use_category_folders)
-                    
-                    fm.ensure_directory(target_info["cat_dir"])
-                    if target_info["target_dir"] != target_info["cat_dir"]:
-                        fm.ensure_directory(target_info["target_dir"])
+        parallelism = _parallelism(settings, "SYNC_PARALLELISM_MOVIES", 10)
+
+
+        async def fetch_movie_info(movie):
+            cached_tmdb_id = strm_only.get(int(movie['stream_id']))
+            if cached_tmdb_id:
+                movie['tmdb'] = cached_tmdb_id # Same folder as before, no info request
+                return movie
+
+            # Fetch detailed info for Metadata
+            try:
+                detailed_info = await xc.get_vod_info(str(movie['stream_id']))
+                if detailed_info and 'info' in detailed_info:
+                    movie['info'] = detailed_info['info'] # Inject info for NFO generator
+                    # Update TMDB if found
+                    if detailed_info['info'].get('tmdb_id'):
+                        movie['tmdb'] = detailed_info['info'].get('tmdb_id') # Update for object
+            except Exception as e:
+                # logger.warning(f"Failed to fetch info for movie {movie.get('stream_id')}: {e}")
+                pass
+            return movie
+
+        async def write_single_movie(movie):
+            try:
+                stream_id = int(movie['stream_id'])
+                name = movie['name']
+                ext = movie['container_extension']
+                cat_id = movie['category_id']
+                tmdb_id = movie.get('tmdb')
+
+                cat_name = cat_map.get(cat_id, "Uncategorized")
+                target_info, nfo_content = fm.prepare_movie(movie, cat_name, prefix_regex, format_date, clean_name, use_category_folders)
                     
-                    strm_path = os.path.join(target_info["target_dir"], f"{target_info['filename_base']}.strm")
-                    nfo_path = os.path.join(target_info["target_dir"], f"{target_info['filename_base']}.nfo")
+                await fm.ensure_directory_async(target_info["cat_dir"])
+                if target_info["target_dir"] != target_info["cat_dir"]:
+                    await fm.ensure_directory_async(target_info["target_dir"])
                     
-                    url = xc.get_stream_url("movie", str(stream_id), ext)
+                strm_path = os.path.join(target_info["target_dir"], f"{target_info['filename_base']}.strm")
+                nfo_path = os.path.join(target_info["target_dir"], f"{target_info['filename_base']}.nfo")
                     
-                    await fm.write_strm(strm_path, url)
+                url = xc.get_stream_url("movie", str(stream_id), ext)
                     
-                    nfo_content = fm.generate_movie_nfo(movie, prefix_regex, format_date, clean_name)
+                await fm.write_strm(strm_path, url)
+                # Extension-only changes skip the info request, so the NFO they would generate
+                # lacks the info-derived fields: patch the codec of the existing one instead
+                if stream_id not in strm_only or await fm.update_nfo_video_codec(nfo_path, ext) is None:
                     await fm.write_nfo(nfo_path, nfo_content)
 
-                    # Update Cache
-                    # We need to lock DB access or handle it after gather?
-                    # Ideally accumulate results and bulk update, but for safety lets return data
-                    return {
-                        'action': 'update_cache',
-                        'data': {
-                            'stream_id': stream_id,
-                            'name': name,
-                            'category_id': cat_id,
-                            'container_extension': ext,
-                            'tmdb_id': str(tmdb_id) if tmdb_id else None
-                        }
+                # Update Cache
+                # We need to lock DB access or handle it after gather?
+                # Ideally accumulate results and bulk update, but for safety lets return data
+                return {
+                    'action': 'update_cache',
+                    'data': {
+                        'stream_id': stream_id,
+                        'name': name,
+                        'category_id': cat_id,
+                        'container_extension': ext,
+                        'tmdb_id': str(tmdb_id) if tmdb_id else None
                     }
+                }
 
-                except Exception as e:
-                    logger.error(f"Error processing movie {movie.get('name')}: {e}")
-                    return None
+            except Exception as e:
+                logger.error(f"Error processing movie {movie.get('name')}: {e}")
+                return None
 
-        # Execute in chunks to avoid memory explosion if list is huge
-        # But for 10 concurrent, direct gather is fine usually.
-        # Let's process in batches of 50 to update DB incrementally
-        total_processed = 0
-        chunk_size = 50
-        
-        for i in range(0, len(to_add_update), chunk_size):
-            chunk = to_add_update[i:i + chunk_size]
-            results = await asyncio.gather(*[process_single_movie(m) for m in chunk])
-            
+        def save_results(results):
+            inserts, updates = {}, {}
             for res in results:
                 if res and res['action'] == 'update_cache':
                     d = res['data']
-                    cached = cached_movies.get(d['stream_id'])
-                    if not cached:
-                        cached = MovieCache(subscription_id=subscription_id, stream_id=d['stream_id'])
-                        db.add(cached)
-                    
-                    cached.name = d['name']
-                    cached.category_id = d['category_id']
-                    cached.container_extension = d['container_extension']
-                    cached.tmdb_id = d['tmdb_id']
-            
-            db.commit() # Commit every chunk
+                    cache_id = update_ids.get(d['stream_id'])
+                    if cache_id is None:
+                        inserts[d['stream_id']] = {'subscription_id': subscription_id, **d}
+                    else:
+                        updates[d['stream_id']] = {'id': cache_id, **d}
+
+            save_cache_mappings(db, MovieCache, inserts, updates)
+            db.commit() # Commit every batch
+
+        # Keep `parallelism` info requests in flight; files are written by a separate
+        # pool so a slot is free again as soon as its request returns
+        await _run_pipelined(
+            to_add_update, parallelism, fetch_movie_info, save_results, 50,
+            write=write_single_movie, write_workers=MOVIE_WRITE_WORKERS
+        )
 
         sync_state.items_added = len(to_add_update)
         sync_state.items_deleted = len(to_delete)
@@ -260,10 +403,8 @@ async def process_movies(db: Session, xc: XtreamClient, fm: FileManager, subscri
         raise
 
 async def process_series(db: Session, xc: XtreamClient, fm: FileManager, subscription_id: int):
-    # Get settings
-    from app.models.settings import SettingsModel
-    settings_rows = db.query(SettingsModel).all()
-    settings = {s.key: s.value for s in settings_rows}
+    # Get settings (process-wide copy, shared with the task and the Jellyfin refresh)
+    settings = get_settings_cached(db)
 
     prefix_regex = settings.get("PREFIX_REGEX")
     format_date = settings.get("FORMAT_DATE_IN_TITLE") == "true"
@@ -288,29 +429,49 @@ async def process_series(db: Session, xc: XtreamClient, fm: FileManager, subscri
     db.commit()
 
     try:
-        categories = await xc.get_series_categories()
-        cat_map = {c['category_id']: c['category_name'] for c in categories}
-
-        all_series = await xc.get_series()
-
-        # Filter by selected categories if any
-        selected_cats = db.query(SelectedCategory).filter(
-            SelectedCategory.subscription_id == subscription_id,
-            SelectedCategory.type == "series"
-        ).all()
-
-        if selected_cats:
-            selected_ids = {s.category_id for s in selected_cats}
+        selected_ids = set(db.execute(
+            select(SelectedCategory.category_id).where(
+                SelectedCategory.subscription_id == subscription_id,
+                SelectedCategory.type == "series"
+            )
+        ).scalars())
+
+        # With a selection, only the selected categories are requested (in parallel)
+        if selected_ids:
+            categories, all_series = await asyncio.gather(
+                xc.get_series_categories(), xc.get_series_for_categories(
+                    sorted(selected_ids), _parallelism(settings, "SYNC_CATEGORY_CONCURRENCY", CATEGORY_FETCH_CONCURRENCY)
+                )
+            )
             all_series = [s for s in all_series if s['category_id'] in selected_ids]
+        else:
+            categories, all_series = await asyncio.gather(xc.get_series_categories(), xc.get_series())
+        cat_map = {c['category_id']: c['category_name'] for c in categories}
 
-        cached_series = {s.series_id: s for s in db.query(SeriesCache).filter(SeriesCache.subscription_id == subscription_id).all()}
+        cached_series = {
+            s.series_id: s for s in db.execute(
+                select(
+                    SeriesCache.id, SeriesCache.series_id, SeriesCache.name,
+                    SeriesCache.category_id, SeriesCache.tmdb_id
+                ).where(SeriesCache.subscription_id == subscription_id)
+                .execution_options(yield_per=CACHE_LOAD_BATCH_SIZE)
+            )
+        }
 
         # Load episode cache for this subscription
-        # Key: (series_id, episode_id) -> EpisodeCache
-        all_cached_episodes = db.query(EpisodeCache).filter(
-            EpisodeCache.subscription_id == subscription_id
-        ).all()
-        cached_episodes = {(e.series_id, e.episode_id): e for e in all_cached_episodes}
+        # Key: (series_id, episode_id) -> row
+        cached_episodes = {
+            (e.series_id, e.episode_id): e for e in db.execute(
+                select(
+                    EpisodeCache.id, EpisodeCache.series_id, EpisodeCache.episode_id,
+                    EpisodeCache.season_num, EpisodeCache.episode_num,
+                    EpisodeCache.title, EpisodeCache.container_extension
+                ).where(EpisodeCache.subscription_id == subscription_id)
+                .execution_options(yield_per=CACHE_LOAD_BATCH_SIZE)
+            )
+        }
+        # Series inserted during this run, so a repeat in the listing is not inserted twice
+        new_series_ids = set()
 
         to_delete = []
         current_ids = set()
@@ -323,186 +484,189 @@ async def process_series(db: Session, xc: XtreamClient, fm: FileManager, subscri
             if series_id not in current_ids:
                 to_delete.append(cached)
 
-        # Deletions
-        for series in to_delete:
+        # Deletions, several at once; emptied category dirs are removed afterwards
+        delete_limit = asyncio.Semaphore(DELETE_CONCURRENCY)
+
+        async def remove_series(series):
             cat_name = cat_map.get(series.category_id, "Uncategorized")
             target_info = fm.get_series_target_info(
                 {"name": series.name, "tmdb": series.tmdb_id},
                 cat_name, prefix_regex, format_date, clean_name, use_category_folders
             )
-
-            if os.path.exists(target_info["series_dir"]):
-                shutil.rmtree(target_info["series_dir"])
-
-            await fm.delete_directory_if_empty(target_info["cat_dir"])
-
-            # Delete episode cache for this series
+            async with delete_limit:
+                await fm.delete_tree(target_info["series_dir"])
+            return target_info["cat_dir"]
+
+        for cat_dir in set(await asyncio.gather(*[remove_series(s) for s in to_delete])):
+            await fm.delete_directory_if_empty(cat_dir)
+
+        # Delete the series rows, with their episode cache
+        for i in range(0, len(to_delete), DELETE_BATCH_SIZE):
+            chunk = to_delete[i:i + DELETE_BATCH_SIZE]
+            db.query(SeriesCache).filter(
+                SeriesCache.id.in_([s.id for s in chunk])
+            ).delete(synchronize_session=False)
             db.query(EpisodeCache).filter(
                 EpisodeCache.subscription_id == subscription_id,
-                EpisodeCache.series_id == series.series_id
-            ).delete()
-
-            db.delete(series)
+                EpisodeCache.series_id.in_([s.series_id for s in chunk])
+            ).delete(synchronize_session=False)
 
         db.commit()
 
         # Process ALL selected series (not just new/changed)
         # Episode cache will prevent unnecessary file writes
-        try:
-            parallelism = int(settings.get("SYNC_PARALLELISM_SERIES", "5"))
-        except ValueError:
-            parallelism = 5
-
-        batch_size = parallelism
-        semaphore = asyncio.Semaphore(batch_size)
+        parallelism = _parallelism(settings, "SYNC_PARALLELISM_SERIES", 5)
 
         # Track statistics
         total_episodes_added = 0
         total_episodes_skipped = 0
 
+        write_limit = asyncio.Semaphore(EPISODE_WRITE_CONCURRENCY)
+
+        async def limited_write(write, path, content):
+            async with write_limit:
+                await write(path, content)
+
         async def process_single_series(series):
             nonlocal total_episodes_added, total_episodes_skipped
-            async with semaphore:
-                try:
-                    series_id = int(series['series_id'])
-                    name = series['name']
-                    cat_id = series['category_id']
-                    tmdb_id = series.get('tmdb')
+            try:
+                series_id = int(series['series_id'])
+                name = series['name']
+                cat_id = series['category_id']
+                tmdb_id = series.get('tmdb')
+
+                # Fetch Episodes and Info
+                info_response = await xc.get_series_info(str(series_id))
+                series_info = info_response.get('info', {})
+                episodes_data = info_response.get('episodes', {})
+
+                if isinstance(episodes_data, list):
+                    episodes_data = {}
+
+                if series_info.get('tmdb_id'):
+                     tmdb_id = series_info.get('tmdb_id')
+                     series['tmdb'] = tmdb_id # For NFO
 
-                    # Fetch Episodes and Info
-                    info_response = await xc.get_series_info(str(series_id))
-                    series_info = info_response.get('info', {})
-                    episodes_data = info_response.get('episodes', {})
+                cat_name = cat_map.get(cat_id, "Uncategorized")
+                target_info, show_nfo_content = fm.prepare_series(series, cat_name, prefix_regex, format_date, clean_name, use_category_folders)
 
-                    if isinstance(episodes_data, list):
-                        episodes_data = {}
+                if use_category_folders:
+                    await fm.ensure_directory_async(target_info["cat_dir"])
 
-                    if series_info.get('tmdb_id'):
-                         tmdb_id = series_info.get('tmdb_id')
-                         series['tmdb'] = tmdb_id # For NFO
+                series_dir = target_info["series_dir"]
+                await fm.ensure_directory_async(series_dir)
 
-                    cat_name = cat_map.get(cat_id, "Uncategorized")
-                    target_info = fm.get_series_target_info(series, cat_name, prefix_regex, format_date, clean_name, use_category_folders)
+                # Create tvshow.nfo (will be skipped if unchanged)
+                nfo_path = f"{series_dir}/tvshow.nfo"
+                await fm.write_nfo(nfo_path, show_nfo_content)
 
-                    if use_category_folders:
-                        fm.ensure_directory(target_info["cat_dir"])
+                episodes_to_cache = []
+                # Episode files are written together once all episodes are named, so their I/O overlaps
+                writes = []
 
-                    series_dir = target_info["series_dir"]
-                    fm.ensure_directory(series_dir)
+                name_prefix = f"{target_info['safe_series_name']} - " if include_series_name else ""
 
-                    # Create tvshow.nfo (will be skipped if unchanged)
-                    nfo_path = f"{series_dir}/tvshow.nfo"
-                    await fm.write_nfo(nfo_path, fm.generate_show_nfo(series, prefix_regex, format_date, clean_name))
+                for season_key, episodes in episodes_data.items():
+                    season_num = int(season_key)
 
-                    episodes_to_cache = []
+                    # SEASON FOLDERS LOGIC
+                    if use_season_folders:
+                        season_dir_name = f"Season {season_num:02d}"
+                        current_dir = f"{series_dir}/{season_dir_name}"
+                    else:
+                        current_dir = series_dir
 
-                    for season_key, episodes in episodes_data.items():
-                        season_num = int(season_key)
+                    await fm.ensure_directory_async(current_dir)
+                    # Episode paths of this season up to the episode number, e.g. ".../Show - S01E"
+                    season_prefix = f"{current_dir}/{name_prefix}S{season_num:02d}E"
 
-                        # SEASON FOLDERS LOGIC
-                        if use_season_folders:
-                            season_dir_name = f"Season {season_num:02d}"
-                            current_dir = f"{series_dir}/{season_dir_name}"
+                    for ep in episodes:
+                        ep_num = int(ep['episode_num'])
+                        ep_id = int(ep['id'])
+                        container = ep['container_extension']
+                        title = ep.get('title', '')
+
+                        # Check episode cache - skip if unchanged
+                        cache_key = (series_id, ep_id)
+                        cached_ep = cached_episodes.get(cache_key)
+
+                        if cached_ep:
+                            # Episode exists in cache - check if changed
+                            if (cached_ep.title == title and
+                                cached_ep.container_extension == container and
+                                cached_ep.season_num == season_num and
+                                cached_ep.episode_num == ep_num):
+                                # Episode unchanged, skip
+                                total_episodes_skipped += 1
+                                continue
+
+                        # New or changed episode - process it
+                        total_episodes_added += 1
+
+                        safe_ep_title = ""
+
+                        if title:
+                            # Remove extension if present in title
+                            if title.lower().endswith(f".{container}"):
+                                title = title[:-len(container)-1]
+
+                            safe_ep_title = fm.sanitize_name(title)
+
+                        if safe_ep_title:
+                             path_base = f"{season_prefix}{ep_num:02d} - {safe_ep_title}"
                         else:
-                            current_dir = series_dir
-
-                        fm.ensure_directory(current_dir)
-
-                        for ep in episodes:
-                            ep_num = int(ep['episode_num'])
-                            ep_id = int(ep['id'])
-                            container = ep['container_extension']
-                            title = ep.get('title', '')
-
-                            # Check episode cache - skip if unchanged
-                            cache_key = (series_id, ep_id)
-                            cached_ep = cached_episodes.get(cache_key)
-
-                            if cached_ep:
-                                # Episode exists in cache - check if changed
-                                if (cached_ep.title == title and
-                                    cached_ep.container_extension == container and
-                                    cached_ep.season_num == season_num and
-                                    cached_ep.episode_num == ep_num):
-                                    # Episode unchanged, skip
-                                    total_episodes_skipped += 1
-                                    continue
-
-                            # New or changed episode - process it
-                            total_episodes_added += 1
-
-                            formatted_ep = f"S{season_num:02d}E{ep_num:02d}"
-                            safe_ep_title = ""
-
-                            if title:
-                                # Remove extension if present in title
-                                if title.lower().endswith(f".{container}"):
-                                    title = title[:-len(container)-1]
-
-                                safe_ep_title = fm.sanitize_name(title)
-
-                            if include_series_name:
-                                 filename_base = f"{target_info['safe_series_name']} - {formatted_ep}"
-                            else:
-                                 filename_base = formatted_ep
-
-                            if safe_ep_title:
-                                 filename = f"{filename_base} - {safe_ep_title}"
-                            else:
-                                 filename = filename_base
-
-                            strm_path = f"{current_dir}/{filename}.strm"
-                            url = xc.get_stream_url("series", str(ep_id), container)
-                            await fm.write_strm(strm_path, url)
-
-                            # Episode NFO
-                            ep_nfo_path = f"{current_dir}/{filename}.nfo"
-                            ep_nfo_content = fm.generate_episode_nfo(ep, name, season_num, ep_num)
-                            await fm.write_nfo(ep_nfo_path, ep_nfo_content)
-
-                            # Queue episode for cache update
-                            episodes_to_cache.append({
-                                'episode_id': ep_id,
-                                'season_num': season_num,
-                                'episode_num': ep_num,
-                                'title': ep.get('title', ''),
-                                'container_extension': container
-                            })
-
-                    return {
-                        'action': 'update_cache',
-                        'data': {
-                            'series_id': series_id,
-                            'name': name,
-                            'category_id': cat_id,
-                            'tmdb_id': str(tmdb_id) if tmdb_id else None,
-                            'episodes': episodes_to_cache
-                        }
+                             path_base = f"{season_prefix}{ep_num:02d}"
+
+                        strm_path = path_base + ".strm"
+                        url = xc.get_stream_url("series", str(ep_id), container)
+                        writes.append((fm.write_strm, strm_path, url))
+
+                        # Episode NFO
+                        ep_nfo_path = path_base + ".nfo"
+                        ep_nfo_content = fm.generate_episode_nfo(ep, name, season_num, ep_num)
+                        writes.append((fm.write_nfo, ep_nfo_path, ep_nfo_content))
+
+                        # Queue episode for cache update
+                        episodes_to_cache.append({
+                            'episode_id': ep_id,
+                            'season_num': season_num,
+                            'episode_num': ep_num,
+                            'title': ep.get('title', ''),
+                            'container_extension': container
+                        })
+
+                await asyncio.gather(*(limited_write(*w) for w in writes))
+
+                return {
+                    'action': 'update_cache',
+                    'data': {
+                        'series_id': series_id,
+                        'name': name,
+                        'category_id': cat_id,
+                        'tmdb_id': str(tmdb_id) if tmdb_id else None,
+                        'episodes': episodes_to_cache
                     }
-                except Exception as e:
-                     logger.error(f"Error processing series {series.get('name')}: {e}")
-                     return None
-
-        chunk_size = 20
-        for i in range(0, len(all_series), chunk_size):
-            chunk = all_series[i:i + chunk_size]
-            results = await asyncio.gather(*[process_single_series(s) for s in chunk])
+                }
+            except Exception as e:
+                 logger.error(f"Error processing series {series.get('name')}: {e}")
+                 return None
 
+        def save_results(results):
+            series_inserts, series_updates = {}, {}
+            episode_inserts, episode_updates = {}, {}
             for res in results:
                 if res and res['action'] == 'update_cache':
                     d = res['data']
                     series_id = d['series_id']
+                    row = {'name': d['name'], 'category_id': d['category_id'], 'tmdb_id': d['tmdb_id']}
 
-                    # Update series cache
+                    # Update series cache (existing rows only when a field changed)
                     cached = cached_series.get(series_id)
                     if not cached:
-                        cached = SeriesCache(subscription_id=subscription_id, series_id=series_id)
-                        db.add(cached)
-                        cached_series[series_id] = cached
-
-                    cached.name = d['name']
-                    cached.category_id = d['category_id']
-                    cached.tmdb_id = d['tmdb_id']
+                        if series_id not in new_series_ids:
+                            series_inserts[series_id] = {'subscription_id': subscription_id, 'series_id': series_id, **row}
+                    elif (cached.name, cached.category_id, cached.tmdb_id) != (d['name'], d['category_id'], d['tmdb_id']):
+                        series_updates[series_id] = {'id': cached.id, **row}
 
                     # Update episode cache for new/changed episodes
                     for ep_data in d.get('episodes', []):
@@ -510,21 +674,23 @@ async def process_series(db: Session, xc: XtreamClient, fm: FileManager, subscri
                         cached_ep = cached_episodes.get(cache_key)
 
                         if not cached_ep:
-                            cached_ep = EpisodeCache(
-                                subscription_id=subscription_id,
-                                series_id=series_id,
-                                episode_id=ep_data['episode_id']
-                            )
-                            db.add(cached_ep)
-                            cached_episodes[cache_key] = cached_ep
-
-                        cached_ep.season_num = ep_data['season_num']
-                        cached_ep.episode_num = ep_data['episode_num']
-                        cached_ep.title = ep_data['title']
-                        cached_ep.container_extension = ep_data['container_extension']
-
+                            episode_inserts[cache_key] = {
+                                'subscription_id': subscription_id, 'series_id': series_id, **ep_data
+                            }
+                        elif cached_ep.id is not None:
+                            episode_updates[cache_key] = {'id': cached_ep.id, **ep_data}
+
+            # Rows inserted below have no id here; a repeat of the series in the
+            # listing skips them as unchanged (or keeps the first version)
+            new_series_ids.update(series_inserts)
+            for cache_key, ep_row in episode_inserts.items():
+                cached_episodes[cache_key] = SimpleNamespace(id=None, **ep_row)
+            save_cache_mappings(db, SeriesCache, series_inserts, series_updates)
+            save_cache_mappings(db, EpisodeCache, episode_inserts, episode_updates)
             db.commit()
 
+        await _run_pipelined(all_series, parallelism, process_single_series, save_results, 20)
+
         logger.info(f"Series sync: {total_episodes_added} episodes added/updated, {total_episodes_skipped} skipped (unchanged)")
 
         sync_state.items_added = total_episodes_added
@@ -582,10 +748,10 @@ def sync_movies_task(subscription_id: int, execution_id: int = None):
             db.add(execution)
             db.commit()
 
-        xc = XtreamClient(sub.xtream_url, sub.username, sub.password)
+        xc = _sync_client(db, sub, "SYNC_PARALLELISM_MOVIES", 10)
         fm = FileManager(sub.movies_dir)
 
-        asyncio.run(process_movies(db, xc, fm, subscription_id))
+        run_async(process_movies(db, xc, fm, subscription_id))
 
         # Refresh session to get updated sync_state values
         db.expire_all()
@@ -655,10 +821,10 @@ def sync_series_task(subscription_id: int, execution_id: int = None):
             db.add(execution)
             db.commit()
 
-        xc = XtreamClient(sub.xtream_url, sub.username, sub.password)
+        xc = _sync_client(db, sub, "SYNC_PARALLELISM_SERIES", 5)
         fm = FileManager(sub.series_dir)
 
-        asyncio.run(process_series(db, xc, fm, subscription_id))
+        run_async(process_series(db, xc, fm, subscription_id))
 
         # Refresh session to get updated sync_state values
         db.expire_all()
@@ -3,7 +3,10 @@ import sqlite3
 import os
 
 start_dir = "/home/mba/Desktop/xtream_to_strm_web"
+# Dependency/VCS trees never hold the app database and dominate the walk
+skip_dirs = {".git", "node_modules", "venv", ".venv", "__pycache__", "dist", "build"}
 for root, dirs, files in os.walk(start_dir):
+    dirs[:] = [d for d in dirs if d not in skip_dirs]
     for file in files:
         if file.endswith(".db"):
             db_path = os.path.join(root, file)
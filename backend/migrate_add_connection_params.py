@@ -2,61 +2,79 @@
 Migration script to add connection parameters to download_settings_global table
 Run this inside the Docker container with: python migrate_add_connection_params.py
 """
+import logging
 import sqlite3
 import sys
+from app.db.sqlite_pragmas import rw_connect, setup_script_logging
+
+setup_script_logging()
+logger = logging.getLogger(__name__)
 
 DB_PATH = "/db/xtream.db"
 
-def main():
-    print("🔄 Applying migration: Add connection parameters...")
-    print(f"Database: {DB_PATH}")
-    
+def apply(db_path: str = DB_PATH):
+    """Add the columns in one IMMEDIATE transaction, taking the write lock before the first statement"""
+    conn = rw_connect(db_path)
     try:
-        conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        existing = {row[1] for row in cursor.execute("PRAGMA table_info(download_settings_global)")}
         
         # Add max_redirects column
-        print("  Adding column: max_redirects...")
-        cursor.execute("""
-            ALTER TABLE download_settings_global 
-            ADD COLUMN max_redirects INTEGER DEFAULT 10
-        """)
+        if "max_redirects" in existing:
+            logger.info("  Column max_redirects already exists, skipping.")
+        else:
+            logger.info("  Adding column: max_redirects...")
+            cursor.execute("""
+                ALTER TABLE download_settings_global 
+                ADD COLUMN max_redirects INTEGER DEFAULT 10
+            """)
         
         # Add connection_timeout_seconds column
-        print("  Adding column: connection_timeout_seconds...")
-        cursor.execute("""
-            ALTER TABLE download_settings_global 
-            ADD COLUMN connection_timeout_seconds INTEGER DEFAULT 30
-        """)
+        if "connection_timeout_seconds" in existing:
+            logger.info("  Column connection_timeout_seconds already exists, skipping.")
+        else:
+            logger.info("  Adding column: connection_timeout_seconds...")
+            cursor.execute("""
+                ALTER TABLE download_settings_global 
+                ADD COLUMN connection_timeout_seconds INTEGER DEFAULT 30
+            """)
         
         # Update existing rows
-        print("  Updating existing rows with default values...")
+        logger.info("  Updating existing rows with default values...")
         cursor.execute("""
             UPDATE download_settings_global 
             SET max_redirects = 10, connection_timeout_seconds = 30
             WHERE max_redirects IS NULL OR connection_timeout_seconds IS NULL
         """)
         
-        conn.commit()
+        cursor.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
         conn.close()
+
+def main():
+    logger.info("🔄 Applying migration: Add connection parameters...")
+    logger.info(f"Database: {DB_PATH}")
+    
+    try:
+        apply()
         
-        print("✅ Migration applied successfully!")
-        print("")
-        print("New columns added:")
-        print("  - max_redirects (INTEGER, default: 10)")
-        print("  - connection_timeout_seconds (INTEGER, default: 30)")
+        logger.info("✅ Migration applied successfully!")
+        logger.info("New columns added:")
+        logger.info("  - max_redirects (INTEGER, default: 10)")
+        logger.info("  - connection_timeout_seconds (INTEGER, default: 30)")
         
         return 0
         
     except sqlite3.OperationalError as e:
-        if "duplicate column name" in str(e).lower():
-            print("⚠️  Columns already exist, skipping migration.")
-            return 0
-        else:
-            print(f"❌ Migration failed: {e}")
-            return 1
+        logger.error(f"❌ Migration failed: {e}")
+        return 1
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        logger.error(f"❌ Unexpected error: {e}")
         return 1
 
 if __name__ == "__main__":
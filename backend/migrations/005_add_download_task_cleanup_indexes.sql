@@ -0,0 +1,5 @@
+-- Composite indexes for the retention cleanup of finished download tasks
+-- cleanup_old_tasks filters on status plus completed_at (completed) or created_at (failed)
+
+CREATE INDEX IF NOT EXISTS ix_download_tasks_status_completed_at ON download_tasks(status, completed_at);
+CREATE INDEX IF NOT EXISTS ix_download_tasks_status_created_at ON download_tasks(status, created_at);
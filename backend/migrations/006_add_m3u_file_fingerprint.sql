@@ -0,0 +1,6 @@
+-- Fingerprint of the last parsed file for FILE M3U sources
+-- m3u_size/m3u_mtime_ns let unchanged files skip the rehash entirely
+
+ALTER TABLE m3u_sources ADD COLUMN m3u_hash VARCHAR;
+ALTER TABLE m3u_sources ADD COLUMN m3u_size BIGINT;
+ALTER TABLE m3u_sources ADD COLUMN m3u_mtime_ns BIGINT;
@@ -0,0 +1,4 @@
+-- Digest of the STRM path, URL and NFO content last written for an M3U entry
+-- lets file generation skip reading back files whose content has not changed
+
+ALTER TABLE m3u_entries ADD COLUMN generated_fingerprint VARCHAR;
@@ -0,0 +1,4 @@
+-- Digest of the tvshow.nfo last written for a Plex show
+-- lets series syncs skip reading back and rewriting unchanged show NFOs
+
+ALTER TABLE plex_series_cache ADD COLUMN content_hash VARCHAR;
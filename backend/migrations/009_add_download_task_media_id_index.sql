@@ -0,0 +1,4 @@
+-- Composite index for looking up download tasks by upstream media id
+-- the reset scripts match media_id IN (...) plus a status filter
+
+CREATE INDEX IF NOT EXISTS ix_download_tasks_media_id_status ON download_tasks(media_id, status);
@@ -0,0 +1,22 @@
+-- Trigram full-text index over download_tasks.title (external content, kept in sync by triggers)
+-- lets the substring search of the download list match without scanning the table
+
+CREATE VIRTUAL TABLE IF NOT EXISTS download_tasks_fts USING fts5(title, content='download_tasks', content_rowid='id', tokenize='trigram');
+
+CREATE TRIGGER IF NOT EXISTS download_tasks_fts_ai AFTER INSERT ON download_tasks BEGIN
+    INSERT INTO download_tasks_fts(rowid, title) VALUES (new.id, new.title);
+END;
+
+CREATE TRIGGER IF NOT EXISTS download_tasks_fts_ad AFTER DELETE ON download_tasks BEGIN
+    INSERT INTO download_tasks_fts(download_tasks_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+
+-- Only title changes touch the index, not the frequent progress/status updates
+CREATE TRIGGER IF NOT EXISTS download_tasks_fts_au AFTER UPDATE OF title ON download_tasks BEGIN
+    INSERT INTO download_tasks_fts(download_tasks_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO download_tasks_fts(rowid, title) VALUES (new.id, new.title);
+END;
+
+-- Index the existing rows once, when the index is still empty
+INSERT INTO download_tasks_fts(download_tasks_fts)
+SELECT 'rebuild' WHERE NOT EXISTS (SELECT 1 FROM download_tasks_fts_docsize);
@@ -1,7 +1,10 @@
+import functools
 import sqlite3
 import os
+import re
 import sys
 import logging
+from typing import Optional, Tuple
 
 # Configure logging to stdout so it appears in docker logs
 logging.basicConfig(
@@ -11,7 +14,104 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Same connection settings as app/db/sqlite_pragmas.py (this script runs
+# standalone, without the app package): WAL persists on the database file,
+# and synchronous=NORMAL spares an fsync per committed migration
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+
+# SQLite has no ADD COLUMN IF NOT EXISTS; these statements are dropped from a
+# script when the column (or the whole table) is not there to alter
+ADD_COLUMN_RE = re.compile(r'ALTER\s+TABLE\s+"?(\w+)"?\s+ADD\s+(?:COLUMN\s+)?"?(\w+)"?[^;]*;', re.IGNORECASE)
+
+
+# Primary result codes meaning the database itself is unusable (I/O error, disk
+# full, corruption, ...): applying the remaining scripts cannot succeed
+FATAL_SQLITE_CODES = {
+    sqlite3.SQLITE_IOERR, sqlite3.SQLITE_FULL, sqlite3.SQLITE_CORRUPT,
+    sqlite3.SQLITE_NOTADB, sqlite3.SQLITE_CANTOPEN, sqlite3.SQLITE_READONLY,
+}
+
+
+def is_fatal(error: Exception) -> bool:
+    """Whether a migration error should abort the run instead of moving on to the next script"""
+    if isinstance(error, sqlite3.NotSupportedError):
+        return True
+    if not isinstance(error, sqlite3.DatabaseError):
+        return False
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is None:
+        # A bare DatabaseError (e.g. "file is not a database") has no more specific class
+        return type(error) is sqlite3.DatabaseError
+    # Extended codes (SQLITE_IOERR_WRITE, ...) carry the primary code in the low byte
+    return (code & 0xFF) in FATAL_SQLITE_CODES
+
+
+# Tried in order when the DATABASE_URL path does not exist
+DB_FALLBACK_PATHS = ("/db/xtream.db", "/app/db/xtream.db", "db/xtream.db")
+
+# The script's own directory first, then relative and absolute to be safe
+MIGRATIONS_DIRS = (os.path.dirname(os.path.abspath(__file__)), "/app/migrations", "./migrations", "backend/migrations")
+
+
+def tune(conn: sqlite3.Connection):
+    conn.executescript(";\n".join(PRAGMAS) + ";")
+
+
+def strip_applied_columns(cursor: sqlite3.Cursor, sql_script: str) -> str:
+    """Remove ADD COLUMN statements for columns that already exist or tables that do not"""
+    columns = {}
+
+    def keep_if_needed(match):
+        table, column = match.group(1), match.group(2).lower()
+        if table not in columns:
+            columns[table] = {row[1].lower() for row in cursor.execute(f'PRAGMA table_info("{table}")')}
+        if not columns[table]:
+            logger.info(f"  SKIP: Table {table} does not exist.")
+            return ""
+        if column in columns[table]:
+            logger.info(f"  SKIP: Column {table}.{column} already exists.")
+            return ""
+        columns[table].add(column)
+        return match.group(0)
+
+    return ADD_COLUMN_RE.sub(keep_if_needed, sql_script)
+
+def list_migrations(directory: str) -> list:
+    """The .sql files of a directory as DirEntry objects sorted by name, empty if it does not exist"""
+    try:
+        with os.scandir(directory) as it:
+            entries = [e for e in it if e.name.endswith(".sql") and e.is_file()]
+    except OSError:
+        return []
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+@functools.lru_cache(maxsize=None)
+def _find_db_path(db_path: str) -> Optional[str]:
+    """First existing database file: the configured path, then the common fallbacks"""
+    for path in (db_path, *DB_FALLBACK_PATHS):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _find_migrations_dir() -> Tuple[Optional[str], Tuple[os.DirEntry, ...]]:
+    """First of MIGRATIONS_DIRS holding .sql files, with those files (cache_clear() after adding some in tests)"""
+    for d in MIGRATIONS_DIRS:
+        entries = list_migrations(d)
+        if entries:
+            return d, tuple(entries)
+    return None, ()
+
 def apply_migrations():
+    """Apply every .sql migration to the located database file"""
     logger.info("🚀 Starting database migration check...")
     
     # 1. Discover Database Path
@@ -29,78 +129,54 @@ def apply_migrations():
     # Clean up any potential double slashes
     db_path = os.path.normpath(db_path)
     
-    # Try multiple common paths if the resolved one doesn't exist
-    possible_paths = [
-        db_path,
-        "/db/xtream.db",
-        "/app/db/xtream.db",
-        "db/xtream.db"
-    ]
-    
-    final_db_path = None
-    for path in possible_paths:
-        if os.path.exists(path):
-            final_db_path = path
-            break
-            
+    final_db_path = _find_db_path(db_path)
     if not final_db_path:
-        logger.error(f"❌ Could not find database file. Tried: {possible_paths}")
+        logger.error(f"❌ Could not find database file. Tried: {[db_path, *DB_FALLBACK_PATHS]}")
         logger.info("If you use a custom path, ensure DATABASE_URL is set correctly.")
         return
 
     logger.info(f"✅ Found database at: {final_db_path}")
 
+    conn = sqlite3.connect(final_db_path)
+    try:
+        tune(conn)
+        _apply_files(conn)
+    finally:
+        conn.close()
+
+def _apply_files(conn: sqlite3.Connection):
     # 2. Discover Migrations
-    # We check relative and absolute to be safe
-    migrations_dirs = ["/app/migrations", "./migrations", "backend/migrations"]
-    mig_dir = None
-    for d in migrations_dirs:
-        if os.path.exists(d) and any(f.endswith(".sql") for f in os.listdir(d)):
-            mig_dir = d
-            break
-            
+    mig_dir, sql_files = _find_migrations_dir()
     if not mig_dir:
-        logger.error(f"❌ Could not find migrations directory with .sql files in: {migrations_dirs}")
+        logger.error(f"❌ Could not find migrations directory with .sql files in: {MIGRATIONS_DIRS}")
         return
 
     logger.info(f"📂 Using migrations from: {mig_dir}")
-    sql_files = sorted([f for f in os.listdir(mig_dir) if f.endswith(".sql")])
 
     # 3. Apply Migrations
-    conn = sqlite3.connect(final_db_path)
     cursor = conn.cursor()
 
-    for sql_file in sql_files:
+    for entry in sql_files:
+        sql_file = entry.name
         logger.info(f"🔹 Applying {sql_file}...")
         try:
-            with open(os.path.join(mig_dir, sql_file), 'r') as f:
+            with open(entry.path, 'r') as f:
                 sql_script = f.read()
-            
-            # Use executescript for robust semicolon/comment handling
-            # But we want to skip "already exists" errors, so we'll stick to statement splitting
-            # or try/except block for EACH statement.
-            statements = sql_script.split(';')
-            for statement in statements:
-                stmt = statement.strip()
-                if not stmt:
-                    continue
-                try:
-                    cursor.execute(stmt)
-                    logger.info(f"  OK: {stmt[:60]}...")
-                except sqlite3.OperationalError as e:
-                    err_msg = str(e).lower()
-                    if "duplicate column name" in err_msg or "already exists" in err_msg:
-                        logger.info(f"  SKIP: Column already exists.")
-                    else:
-                        logger.warning(f"  ⚠️ SQL Warning: {e}")
-            
-            conn.commit()
+
+            # Migrations run on every start: already applied columns are
+            # stripped, the rest (CREATE ... IF NOT EXISTS, guarded UPDATEs)
+            # is idempotent, and the file runs as one script in one transaction
+            sql_script = strip_applied_columns(cursor, sql_script)
+            cursor.executescript(f"BEGIN;\n{sql_script}\nCOMMIT;")
             logger.info(f"✅ Finished {sql_file}")
         except Exception as e:
-            logger.error(f"❌ Error in {sql_file}: {e}")
             conn.rollback()
+            if is_fatal(e):
+                logger.error(f"❌ Fatal database error in {sql_file}, aborting: {e}")
+                raise
+            # A broken script (syntax error, missing table, ...) does not stop the others
+            logger.error(f"❌ Error in {sql_file}: {e}")
 
-    conn.close()
     logger.info("🎉 Database update complete.")
 
 if __name__ == "__main__":
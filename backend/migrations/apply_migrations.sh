@@ -1,6 +1,9 @@
 #!/bin/bash
 # Generic migration script to apply all SQL files in the migrations directory
 # Usage: ./apply_migrations.sh [DB_PATH]
+#
+# Delegates to apply_migrations.py (the same runner the container uses at start),
+# which skips already applied columns and applies each file in one transaction.
 
 set -e
 
@@ -15,22 +18,9 @@ if [ ! -f "$DB_PATH" ]; then
     exit 1
 fi
 
-# Find all .sql files and apply them in order
-for sql_file in $(ls "$MIGRATIONS_DIR"/*.sql | sort); do
-    filename=$(basename "$sql_file")
-    echo "🔹 Applying $filename..."
-    
-    # We use -bail to stop on first error
-    # We wrap in a block to hide "table already exists" errors if we want, 
-    # but better to let the user see them or use IF NOT EXISTS in SQL.
-    sqlite3 "$DB_PATH" < "$sql_file"
-    
-    if [ $? -eq 0 ]; then
-        echo "✅ $filename applied."
-    else
-        echo "❌ Error applying $filename"
-        exit 1
-    fi
-done
+case "$DB_PATH" in
+    /*) DATABASE_URL="sqlite:///$DB_PATH" ;;
+    *) DATABASE_URL="sqlite:///$(pwd)/$DB_PATH" ;;
+esac
 
-echo "🎉 All migrations processed!"
+DATABASE_URL="$DATABASE_URL" exec python3 "$MIGRATIONS_DIR/apply_migrations.py"
@@ -1,30 +1,38 @@
-import sqlite3
+import logging
 import sys
+from app.db.sqlite_pragmas import rw_connect, setup_script_logging
 
-conn = sqlite3.connect("/db/xtream.db")
-cursor = conn.cursor()
-
-print("Resetting failed tasks...")
-cursor.execute("""
-    UPDATE download_tasks 
-    SET status = 'pending', retry_count = 0, error_message = NULL
-    WHERE status = 'failed' AND (title LIKE '%26768%' OR title LIKE '%26765%')
-""")
-print(f"Updated {cursor.rowcount} tasks.")
+setup_script_logging()
+logger = logging.getLogger(__name__)
 
-conn.commit()
+# Xtream media ids of the tasks to reset, e.g. python reset_downloads.py 26768 26765
+media_ids = [int(arg) for arg in sys.argv[1:]]
+if not media_ids:
+    logger.error(f"Usage: {sys.argv[0]} MEDIA_ID [MEDIA_ID ...]")
+    sys.exit(1)
 
-print("\nVerifying new status:")
-cursor.execute("""
-    SELECT id, title, status, progress, downloaded_bytes, file_size, error_message 
-    FROM download_tasks 
-    WHERE title LIKE '%26768%' OR title LIKE '%26765%' 
-    ORDER BY id DESC 
-    LIMIT 5
-""")
+# Autocommit mode: the write transaction is opened explicitly below
+conn = rw_connect("/db/xtream.db")
+cursor = conn.cursor()
+placeholders = ",".join("?" * len(media_ids))
 
+logger.info("Resetting failed tasks...")
+# IMMEDIATE takes the write lock up front instead of upgrading mid-UPDATE,
+# which could fail with SQLITE_BUSY while the downloader is writing
+cursor.execute("BEGIN IMMEDIATE")
+# RETURNING hands back the updated rows, so no second query is needed to verify them
+cursor.execute(f"""
+    UPDATE download_tasks
+    SET status = 'pending', retry_count = 0, error_message = NULL
+    WHERE status = 'failed' AND media_id IN ({placeholders})
+    RETURNING id, title, status, progress, downloaded_bytes, file_size, error_message
+""", media_ids)
 results = cursor.fetchall()
-for row in results:
-    print(f"ID: {row[0]}, Title: {row[1]}, Status: {row[2]}, Progress: {row[3]}%, Downloaded: {row[4]}, Size: {row[5]}, Error: {row[6]}")
+cursor.execute("COMMIT")
+logger.info(f"Updated {len(results)} tasks.")
+
+logger.info("New status:")
+for row in sorted(results, reverse=True):
+    logger.info(f"ID: {row[0]}, Title: {row[1]}, Status: {row[2]}, Progress: {row[3]}%, Downloaded: {row[4]}, Size: {row[5]}, Error: {row[6]}")
 
 conn.close()
@@ -1,16 +1,35 @@
-import sqlite3
+import logging
 import sys
+from app.db.sqlite_pragmas import rw_connect, setup_script_logging
 
-conn = sqlite3.connect("/db/xtream.db")
+setup_script_logging()
+logger = logging.getLogger(__name__)
+
+# Xtream media ids of the tasks to reset, e.g. python reset_downloads_force.py 26768 26765
+media_ids = [int(arg) for arg in sys.argv[1:]]
+if not media_ids:
+    logger.error(f"Usage: {sys.argv[0]} MEDIA_ID [MEDIA_ID ...]")
+    sys.exit(1)
+
+# Autocommit mode: the write transaction is opened explicitly below
+conn = rw_connect("/db/xtream.db")
 cursor = conn.cursor()
+placeholders = ",".join("?" * len(media_ids))
 
-print("Resetting tasks (failed or pending with error)...")
-cursor.execute("""
-    UPDATE download_tasks 
+logger.info("Resetting tasks (failed or pending with error)...")
+# IMMEDIATE takes the write lock up front instead of upgrading mid-UPDATE,
+# which could fail with SQLITE_BUSY while the downloader is writing
+cursor.execute("BEGIN IMMEDIATE")
+cursor.execute(f"""
+    UPDATE download_tasks
     SET status = 'pending', retry_count = 0, error_message = NULL, next_retry_at = NULL
-    WHERE (status = 'failed' OR status = 'pending' OR status = 'downloading') AND (title LIKE '%26768%' OR title LIKE '%26765%')
-""")
-print(f"Updated {cursor.rowcount} tasks.")
+    WHERE status IN ('failed', 'pending', 'downloading') AND media_id IN ({placeholders})
+    RETURNING id, title, status
+""", media_ids)
+results = cursor.fetchall()
+cursor.execute("COMMIT")
+logger.info(f"Updated {len(results)} tasks.")
+for row in sorted(results, reverse=True):
+    logger.info(f"ID: {row[0]}, Title: {row[1]}, Status: {row[2]}")
 
-conn.commit()
 conn.close()
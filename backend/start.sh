@@ -10,8 +10,9 @@ else
     echo "redis-server not found, assuming external redis or skipping"
 fi
 
-# Start Celery worker in the background
-./venv/bin/celery -A app.core.celery_app worker --loglevel=info 2>&1 | tee -a app.log &
+# Start Celery workers in the background: long-running syncs, and everything else
+./venv/bin/celery -A app.core.celery_app worker -Q syncs_long --prefetch-multiplier=1 -n syncs@%h --loglevel=info 2>&1 | tee -a app.log &
+./venv/bin/celery -A app.core.celery_app worker -Q celery -n default@%h --loglevel=info 2>&1 | tee -a app.log &
 
 # Start the FastAPI application
 ./venv/bin/uvicorn app.main:app --host 0.0.0.0 --port 8000 2>&1 | tee -a app.log
@@ -10,15 +10,24 @@ params = {
 
 print(f"Testing connection to {url}...")
 try:
-    response = requests.get(url, params=params, timeout=10)
-    print(f"Status Code: {response.status_code}")
-    print(f"Content Type: {response.headers.get('Content-Type')}")
-    try:
-        data = response.json()
-        print(f"JSON Data length: {len(data)}")
-        if len(data) > 0:
-            print(f"First item: {data[0]}")
-    except:
-        print(f"Response is not JSON. Start of content: {response.text[:200]}")
+    # One session (and keep-alive connection) for every request made here
+    with requests.Session() as session:
+        session.headers.update({"Accept": "application/json"})
+        response = session.get(url, params=params, timeout=10, stream=True)
+        print(f"Status Code: {response.status_code}")
+        content_type = response.headers.get('Content-Type') or ""
+        print(f"Content Type: {content_type}")
+        if "json" in content_type:
+            try:
+                data = response.json()
+                print(f"JSON Data length: {len(data)}")
+                if len(data) > 0:
+                    print(f"First item: {data[0]}")
+            except ValueError:
+                print(f"Response is not valid JSON. Start of content: {response.content[:200]}")
+        else:
+            # Only the start of a non-JSON body is shown, so don't download the rest
+            start = next(response.iter_content(chunk_size=256), b"")
+            print(f"Response is not JSON. Start of content: {start[:200]}")
 except Exception as e:
     print(f"Error: {e}")
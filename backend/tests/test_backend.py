@@ -16,21 +16,17 @@ class TestXtreamClient(unittest.TestCase):
     def setUp(self):
         self.client = XtreamClient("http://test.com", "user", "pass")
 
-    @patch('httpx.AsyncClient')
-    def test_get_vod_categories(self, mock_client_cls):
-        # Mock the context manager
+    @patch('app.services.xtream.XtreamClient._get_async_client')
+    def test_get_vod_categories(self, mock_get_client):
         mock_client_instance = MagicMock()
-        mock_client_cls.return_value = mock_client_instance
-        mock_client_instance.__aenter__.return_value = mock_client_instance
-        mock_client_instance.__aexit__.return_value = None
+        mock_get_client.return_value = mock_client_instance
 
-        # Mock the get response
+        # Mock the get response (the client decodes the raw body with orjson)
         mock_response = MagicMock()
-        mock_response.json.return_value = [{"category_id": "1", "category_name": "Action"}]
+        mock_response.content = b'[{"category_id": "1", "category_name": "Action"}]'
         mock_response.raise_for_status.return_value = None
         
-        # Make client.get return an awaitable that returns mock_response
-        mock_client_instance.get.return_value = AsyncMock(return_value=mock_response)()
+        mock_client_instance.get = AsyncMock(return_value=mock_response)
 
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -1,6 +1,8 @@
+import asyncio
 import unittest
 import sys
 import os
+import tempfile
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.services.file_manager import FileManager
@@ -65,5 +67,63 @@ class TestFileManagerNFO(unittest.TestCase):
         nfo = self.fm.generate_movie_nfo(data, prefix_regex=r'^TEST - ')
         self.assertIn("<title>Custom Movie</title>", nfo)
 
+    def test_sanitize_name(self):
+        self.assertEqual(self.fm.sanitize_name("Movie Name"), "Movie Name")
+        self.assertEqual(self.fm.sanitize_name('A/B\\C:D*E?F"G<H>I|J'), "A_B_C_D_E_F_G_H_I_J")
+        self.assertEqual(len(self.fm.sanitize_name("x" * 300)), 200)
+
+class TestFileManagerSyncWrites(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fm = FileManager(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_strm_sync_skips_unchanged_content(self):
+        path = os.path.join(self.tmp.name, "movie.strm")
+        self.assertTrue(self.fm.write_strm_sync(path, "http://host/movie/1.mp4"))
+        self.assertFalse(self.fm.write_strm_sync(path, "http://host/movie/1.mp4"))
+        self.assertTrue(self.fm.write_strm_sync(path, "http://host/movie/2.mp4"))
+        with open(path) as f:
+            self.assertEqual(f.read(), "http://host/movie/2.mp4")
+
+    def test_write_strm_skips_unchanged_content(self):
+        path = os.path.join(self.tmp.name, "movie.strm")
+        self.assertTrue(asyncio.run(self.fm.write_strm(path, "http://host/movie/1.mp4")))
+        mtime = os.stat(path).st_mtime_ns
+        self.assertFalse(asyncio.run(self.fm.write_strm(path, "http://host/movie/1.mp4\n")))
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+    def test_write_nfo_sync_skip_if_exists(self):
+        path = os.path.join(self.tmp.name, "movie.nfo")
+        self.assertTrue(self.fm.write_nfo_sync(path, "<movie/>"))
+        self.assertFalse(self.fm.write_nfo_sync(path, "<movie>new</movie>", skip_if_exists=True))
+        with open(path) as f:
+            self.assertEqual(f.read(), "<movie/>")
+
+    def test_update_nfo_video_codec_keeps_info_fields(self):
+        # Extension-only change: the info-derived fields of the existing NFO survive
+        path = os.path.join(self.tmp.name, "movie.nfo")
+        movie = {
+            "name": "Movie", "tmdb": "550", "container_extension": "mkv",
+            "info": {"bitrate": 4500, "audio": {"codec": "aac"}, "mpaa": "PG-13"},
+        }
+        self.fm.write_nfo_sync(path, self.fm.generate_movie_nfo(movie))
+
+        self.assertTrue(asyncio.run(self.fm.update_nfo_video_codec(path, "mp4")))
+        with open(path) as f:
+            nfo = f.read()
+        self.assertIn("<video>\n        <codec>mp4</codec>", nfo)
+        self.assertIn("<bitrate>4500</bitrate>", nfo)
+        self.assertIn("<audio>\n        <codec>aac</codec>", nfo)
+        self.assertIn("<mpaa>PG-13</mpaa>", nfo)
+        self.assertFalse(asyncio.run(self.fm.update_nfo_video_codec(path, "mp4")))
+
+    def test_update_nfo_video_codec_without_nfo(self):
+        path = os.path.join(self.tmp.name, "missing.nfo")
+        self.assertIsNone(asyncio.run(self.fm.update_nfo_video_codec(path, "mp4")))
+        self.assertFalse(os.path.exists(path))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+import sys
+import os
+import tempfile
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.tasks import downloads
+from app.tasks.downloads import _resolve_target_path
+from app.models.cache import MovieCache, SeriesCache, EpisodeCache
+
+
+def make_db(movie=None, episode_row=None, series_by_name=None):
+    """Session mock answering the cache lookups _resolve_target_path makes"""
+    def query(*entities):
+        q = MagicMock()
+        if entities[0] is EpisodeCache:
+            # Episode joined with its series: one (episode, series) row or None
+            q.outerjoin.return_value.filter.return_value.first.return_value = episode_row
+        elif entities[0] is MovieCache:
+            q.filter.return_value.first.return_value = movie
+        elif entities[0] is SeriesCache:
+            q.filter.return_value.first.return_value = series_by_name
+        return q
+
+    db = MagicMock()
+    db.query.side_effect = query
+    return db
+
+
+class TestResolveTargetPath(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # One patcher for the whole class; each test resets and reconfigures the client
+        cls.client = MagicMock()
+        cls.patcher = patch.object(downloads, "_get_xtream_client", return_value=cls.client)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.subscription = SimpleNamespace(
+            id=1,
+            xtream_url="http://example.com",
+            username="user",
+            password="pass",
+            download_movies_dir=os.path.join(self.tmp.name, "movies"),
+            download_series_dir=os.path.join(self.tmp.name, "series"),
+        )
+        self.client.reset_mock(return_value=True, side_effect=True)
+        # Category names are cached per subscription across calls
+        downloads._category_maps.clear()
+        self.addCleanup(downloads._category_maps.clear)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_movie_path(self):
+        app_settings = {"PREFIX_REGEX": "", "FORMAT_DATE_IN_TITLE": "true", "CLEAN_NAME": "true"}
+        download = SimpleNamespace(media_type="movie", media_id="123", subscription_id=1, title="Raw_Movie_Name")
+        self.client.get_vod_categories_sync.return_value = [{"category_id": "10", "category_name": "Action"}]
+        self.client.get_vod_streams_sync.return_value = [
+            {"stream_id": "123", "name": "API Movie Name", "category_id": "10", "tmdb": "999"}
+        ]
+
+        scenarios = [
+            ("cache exists",
+             SimpleNamespace(name="Movie Name", category_id="10", tmdb_id="550"),
+             "Action/Movie Name {tmdb-550}/Movie Name {tmdb-550}.mp4"),
+            ("cache missing, API fallback",
+             None,
+             "Action/API Movie Name {tmdb-999}/API Movie Name {tmdb-999}.mp4"),
+        ]
+        for label, movie, expected in scenarios:
+            with self.subTest(label):
+                path = _resolve_target_path(make_db(movie=movie), download, self.subscription, app_settings)
+                self.assertTrue(str(path).endswith(expected), str(path))
+
+        # The category map is built once per subscription and reused by later downloads
+        self.client.get_vod_categories_sync.assert_called_once()
+
+    def test_series_path(self):
+        app_settings = {
+            "SERIES_USE_SEASON_FOLDERS": "true",
+            "SERIES_INCLUDE_NAME_IN_FILENAME": "true",
+            "SERIES_USE_CATEGORY_FOLDERS": "true",
+            "CLEAN_NAME": "true"
+        }
+        self.client.get_series_sync.return_value = []
+        self.client.get_series_categories_sync.return_value = [
+            {"category_id": "20", "category_name": "Sci-Fi"},
+            {"category_id": "30", "category_name": "Drama"},
+        ]
+
+        episode = SimpleNamespace(series_id=789, season_num=1, episode_num=1, title="Pilot")
+        series = SimpleNamespace(name="Cool Series", category_id="20", tmdb_id="888")
+        series_match = SimpleNamespace(name="Famous Show", category_id="30", tmdb_id="123")
+        scenarios = [
+            ("episode cache exists", "Series - S01E01",
+             dict(episode_row=(episode, series)),
+             "Sci-Fi/Cool Series {tmdb-888}/Season 01/Cool Series - S01E01 - Pilot.mp4"),
+            # No hyphen before the episode marker, nothing cached
+            ("cache missing, title parsing", "Cool Series S01E01 - Pilot",
+             dict(),
+             "Uncategorized/Cool Series/Season 01/Cool Series - S01E01 - Pilot.mp4"),
+            ("name-based cache lookup", "Famous Show S02E05",
+             dict(series_by_name=series_match),
+             "Drama/Famous Show {tmdb-123}/Season 02/Famous Show - S02E05.mp4"),
+        ]
+        for label, title, cached, expected in scenarios:
+            with self.subTest(label):
+                download = SimpleNamespace(media_type="episode", media_id="456", subscription_id=1, title=title)
+                path = _resolve_target_path(make_db(**cached), download, self.subscription, app_settings)
+                self.assertTrue(str(path).endswith(expected), str(path))
+
+        self.client.get_series_categories_sync.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,14 @@
-import sys
 import os
+from celery import Celery
 
-# Add /app to python path
-sys.path.append('/app')
+# Enqueue the task for the running worker by name, without importing the app
+# (and its ORM/model setup) here. For an in-process run use:
+#   celery -A app.core.celery_app call app.tasks.downloads.process_download_queue
+broker_url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
 
-from app.tasks.downloads import process_download_queue
-
-print("Triggering queue processing manually...")
+print("Triggering queue processing...")
 try:
-    # Execute synchronously
-    process_download_queue()
-    print("Queue processing completed.")
+    result = Celery(broker=broker_url).send_task("app.tasks.downloads.process_download_queue")
+    print(f"Queue processing enqueued (task id {result.id}).")
 except Exception as e:
     print(f"Error triggering queue: {e}")
@@ -1,12 +1,13 @@
-import sqlite3
 import os
+from app.db.sqlite_pragmas import ro_connect
 
 db_path = "/home/mba/Desktop/xtream_to_strm_web/db/xtream.db"
 if not os.path.exists(db_path):
     print(f"Error: {db_path} not found")
     exit(1)
 
-conn = sqlite3.connect(db_path)
+# Only reads, so it can run next to the live app without taking any write lock
+conn = ro_connect(db_path)
 cursor = conn.cursor()
 
 cursor.execute("SELECT key, value FROM settings WHERE key = 'SERIES_USE_CATEGORY_FOLDERS'")
@@ -11,8 +11,10 @@ redis-server --dir /app --dbfilename dump.rdb --daemonize yes --pidfile /app/red
 # Wait for Redis to be ready
 sleep 2
 
-# Start Celery worker in the background
-celery -A app.core.celery_app worker --loglevel=info 2>&1 | tee -a app.log &
+# Start Celery workers in the background: one for the long-running syncs (taking one
+# task at a time per process), one for everything else (schedule checks, downloads, ...)
+celery -A app.core.celery_app worker -Q syncs_long --prefetch-multiplier=1 -n syncs@%h --loglevel=info 2>&1 | tee -a app.log &
+celery -A app.core.celery_app worker -Q celery -n default@%h --loglevel=info 2>&1 | tee -a app.log &
 
 # Start Celery Beat in the background
 celery -A app.core.celery_app beat --loglevel=info 2>&1 | tee -a app.log &